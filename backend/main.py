@@ -1,19 +1,19 @@
 import os
 import json
+import asyncio
 from typing import Callable
 from time import perf_counter
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from src.utils.logger import logger
+from src.utils.logger import logger, should_log, truncate
 from src.services.db import (
+    SharedDB,
     get_checkpoint_db,
     get_store_db,
     # get_async_db,
@@ -24,6 +24,8 @@ from src.routes.v0 import (
     llm,
     thread,
     health,
+    metrics,
+    usage,
     auth,
     storage,
     rag,
@@ -38,11 +40,19 @@ from src.constants import (
     PORT,
     LOG_LEVEL,
     APP_VERSION,
+    RUN_WORKERS,
     APP_ENV,
 )
 from src.utils.migrations import run_migrations
-from src.utils.rate_limit import limiter
 from src.services.schedule import schedule_service
+from src.services.mcp import mcp_service
+from src.services.stream import stream_service
+from src.services.run import run_worker_pool
+from src.services.store import setup_page_index
+from src.utils.a2a import aclose_http_client
+from src.utils.retrieval import aclose_proxy_client
+from src.utils.openapi import refresh_openapi_spec
+from src.utils.metrics import HTTP_REQUEST_SECONDS
 from contextlib import asynccontextmanager
 
 
@@ -69,13 +79,41 @@ async def lifespan(app: FastAPI):
         # optional: create tables/indexes
         await saver.setup()
         await store.setup()
+        await setup_page_index(store)
+        await store.start_ttl_sweeper()
 
         # share across requests
         app.state.store = store
+        app.state.checkpointer = saver
+        SharedDB.store = store
+        SharedDB.checkpointer = saver
+
+        # run queued invocations in-process unless dedicated workers do it
+        if RUN_WORKERS > 0:
+            run_worker_pool.start()
+
+        # keep the cached LangConnect spec fresh for the next worker start
+        spec_refresh = (
+            asyncio.create_task(
+                refresh_openapi_spec(f"{LANGCONNECT_SERVER_URL}/openapi.json")
+            )
+            if LANGCONNECT_SERVER_URL
+            else None
+        )
 
         # serve requests
         yield
 
+        # Shutdown
+        if spec_refresh:
+            spec_refresh.cancel()
+        await run_worker_pool.stop()
+        await store.stop_ttl_sweeper()
+        await stream_service.aclose()
+        await mcp_service.aclose()
+        await aclose_http_client()
+        await aclose_proxy_client()
+
 
 app = FastAPI(
     title="Enso 🤖",
@@ -92,8 +130,6 @@ app = FastAPI(
     lifespan=lifespan,
     swagger_ui_parameters={"docExpansion": "none"},
 )
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 @app.middleware("http")
@@ -102,21 +138,36 @@ async def log_requests(request: Request, call_next: Callable[[Request], Response
     response = await call_next(request)
     duration = perf_counter() - start
 
-    # Log detailed request information
-    logger.info(
-        json.dumps(
-            {
-                "request": {
-                    "method": request.method,
-                    "path": request.url.path,
-                    "query_params": dict(request.query_params),
-                    "client_host": request.client.host if request.client else "Unknown",
-                    "duration": f"{duration:.2f}s",
-                    "status_code": response.status_code,
+    # Label by route template, e.g. /api/threads/{thread_id}, not the raw path
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_SECONDS.observe(
+        duration,
+        method=request.method,
+        route=route,
+        status=response.status_code,
+    )
+
+    # Log detailed request information (sampled per route, errors always)
+    if response.status_code >= 500 or should_log(route):
+        logger.info(
+            json.dumps(
+                {
+                    "request": {
+                        "method": request.method,
+                        "path": request.url.path,
+                        "query_params": {
+                            key: truncate(value)
+                            for key, value in request.query_params.items()
+                        },
+                        "client_host": (
+                            request.client.host if request.client else "Unknown"
+                        ),
+                        "duration": f"{duration:.2f}s",
+                        "status_code": response.status_code,
+                    }
                 }
-            }
+            )
         )
-    )
     return response
 
 
@@ -127,18 +178,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Run-ID"],
 )
 
 # Include routers
 PREFIX = "/api"
 app.include_router(auth, prefix=PREFIX)
 app.include_router(health, prefix=PREFIX)
+app.include_router(metrics, prefix=PREFIX)
 app.include_router(llm, prefix=PREFIX)
 app.include_router(thread, prefix=PREFIX)
 app.include_router(assistant, prefix=PREFIX)
 app.include_router(tool, prefix=PREFIX)
 app.include_router(prompt, prefix=PREFIX)
 app.include_router(schedule, prefix=PREFIX)
+app.include_router(usage, prefix=PREFIX)
 if LANGCONNECT_SERVER_URL:
     app.include_router(rag, prefix=PREFIX)
 app.include_router(storage, prefix=PREFIX)
@@ -0,0 +1,56 @@
+"""Add token_usage table for the usage ledger
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-10-24 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "token_usage",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("assistant_id", sa.String(), nullable=True),
+        sa.Column("thread_id", sa.String(), nullable=True),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("calls", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("input_tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("output_tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_tokens", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Aggregates are always per user over a time range
+    op.create_index(
+        "token_usage_user_created_idx", "token_usage", ["user_id", "created_at"]
+    )
+    op.create_index("token_usage_assistant_idx", "token_usage", ["assistant_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("token_usage_assistant_idx", table_name="token_usage")
+    op.drop_index("token_usage_user_created_idx", table_name="token_usage")
+    op.drop_table("token_usage")
@@ -16,12 +16,23 @@ OAUTH_GITHUB_REDIRECT_URI = os.getenv("OAUTH_GITHUB_REDIRECT_URI")
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "this-is-a-secret-key")
 JWT_ALGORITHM = "HS256"
 JWT_TOKEN_EXPIRE_MINUTES = 60 * 24
+# Verified tokens are trusted without a user lookup for up to AUTH_CACHE_TTL
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "true").lower() == "true"
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "60"))  # seconds
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))  # tokens
 
 # App
 APP_ENV = os.getenv("APP_ENV", "development")
 APP_VERSION = os.getenv("APP_VERSION", "0.1.0")
 APP_SECRET_KEY = os.getenv("APP_SECRET_KEY", "this-is-a-secret-key")
 APP_LOG_LEVEL = os.getenv("APP_LOG_LEVEL", "INFO").upper()
+APP_LOG_ENQUEUE = os.getenv("APP_LOG_ENQUEUE", "true").lower() == "true"
+APP_LOG_MAX_PAYLOAD = int(os.getenv("APP_LOG_MAX_PAYLOAD", "2000"))  # characters
+# Share of requests logged per route template, e.g. "/api/health=0.1,/api/metrics=0"
+APP_LOG_SAMPLING = os.getenv("APP_LOG_SAMPLING", "/api/metrics=0")
+APP_LOG_SAMPLE_RATE = float(os.getenv("APP_LOG_SAMPLE_RATE", "1"))  # other routes
+# Lines buffered per log file before new ones are dropped
+APP_LOG_FILE_QUEUE_SIZE = int(os.getenv("APP_LOG_FILE_QUEUE_SIZE", "10000"))
 
 # Database
 DB_URI = os.getenv(
@@ -34,6 +45,80 @@ DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
 DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
 DB_POOL_MAX_IDLE_TIME = int(os.getenv("DB_POOL_MAX_IDLE_TIME", "300"))  # 5 minutes
 DB_POOL_MAX_LIFETIME = int(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))  # 1 hour
+# Minutes between sweeps of expired store items (written with a ttl)
+STORE_TTL_SWEEP_INTERVAL = int(os.getenv("STORE_TTL_SWEEP_INTERVAL", "60"))
+
+# Rate Limits
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "postgres")  # postgres | memory
+RATE_LIMIT_REQUESTS = os.getenv("RATE_LIMIT_REQUESTS", "200/day")  # per endpoint
+RATE_LIMIT_TOKENS = os.getenv("RATE_LIMIT_TOKENS", "1000000/day")  # model tokens
+
+# Database Retries
+DB_RETRY_TRIES = int(os.getenv("DB_RETRY_TRIES", "3"))
+DB_RETRY_DELAY = float(os.getenv("DB_RETRY_DELAY", "0.2"))  # seconds, doubled per try
+DB_RETRY_MAX_DELAY = float(os.getenv("DB_RETRY_MAX_DELAY", "5"))
+DB_CIRCUIT_THRESHOLD = int(os.getenv("DB_CIRCUIT_THRESHOLD", "5"))  # failed calls
+DB_CIRCUIT_RESET = float(os.getenv("DB_CIRCUIT_RESET", "30"))  # seconds open
+
+# Agent Cache
+AGENT_CACHE_MAX_SIZE = int(os.getenv("AGENT_CACHE_MAX_SIZE", "128"))
+
+# MCP
+MCP_TOOLS_TTL = int(os.getenv("MCP_TOOLS_TTL", "300"))  # 5 minutes
+
+# A2A
+A2A_CARD_TTL = int(os.getenv("A2A_CARD_TTL", "300"))  # 5 minutes
+A2A_CARD_TIMEOUT = float(os.getenv("A2A_CARD_TIMEOUT", "10"))
+A2A_HTTP2 = os.getenv("A2A_HTTP2", "true").lower() == "true"
+A2A_MAX_CONNECTIONS = int(os.getenv("A2A_MAX_CONNECTIONS", "100"))
+A2A_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("A2A_MAX_KEEPALIVE_CONNECTIONS", "20"))
+A2A_REQUEST_TIMEOUT = float(os.getenv("A2A_REQUEST_TIMEOUT", "30"))
+
+# LangConnect Proxy
+# The gateway is documented from a cached copy of LangConnect's OpenAPI spec,
+# refreshed in the background every LANGCONNECT_SPEC_REFRESH seconds
+LANGCONNECT_SPEC_CACHE = os.getenv(
+    "LANGCONNECT_SPEC_CACHE", "/tmp/langconnect_openapi.json"
+)
+LANGCONNECT_SPEC_REFRESH = int(os.getenv("LANGCONNECT_SPEC_REFRESH", "3600"))
+LANGCONNECT_PROXY_TIMEOUT = float(os.getenv("LANGCONNECT_PROXY_TIMEOUT", "300"))
+LANGCONNECT_MAX_CONNECTIONS = int(os.getenv("LANGCONNECT_MAX_CONNECTIONS", "50"))
+LANGCONNECT_UPLOAD_CHUNK_SIZE = int(
+    os.getenv("LANGCONNECT_UPLOAD_CHUNK_SIZE", str(256 * 1024))
+)  # bytes read per uploaded file chunk
+
+# Streaming
+SSE_FRAME_INTERVAL_MS = int(os.getenv("SSE_FRAME_INTERVAL_MS", "20"))
+SSE_FRAME_MAX_BYTES = int(os.getenv("SSE_FRAME_MAX_BYTES", "4096"))
+STREAM_FORMAT = os.getenv("STREAM_FORMAT", "delta")  # delta | full
+STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "2048"))  # events per run
+STREAM_RETENTION = int(os.getenv("STREAM_RETENTION", "300"))  # seconds after a run ends
+
+# Run Queue
+RUN_WORKERS = int(os.getenv("RUN_WORKERS", "2"))  # in-process workers, 0 to disable
+RUN_QUEUE_POLL_INTERVAL = float(os.getenv("RUN_QUEUE_POLL_INTERVAL", "1"))
+RUN_QUEUE_MAX_DEPTH = int(os.getenv("RUN_QUEUE_MAX_DEPTH", "1000"))
+RUN_TIMEOUT = int(os.getenv("RUN_TIMEOUT", "900"))  # seconds before a run is stale
+RUN_MAX_ATTEMPTS = int(os.getenv("RUN_MAX_ATTEMPTS", "3"))
+
+# Memory
+MEMORY_PROMPT_MODE = os.getenv("MEMORY_PROMPT_MODE", "all")  # all | top_k
+MEMORY_PROMPT_TOP_K = int(os.getenv("MEMORY_PROMPT_TOP_K", "5"))
+MEMORY_PROMPT_MAX = int(os.getenv("MEMORY_PROMPT_MAX", "100"))
+MEMORY_PROMPT_TTL = int(os.getenv("MEMORY_PROMPT_TTL", "300"))  # 5 minutes
+MEMORY_PROMPT_CACHE_SIZE = int(os.getenv("MEMORY_PROMPT_CACHE_SIZE", "1024"))  # users
+MEMORY_SEARCH_LIMIT = int(os.getenv("MEMORY_SEARCH_LIMIT", "5"))
+
+# Checkpoint History
+CHECKPOINT_HISTORY_LIMIT = int(os.getenv("CHECKPOINT_HISTORY_LIMIT", "20"))
+CHECKPOINT_HISTORY_MAX = int(os.getenv("CHECKPOINT_HISTORY_MAX", "100"))
+
+# Response Cache (opt-in per assistant or /llm/invoke request)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))  # 1 day
+# Minimum similarity of the last user message for a hit, 0 for exact matches only
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.95"))
 
 
 class UserTokenKey(Enum):
@@ -77,4 +162,8 @@ S3_REGION = os.getenv("S3_REGION", "us-east-2")
 ACCESS_KEY_ID = os.getenv("ACCESS_KEY_ID")
 ACCESS_SECRET_KEY = os.getenv("ACCESS_SECRET_KEY")
 BUCKET = os.getenv("BUCKET", "lg_template_dev")
+STORAGE_MAX_WORKERS = int(os.getenv("STORAGE_MAX_WORKERS", "8"))  # blocking S3 calls
+STORAGE_PART_SIZE = int(os.getenv("STORAGE_PART_SIZE", str(10 * 1024 * 1024)))  # bytes
+STORAGE_PARALLEL_PARTS = int(os.getenv("STORAGE_PARALLEL_PARTS", "3"))  # per upload
+STORAGE_CHUNK_SIZE = int(os.getenv("STORAGE_CHUNK_SIZE", str(256 * 1024)))  # downloads
 TEST_USER_ID = os.getenv("TEST_USER_ID", "00000000-0000-0000-0000-000000000000")
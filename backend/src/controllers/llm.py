@@ -6,13 +6,14 @@ from langgraph.store.base import BaseStore
 
 from src.schemas.entities import LLMRequest
 from src.schemas.models import ProtectedUser
-from src.services.db import get_store, get_checkpoint_db, get_store_db
-from src.services.thread import thread_service
-from src.services.checkpoint import checkpoint_service
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from src.services.db import SharedDB, get_store, get_checkpointer
+from src.services.thread import ThreadService
+from src.services.response_cache import ResponseCache
 from src.flows import construct_agent
-from src.utils.stream import handle_multi_mode
-from src.utils.logger import logger, log_to_file
-from src.constants import APP_LOG_LEVEL
+from src.utils.stream import StreamSerializer
+from src.utils.logger import logger, log_to_file, truncate
+from src.constants import APP_LOG_LEVEL, STREAM_FORMAT
 from src.utils.format import get_time
 
 
@@ -21,29 +22,34 @@ async def llm_invoke(
     user_id: str,
 ) -> dict[str, Any] | Any:
     params.metadata.user_id = user_id
-    thread_service.user_id = user_id
-    checkpoint_service.checkpointer = user_id
-    params.metadata.thread_id = str(uuid4())
-    async with (
-        get_store_db() as store,
-        get_checkpoint_db() as checkpointer,
-    ):
-        try:
-            thread_service.store = store
-            thread_service.assistant_id = params.metadata.assistant_id
-            checkpoint_service.checkpointer = checkpointer
-            agent = await construct_agent(params, checkpointer, store)
-            checkpoint_service.graph = agent.graph
-            response = await agent.invoke(
-                {"messages": params.to_langchain_messages()},
-                context={"user_id": user_id} if user_id else None,
-            )
-            logger.info(f"LLM response: {response}")
+    store = SharedDB.store
+    checkpointer = SharedDB.checkpointer
+    cache = ResponseCache.for_request(params, user_id, store)
+    params.metadata.thread_id = params.metadata.thread_id or str(uuid4())
+    thread_service = ThreadService(
+        user_id=user_id, assistant_id=params.metadata.assistant_id, store=store
+    )
+    response = None
+    try:
+        cached = await cache.lookup(params) if cache else None
+        if cached:
+            response = {"messages": params.to_langchain_messages() + cached}
             return response
-        except Exception as e:
-            logger.exception(f"Error in llm_invoke: {e}")
-            raise e
-        finally:
+        agent = await construct_agent(params, checkpointer, store, user_id=user_id)
+        response = await agent.invoke(
+            {"messages": params.to_langchain_messages()},
+            context={"user_id": user_id} if user_id else None,
+        )
+        if cache:
+            await cache.save(params, response)
+        # Only built when DEBUG is enabled, responses carry whole threads
+        logger.opt(lazy=True).debug("LLM response: {}", lambda: truncate(response))
+        return response
+    except Exception as e:
+        logger.exception(f"Error in llm_invoke: {e}")
+        raise e
+    finally:
+        if response:
             await thread_service.update(
                 thread_id=params.metadata.thread_id,
                 data={
@@ -59,6 +65,7 @@ async def llm_stream(
     params: LLMRequest,
     user: ProtectedUser,
     store: Annotated[BaseStore, Depends(get_store)],
+    checkpointer: Annotated[BaseCheckpointSaver, Depends(get_checkpointer)],
 ) -> AsyncGenerator[str, None]:
     """
     Streams LLM output as server-sent events (SSE).
@@ -66,37 +73,33 @@ async def llm_stream(
 
     async def event_generator():
         ## Keeps in memory if not auth user
-        if user:
-            thread_service.store = store
-            thread_service.user_id = user.id
-            params.metadata.user_id = user.id
-        async with get_checkpoint_db() as checkpointer:
-            checkpoint_service.checkpointer = checkpointer
-            agent = await construct_agent(params, checkpointer, store)
-            checkpoint_service.graph = agent.graph
-            try:
-                async for chunk in agent.astream(
-                    {"messages": params.to_langchain_messages()},
-                    stream_mode=["messages", "values"],
-                    context={"user_id": user.id} if user else None,
-                ):
-                    # Serialize and yield each chunk as SSE
-                    stream_chunk = handle_multi_mode(chunk)
-                    if stream_chunk:
-                        data = ujson.dumps(stream_chunk)
-                        log_to_file(
-                            str(data), params.model
-                        ) and APP_LOG_LEVEL == "DEBUG"
-                        logger.debug(f"data: {str(data)}")
-                        yield f"data: {data}\n\n"
-            except Exception as e:
-                # Yield error as SSE if streaming fails
-                logger.exception("Error in event_generator: %s", e)
-                # raise HTTPException(status_code=500, detail=str(e))
-                error_msg = ujson.dumps(("error", str(e)))
-                yield f"data: {error_msg}\n\n"
-            finally:
-                # Update model info in checkpoint after streaming
-                await agent.add_model_to_ai_message(params.model)
+        params.metadata.user_id = user.id if user else None
+        agent = await construct_agent(
+            params, checkpointer, store, user_id=user.id if user else None
+        )
+        serialize = StreamSerializer(params.stream_format or STREAM_FORMAT)
+        try:
+            async for chunk in agent.astream(
+                {"messages": params.to_langchain_messages()},
+                stream_mode=["messages", "values"],
+                context={"user_id": user.id} if user else None,
+            ):
+                # Serialize and yield each chunk as SSE
+                stream_chunk = serialize(chunk)
+                if stream_chunk:
+                    data = ujson.dumps(stream_chunk)
+                    if APP_LOG_LEVEL == "DEBUG":
+                        log_to_file(data, params.model)
+                        logger.debug(f"data: {data}")
+                    yield f"data: {data}\n\n"
+        except Exception as e:
+            # Yield error as SSE if streaming fails
+            logger.exception("Error in event_generator: %s", e)
+            # raise HTTPException(status_code=500, detail=str(e))
+            error_msg = ujson.dumps(("error", str(e)))
+            yield f"data: {error_msg}\n\n"
+        finally:
+            # Update model info in checkpoint after streaming
+            await agent.add_model_to_ai_message(params.model)
 
     return event_generator
@@ -1,41 +1,44 @@
+import asyncio
+from dataclasses import asdict
 from typing import Type, Literal, Any, AsyncGenerator, Optional
 from uuid import uuid4
 from langchain_core.tools import BaseTool
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware, ModelRequest
+from langgraph.runtime import Runtime, get_runtime
 from langgraph.store.base import BaseStore
-from langchain_core.messages import BaseMessage, AIMessage
+from langchain_core.messages import BaseMessage, AIMessage, SystemMessage
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.runnables.config import RunnableConfig
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from deepagents import async_create_deep_agent, SubAgent
 
 
-from src.services.memory import memory_service
+from src.services.memory import MemoryService
+from src.services.agent_cache import agent_cache
 from src.services.tool import tool_service
+from src.services.mcp import mcp_service
 from src.tools.memory import MEMORY_TOOLS
 from src.schemas.entities import LLMRequest, LLMStreamRequest
+from src.utils.a2a import resolve_agent_cards
 from src.utils.logger import logger
-from src.services.checkpoint import checkpoint_service
-from src.services.thread import thread_service
+from src.utils.metrics import AGENT_CONSTRUCT_SECONDS, metrics_callback
+from src.utils.rate_limit import TokenBudgetCallback
+from src.services.usage import UsageTracker
+from src.services.thread import ThreadService, IN_MEMORY_STORE
 from src.utils.format import get_time, init_system_prompt
 from src.schemas.contexts import ContextSchema
 from src.schemas.entities.a2a import A2AServers
 
 
-async def add_memories_to_system():
-    memories = await memory_service.search()
-
-    def memory_to_xml(memory):
-        items = []
-        for key, value in memory.dict().items():
-            items.append(f"<{key}>{value}</{key}>")
-        return f"<memory>{''.join(items)}</memory>"
-
+async def add_memories_to_system(
+    user_id: str | None = None,
+    store: BaseStore | None = None,
+    query: str | None = None,
+):
+    memory_service = MemoryService(user_id=user_id, store=store)
     formatted_memories = (
-        "\n".join(memory_to_xml(memory) for memory in memories)
-        if memories
-        else "No memories found."
+        await memory_service.prompt_context(query) or "No memories found."
     )
 
     return (
@@ -46,6 +49,34 @@ async def add_memories_to_system():
     )
 
 
+def runtime_system_prompt(prompt: str, context: Any = None) -> str:
+    """
+    The assistant prompt plus what changes on every invocation (memories,
+    current time, timezone, language), read from the runtime context so the
+    compiled graph stays cacheable.
+    """
+    if context is None:
+        context = {}
+    elif not isinstance(context, dict):
+        context = asdict(context)
+    context = {key: value for key, value in context.items() if value is not None}
+    if context.get("memories"):
+        prompt = prompt + "\n" + context["memories"]
+    return init_system_prompt(prompt, context)
+
+
+class RuntimePromptMiddleware(AgentMiddleware):
+    """Applies runtime_system_prompt to deep agent model calls."""
+
+    def modify_model_request(
+        self, request: ModelRequest, state: Any, runtime: Runtime
+    ) -> ModelRequest:
+        request.system_prompt = runtime_system_prompt(
+            request.system_prompt or "", runtime.context
+        )
+        return request
+
+
 def graph_builder(
     tools: list[BaseTool] = [],
     subagents: list[SubAgent] = [],
@@ -59,10 +90,15 @@ def graph_builder(
     ] = "react",
 ) -> CompiledStateGraph:
     if graph_id in ["react", "create_react_agent", "create_agent"] and not subagents:
+
+        def runtime_prompt(state: dict) -> list[BaseMessage]:
+            system = runtime_system_prompt(prompt, get_runtime().context)
+            return [SystemMessage(system), *state["messages"]]
+
         return create_agent(
             model=model,
             tools=tools,
-            prompt=prompt,
+            prompt=runtime_prompt,
             checkpointer=checkpointer,
             context_schema=context_schema,
             store=store,
@@ -73,6 +109,7 @@ def graph_builder(
         tools=tools,
         subagents=subagents,
         instructions=prompt,
+        middleware=[RuntimePromptMiddleware()],
         checkpointer=checkpointer,
     )
     deep_agent.context_schema = context_schema
@@ -85,28 +122,67 @@ async def init_tools(
     a2a: A2AServers,
     mcp: dict = None,
     thread_id: str = None,
+    mcp_sessions: dict | None = None,
 ) -> list[BaseTool]:
     """Initialize tools for a subagent."""
-    tools = tool_service.default_tools(tools)
+    with AGENT_CONSTRUCT_SECONDS.time(phase="tools"):
+        tools = tool_service.default_tools(tools)
     a2a = A2AServers(a2a=a2a)
     if a2a.validate() and thread_id:
-        tools = tools + a2a.fetch_agent_cards_as_tools(thread_id)
+        with AGENT_CONSTRUCT_SECONDS.time(phase="a2a"):
+            tools = tools + await a2a.fetch_agent_cards_as_tools(thread_id)
     if mcp:
-        mcp_client = MultiServerMCPClient(mcp)
-        tools = tools + await mcp_client.get_tools()
+        with AGENT_CONSTRUCT_SECONDS.time(phase="mcp"):
+            tools = tools + await mcp_service.get_tools(mcp, mcp_sessions)
     return tools
 
 
-async def init_subagents(params: LLMRequest | LLMStreamRequest) -> list[SubAgent]:
+async def init_a2a_cards(params: LLMRequest | LLMStreamRequest) -> list[dict | None]:
+    """
+    Resolve the agent card of every A2A server the graph would bind, including
+    the subagents'. Servers that fail to resolve are None so a graph built
+    while one was down is not reused once it is back.
+    """
+    servers = []
+    for a2a in [params.a2a, *(subagent.a2a for subagent in params.subagents or [])]:
+        a2a = A2AServers(a2a=a2a or {})
+        if a2a.validate():
+            servers.extend(a2a.a2a.values())
+    if not servers:
+        return []
+    with AGENT_CONSTRUCT_SECONDS.time(phase="a2a"):
+        cards = await resolve_agent_cards(
+            (server.base_url, server.agent_card_path) for server in servers
+        )
+    return [
+        None if isinstance(card, Exception) else card.model_dump(mode="json")
+        for card in cards
+    ]
+
+
+async def init_subagents(
+    params: LLMRequest | LLMStreamRequest, mcp_sessions: dict | None = None
+) -> list[SubAgent]:
+    # Resolve every subagent's tools concurrently
+    subagent_tools = await asyncio.gather(
+        *(
+            init_tools(
+                subagent.tools,
+                subagent.a2a,
+                subagent.mcp,
+                params.metadata.thread_id,
+                mcp_sessions,
+            )
+            for subagent in params.subagents
+        )
+    )
     result = []
-    for subagent in params.subagents:
+    for subagent, tools in zip(params.subagents, subagent_tools):
         subagent_dict = {
             "name": subagent.slug,
             "description": subagent.description,
             "prompt": subagent.prompt,
-            "tools": await init_tools(
-                subagent.tools, subagent.a2a, subagent.mcp, params.metadata.thread_id
-            ),
+            "tools": tools,
         }
 
         # if getattr(subagent, "model", None) is not None:
@@ -115,16 +191,67 @@ async def init_subagents(params: LLMRequest | LLMStreamRequest) -> list[SubAgent
     return result
 
 
-async def init_memories(params: LLMRequest | LLMStreamRequest, tools: list[BaseTool]):
-    memory_prompt = await add_memories_to_system()
-    prompt = params.system + "\n" + memory_prompt if memory_prompt else params.system
-    return tools + MEMORY_TOOLS, prompt
+def last_user_query(params: LLMRequest | LLMStreamRequest) -> str | None:
+    for message in reversed(params.messages):
+        if message.role != "user":
+            continue
+        if isinstance(message.content, str):
+            return message.content
+        return (
+            " ".join(
+                part.get("text", "")
+                for part in message.content
+                if isinstance(part, dict)
+            ).strip()
+            or None
+        )
+    return None
 
 
-def init_config(params: LLMRequest | LLMStreamRequest):
+async def init_memories(
+    params: LLMRequest | LLMStreamRequest,
+    tools: list[BaseTool],
+    store: BaseStore | None = None,
+):
+    with AGENT_CONSTRUCT_SECONDS.time(phase="memory"):
+        memory_prompt = await add_memories_to_system(
+            params.metadata.user_id, store, last_user_query(params)
+        )
+    return tools + MEMORY_TOOLS, memory_prompt
+
+
+def init_context(params: LLMRequest | LLMStreamRequest, memories: str | None = None):
+    """Per-invocation prompt context, passed to the graph as runtime context."""
+    metadata = params.metadata.model_dump() if params.metadata else {}
+    context = {
+        key: metadata[key]
+        for key in ("current_time", "timezone", "language")
+        if metadata.get(key) is not None
+    }
+    if memories:
+        context["memories"] = memories
+    return context
+
+
+def init_config(params: LLMRequest | LLMStreamRequest, user_id: str | None = None):
+    """
+    ``user_id`` is the authenticated user, never the client-supplied
+    metadata: token budgets are charged and usage recorded to it.
+    """
     if params.metadata:
+        callbacks = [metrics_callback]
+        if user_id:
+            callbacks.append(TokenBudgetCallback(user_id))
+            callbacks.append(
+                UsageTracker(
+                    user_id,
+                    assistant_id=params.metadata.assistant_id,
+                    thread_id=params.metadata.thread_id,
+                )
+            )
         return RunnableConfig(
             configurable=params.metadata.model_dump(),
+            callbacks=callbacks,
             max_concurrency=10,
             recursion_limit=100,
         )
@@ -139,45 +266,92 @@ async def construct_agent(
     params: LLMRequest | LLMStreamRequest,
     checkpointer: BaseCheckpointSaver = None,
     store: BaseStore = None,
+    user_id: str | None = None,
 ):
+    mcp_sessions = {}
     try:
         params.metadata.thread_id = params.metadata.thread_id or str(uuid4())
         # Add config if it exists
-        config = init_config(params)
-        # Initialize tools
-        tools = await init_tools(
-            tools=params.tools,
-            a2a=params.a2a,
-            mcp=params.mcp,
-            thread_id=params.metadata.thread_id,
-        )
+        config = init_config(params, user_id)
         prompt = params.system
+        memory_tools, memories = [], None
         if config:
-            tools, prompt = await init_memories(params, tools)
+            memory_tools, memories = await init_memories(params, memory_tools, store)
+        graph_id = (
+            params.metadata.graph_id
+            if params.metadata and params.metadata.graph_id
+            else "react"
+        )
 
-        if params.subagents:
-            sub_agents = await init_subagents(params)
-            params.subagents = sub_agents
+        # Lease the MCP sessions whose tools the graph is bound to for this run
+        mcp_sessions = await mcp_service.acquire(
+            params.mcp or {},
+            *(subagent.mcp or {} for subagent in params.subagents or []),
+            user_id=user_id,
+        )
+
+        # Reuse the compiled graph when the assistant configuration is unchanged;
+        # memories, time, timezone and language are supplied at invocation
+        cache_key = agent_cache.make_key(
+            prompt=prompt,
+            graph_id=graph_id,
+            memory=bool(config),
+            a2a_cards=await init_a2a_cards(params),
+            mcp_sessions=sorted(
+                session.generation for session in mcp_sessions.values()
+            ),
+            **params.model_dump(
+                mode="json", include={"model", "tools", "a2a", "mcp", "subagents"}
+            ),
+        )
+        graph = agent_cache.get(cache_key)
+        tools = []
+        if graph is None:
+            # Initialize tools
+            tools = await init_tools(
+                tools=params.tools,
+                a2a=params.a2a,
+                mcp=params.mcp,
+                thread_id=params.metadata.thread_id,
+                mcp_sessions=mcp_sessions,
+            )
+            tools = tools + memory_tools
+
+            if params.subagents:
+                with AGENT_CONSTRUCT_SECONDS.time(phase="subagents"):
+                    sub_agents = await init_subagents(params, mcp_sessions)
+                params.subagents = sub_agents
+
+            with AGENT_CONSTRUCT_SECONDS.time(phase="graph"):
+                graph = graph_builder(
+                    tools=tools,
+                    subagents=params.subagents,
+                    model=params.model,
+                    prompt=prompt,
+                    context_schema=ContextSchema,
+                    graph_id=graph_id,
+                )
+            agent_cache.set(cache_key, graph, params.metadata.assistant_id)
 
         # Asynchronous LLM call
         agent = Orchestra(
-            graph_id=(
-                params.metadata.graph_id
-                if params.metadata and params.metadata.graph_id
-                else "react"
-            ),
+            graph_id=graph_id,
             config=config,
             model=params.model,
             tools=tools,
             subagents=params.subagents,
             context_schema=ContextSchema,
-            prompt=init_system_prompt(prompt, params.metadata or {}),
+            prompt=prompt,
             checkpointer=checkpointer,
             store=store,
+            graph=graph,
+            context=init_context(params, memories),
+            mcp_sessions=mcp_sessions,
         )
         return agent
     except Exception as e:
         logger.error(f"Error constructing agent: {e}")
+        await mcp_service.release(mcp_sessions)
         raise e
 
 
@@ -193,8 +367,13 @@ class Orchestra:
         checkpointer: BaseCheckpointSaver = None,
         store: BaseStore = None,
         graph_id: Literal["react", "deepagent"] = "react",
+        graph: CompiledStateGraph | None = None,
+        context: dict[str, Any] | None = None,
+        mcp_sessions: dict | None = None,
     ):
         self.tools = tools
+        self.context = context or {}
+        self.mcp_sessions = mcp_sessions or {}
         self.model = model
         self.prompt = prompt
         self.config = config
@@ -202,6 +381,12 @@ class Orchestra:
         self.store = store
         self.checkpointer = checkpointer
         self.subagents = subagents
+        if graph is not None:
+            # Bind the shared compiled graph to this request's persistence
+            self.graph = graph.copy(
+                update={"checkpointer": self.checkpointer, "store": self.store}
+            )
+            return
         self.graph = graph_builder(
             tools=self.tools,
             subagents=self.subagents,
@@ -218,17 +403,34 @@ class Orchestra:
         messages: list[BaseMessage],
         context: dict[str, Any] = None,
     ) -> BaseMessage:
-        return await self.graph.ainvoke(messages, self.config, context=context)
-
-    def astream(
+        try:
+            return await self.graph.ainvoke(
+                messages, self.config, context={**self.context, **(context or {})}
+            )
+        finally:
+            await self.release()
+
+    async def astream(
         self,
         messages: list[BaseMessage],
         stream_mode: str = "messages",
         context: dict[str, Any] = None,
     ) -> AsyncGenerator[BaseMessage, None]:
-        return self.graph.astream(
-            messages, self.config, stream_mode=stream_mode, context=context
-        )
+        try:
+            async for chunk in self.graph.astream(
+                messages,
+                self.config,
+                stream_mode=stream_mode,
+                context={**self.context, **(context or {})},
+            ):
+                yield chunk
+        finally:
+            await self.release()
+
+    async def release(self) -> None:
+        """Return the run's MCP session leases once it is done with the tools."""
+        sessions, self.mcp_sessions = self.mcp_sessions, {}
+        await mcp_service.release(sessions)
 
     async def aget_state(self, config: RunnableConfig = None):
         if config is None:
@@ -249,7 +451,7 @@ class Orchestra:
                 messages[-1].model = model  # Set model on last AI message
 
                 # Update checkpoint state with modified messages
-                new_config = await checkpoint_service.update_checkpoint_state(
+                new_config = await self.graph.aupdate_state(
                     final_state.config, {"messages": messages}
                 )
 
@@ -261,9 +463,12 @@ class Orchestra:
                 user_id = final_state.metadata.get("user_id")
 
                 # Update thread with new message and timestamp
-                thread_service.user_id = user_id
-                if assistant_id:
-                    thread_service.assistant_id = assistant_id
+                # (kept in memory when the caller is not authenticated)
+                thread_service = ThreadService(
+                    user_id=user_id,
+                    assistant_id=assistant_id,
+                    store=self.store if user_id and self.store else IN_MEMORY_STORE,
+                )
                 await thread_service.update(
                     thread_id=thread_id,
                     data={
@@ -0,0 +1,48 @@
+from typing import Optional
+from sqlalchemy import column, select, table
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# LangGraph's checkpoints table, owned and migrated by AsyncPostgresSaver
+checkpoints = table(
+    "checkpoints",
+    column("thread_id"),
+    column("checkpoint_ns"),
+    column("checkpoint_id"),
+    column("parent_checkpoint_id"),
+    column("checkpoint", JSONB),
+    column("metadata", JSONB),
+)
+
+
+class CheckpointRepo:
+    def __init__(self, db: AsyncSession, user_id: str = None):
+        self.db = db
+        self.user_id = user_id
+
+    def metadata_query(self, thread_id: str, limit: int, before: Optional[str] = None):
+        """
+        Ids, metadata and timestamps of a thread's checkpoints newest first,
+        without reading the checkpoints or their channel blobs.
+        """
+        query = select(
+            checkpoints.c.thread_id,
+            checkpoints.c.checkpoint_ns,
+            checkpoints.c.checkpoint_id,
+            checkpoints.c.parent_checkpoint_id,
+            checkpoints.c.metadata,
+            checkpoints.c.checkpoint["ts"].astext.label("ts"),
+        ).where(checkpoints.c.thread_id == thread_id)
+        if self.user_id:
+            query = query.where(
+                checkpoints.c.metadata.contains({"user_id": self.user_id})
+            )
+        if before:
+            query = query.where(checkpoints.c.checkpoint_id < before)
+        return query.order_by(checkpoints.c.checkpoint_id.desc()).limit(limit)
+
+    async def list_metadata(
+        self, thread_id: str, limit: int, before: Optional[str] = None
+    ) -> list[dict]:
+        result = await self.db.execute(self.metadata_query(thread_id, limit, before))
+        return [dict(row) for row in result.mappings()]
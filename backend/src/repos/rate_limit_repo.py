@@ -0,0 +1,56 @@
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.models import RateLimit
+
+
+class RateLimitRepo:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def take(
+        self,
+        key: str,
+        bucket: str,
+        capacity: float,
+        rate: float,
+        cost: float = 1,
+        force: bool = False,
+    ) -> tuple[bool, float]:
+        """
+        Refill the bucket for the time since it was last used, then take
+        ``cost`` from it if it holds enough. The upsert locks the row until
+        commit, so workers sharing a bucket take from it one at a time.
+        ``force`` takes even from a short bucket (for tokens already spent),
+        down to ``-capacity``. Returns whether it was allowed and what is left.
+        """
+        elapsed = func.extract("epoch", func.now() - RateLimit.updated_at)
+        refill = (
+            insert(RateLimit)
+            .values(key=key, bucket=bucket, tokens=capacity)
+            .on_conflict_do_update(
+                index_elements=[RateLimit.key, RateLimit.bucket],
+                set_={
+                    "tokens": func.least(capacity, RateLimit.tokens + elapsed * rate),
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(RateLimit.tokens)
+        )
+        try:
+            result = await self.db.execute(refill)
+            tokens = result.scalar_one()
+            allowed = tokens >= cost
+            if allowed or force:
+                tokens = max(tokens - cost, -capacity)
+                await self.db.execute(
+                    update(RateLimit)
+                    .where(RateLimit.key == key, RateLimit.bucket == bucket)
+                    .values(tokens=tokens)
+                )
+            await self.db.commit()
+            return allowed, tokens
+        except Exception as e:
+            await self.db.rollback()
+            raise e
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.models import Run, RunStatus
+
+
+class RunRepo:
+    def __init__(self, db: AsyncSession, user_id: str = None):
+        self.db = db
+        self.user_id = user_id
+
+    async def find_by_id(self, run_id: str) -> Optional[Run]:
+        query = select(Run).filter(Run.id == run_id)
+        if self.user_id:
+            query = query.filter(Run.user_id == self.user_id)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def create(self, payload: dict) -> Run:
+        try:
+            run = Run(user_id=self.user_id, payload=payload)
+            self.db.add(run)
+            await self.db.commit()
+            await self.db.refresh(run)
+            return run
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    async def count_queued(self) -> int:
+        query = (
+            select(func.count()).select_from(Run).filter(Run.status == RunStatus.QUEUED)
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one()
+
+    async def claim(
+        self, worker_id: str, stale_after: int, max_attempts: int
+    ) -> Optional[Run]:
+        """
+        Lock the oldest claimable run with FOR UPDATE SKIP LOCKED and mark it
+        running, so concurrent workers never pick the same run. Runs left
+        running longer than ``stale_after`` seconds (a worker died) are
+        claimed again until they reach ``max_attempts``.
+        """
+        stale = (Run.status == RunStatus.RUNNING) & (
+            Run.started_at < func.now() - timedelta(seconds=stale_after)
+        )
+        next_run = (
+            select(Run.id)
+            .filter(
+                or_(Run.status == RunStatus.QUEUED, stale),
+                Run.attempts < max_attempts,
+            )
+            .order_by(Run.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(Run)
+            .where(Run.id == next_run)
+            .values(
+                status=RunStatus.RUNNING,
+                started_at=func.now(),
+                attempts=Run.attempts + 1,
+                worker_id=worker_id,
+            )
+            .returning(Run)
+        )
+        try:
+            result = await self.db.execute(query)
+            run = result.scalar_one_or_none()
+            if run is not None:
+                # Keep the loaded row usable after commit expires the session
+                self.db.expunge(run)
+            await self.db.commit()
+            return run
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    async def expire_stale(self, stale_after: int, max_attempts: int) -> int:
+        """Fail runs that went stale on their last allowed attempt."""
+        query = (
+            update(Run)
+            .where(
+                Run.status == RunStatus.RUNNING,
+                Run.started_at < func.now() - timedelta(seconds=stale_after),
+                Run.attempts >= max_attempts,
+            )
+            .values(
+                status=RunStatus.FAILED,
+                error="Run timed out",
+                finished_at=func.now(),
+            )
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount
+
+    async def finish(
+        self,
+        run_id: str,
+        status: str,
+        worker_id: str,
+        attempt: int,
+        result: dict = None,
+        error: str = None,
+    ) -> bool:
+        """
+        Record the outcome of a run. Only the worker holding the given attempt
+        may finish it; returns False when the run was claimed again.
+        """
+        query = (
+            update(Run)
+            .where(
+                Run.id == run_id,
+                Run.worker_id == worker_id,
+                Run.attempts == attempt,
+            )
+            .values(status=status, result=result, error=error, finished_at=func.now())
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def requeue(self, run_id: str, worker_id: str, attempt: int) -> bool:
+        """Hand a run back to the queue without counting the attempt."""
+        query = (
+            update(Run)
+            .where(
+                Run.id == run_id,
+                Run.status == RunStatus.RUNNING,
+                Run.worker_id == worker_id,
+                Run.attempts == attempt,
+            )
+            .values(
+                status=RunStatus.QUEUED,
+                attempts=Run.attempts - 1,
+                worker_id=None,
+            )
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount > 0
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.models import TokenUsage
+
+USAGE_GROUPS = {
+    "day": func.date_trunc(literal_column("'day'"), TokenUsage.created_at),
+    "assistant": TokenUsage.assistant_id,
+    "thread": TokenUsage.thread_id,
+    "model": TokenUsage.model,
+}
+
+
+class UsageRepo:
+    def __init__(self, db: AsyncSession, user_id: str = None):
+        self.db = db
+        self.user_id = user_id
+
+    async def create_many(self, rows: list[dict]) -> None:
+        try:
+            await self.db.execute(insert(TokenUsage), rows)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    async def aggregate(
+        self,
+        group_by: list[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[dict]:
+        """Summed usage of the user per combination of ``group_by`` keys."""
+        groups = [USAGE_GROUPS[name].label(name) for name in group_by]
+        query = select(
+            *groups,
+            func.sum(TokenUsage.calls).label("calls"),
+            func.sum(TokenUsage.input_tokens).label("input_tokens"),
+            func.sum(TokenUsage.output_tokens).label("output_tokens"),
+            func.sum(TokenUsage.total_tokens).label("total_tokens"),
+        ).filter(TokenUsage.user_id == self.user_id)
+        if start:
+            query = query.filter(TokenUsage.created_at >= start)
+        if end:
+            query = query.filter(TokenUsage.created_at < end)
+        if groups:
+            query = query.group_by(*groups).order_by(*groups)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from src.schemas.entities.auth import UserCreate
 from src.schemas.models import Thread, User, Token
 from src.constants import APP_SECRET_KEY
+from src.services.auth_cache import auth_cache
 from src.utils.logger import logger
 from sqlalchemy import Column
 
@@ -85,6 +86,7 @@ class UserRepo:
                 setattr(user, key, value)
             await self.db.commit()
             await self.db.refresh(user)
+            auth_cache.invalidate(user_id)
         return user
 
     async def delete(self) -> bool:
@@ -94,6 +96,7 @@ class UserRepo:
         if user:
             await self.db.delete(user)
             await self.db.commit()
+            auth_cache.invalidate(user_id)
             return True
         return False
 
@@ -4,24 +4,28 @@ from .llm import llm_router as llm
 from .thread import router as thread
 from .tool import router as tool
 from .health import router as health
+from .metrics import router as metrics
 from .auth import router as auth
 from .token import router as token
 from .storage import router as storage
 from .assistant import router as assistant
 from .schedule import router as schedule
 from .prompt import router as prompt
+from .usage import router as usage
 
 __all__ = [
     "llm",
     "thread",
     "tool",
     "health",
+    "metrics",
     "auth",
     "token",
     "storage",
     "assistant",
     "schedule",
     "prompt",
+    "usage",
 ]
 
 if LANGCONNECT_SERVER_URL:
@@ -9,7 +9,7 @@ from src.services.db import get_store
 from src.utils.auth import verify_credentials
 from src.utils.logger import logger
 from src.services.assistant import (
-    assistant_service,
+    AssistantService,
     AssistantSearch,
     Assistant,
     ASSISTANT_EXAMPLES,
@@ -28,15 +28,19 @@ async def search_assistants(
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    assistant_service.store = store
-    assistant_service.user_id = user.id
+    assistant_service = AssistantService(user_id=user.id, store=store)
     # If id is provided, return the assistant
     if "id" in assistant_search.filter:
         assistant = await assistant_service.get(assistant_search.filter["id"])
         return {"assistants": [assistant.model_dump()]}
     # If id is not provided, return all assistants
-    assistants = await assistant_service.search()
-    return {"assistants": [assistant.model_dump() for assistant in assistants]}
+    assistants, next_cursor = await assistant_service.search(
+        limit=assistant_search.limit, cursor=assistant_search.cursor
+    )
+    return {
+        "assistants": [assistant.model_dump() for assistant in assistants],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("", name="Create Assistant")
@@ -48,8 +52,7 @@ async def create_assistant(
     store: AsyncPostgresStore = Depends(get_store),
 ):
     try:
-        assistant_service.store = store
-        assistant_service.user_id = user.id
+        assistant_service = AssistantService(user_id=user.id, store=store)
         assistant_id = str(uuid.uuid4())
         existing_assistant = await assistant_service.get(assistant_id)
         if existing_assistant:
@@ -76,8 +79,7 @@ async def update_assistant(
     store: AsyncPostgresStore = Depends(get_store),
 ):
     try:
-        assistant_service.store = store
-        assistant_service.user_id = user.id
+        assistant_service = AssistantService(user_id=user.id, store=store)
         await assistant_service.update(assistant_id, assistant.model_dump())
         return {"assistant_id": assistant_id}
 
@@ -94,7 +96,6 @@ async def delete_assistant(
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    assistant_service.store = store
-    assistant_service.user_id = user.id
+    assistant_service = AssistantService(user_id=user.id, store=store)
     await assistant_service.delete(assistant_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
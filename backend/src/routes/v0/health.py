@@ -1,6 +1,6 @@
 from fastapi import Depends, APIRouter, HTTPException
 from src.constants import APP_VERSION
-from src.services.db import get_store, get_checkpoint_db
+from src.services.db import get_store, get_checkpointer
 from langgraph.store.postgres import AsyncPostgresStore
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from src.utils.logger import logger
@@ -57,14 +57,13 @@ async def check_store_health(
 
 
 @router.get("/health/checkpointer", name="Checkpointer Health Check")
-async def check_checkpointer_health():
+async def check_checkpointer_health(
+    checkpointer: AsyncPostgresSaver = Depends(get_checkpointer),
+):
     """Check if the AsyncPostgresSaver connection is healthy"""
     try:
         # Test basic checkpointer operation with timeout
-        async with (
-            get_checkpoint_db() as checkpointer,
-            asyncio.timeout(5.0),
-        ):  # 5 second timeout
+        async with asyncio.timeout(5.0):  # 5 second timeout
             # Try to list checkpoints (this tests the connection)
             from langgraph.checkpoint.base import RunnableConfig
 
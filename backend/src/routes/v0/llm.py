@@ -1,4 +1,5 @@
 import ujson
+from uuid import UUID
 from typing import Annotated, Any
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi import (
@@ -8,26 +9,30 @@ from fastapi import (
     Depends,
     APIRouter,
     Request,
+    Header,
+    Query,
     File,
     Form,
     UploadFile,
 )
 from langchain.chat_models import init_chat_model
 
-from src.constants import APP_LOG_LEVEL, GROQ_API_KEY
+from src.constants import APP_LOG_LEVEL, GROQ_API_KEY, STREAM_FORMAT
 from src.schemas.models import ProtectedUser
-from src.utils.auth import get_optional_user
+from src.utils.auth import get_optional_user, verify_credentials
 from src.utils.logger import logger, log_to_file
 from src.constants.mock import MockResponse
 from src.constants.examples import Examples
 from src.schemas.entities import LLMRequest
-from src.utils.stream import handle_multi_mode
+from src.utils.metrics import instrument_stream
+from src.utils.stream import FrameCoalescer, StreamSerializer
 from src.utils.llm import audio_to_text
 from src.flows import construct_agent
-from src.services.thread import thread_service
-from src.services.checkpoint import checkpoint_service
-from src.services.assistant import assistant_service, Assistant
-from src.services.db import get_store, get_checkpoint_db
+from src.services.assistant import AssistantService, Assistant
+from src.services.db import get_store, get_checkpointer
+from src.services.stream import RunStream, stream_service
+from src.services.run import RunService
+from src.services.response_cache import ResponseCache
 from src.utils.rate_limit import limiter
 from src.constants.llm import ChatModels
 
@@ -53,30 +58,36 @@ async def llm_invoke(
     params: LLMRequest = Body(openapi_examples=Examples.LLM_INVOKE_EXAMPLES),
     user: ProtectedUser = Depends(get_optional_user),
     store=Depends(get_store),
+    checkpointer=Depends(get_checkpointer),
 ) -> dict[str, Any] | Any:
+    # Scopes memories, budgets and usage, so never taken from the request body
+    params.metadata.user_id = user.id if user else None
     if user:
-        thread_service.store = store
-        thread_service.user_id = user.id
-        params.metadata.user_id = user.id
         if params.metadata.assistant_id:
-            assistant_service.user_id = user.id
-            assistant_service.store = store
-            assistant: Assistant = await assistant_service.get(params.metadata.assistant_id)
+            assistant_service = AssistantService(user_id=user.id, store=store)
+            assistant: Assistant = await assistant_service.get(
+                params.metadata.assistant_id
+            )
             params = assistant.to_llm_request(
-                messages=params.messages, 
-                model=params.model, 
+                messages=params.messages,
+                model=params.model,
                 prompt=params.system,
                 metadata=params.metadata,
             )
-    async with get_checkpoint_db() as checkpointer:
-        checkpoint_service.checkpointer = checkpointer
-        agent = await construct_agent(params, checkpointer, store)
-        checkpoint_service.graph = agent.graph
-        response = await agent.invoke(
-            {"messages": params.to_langchain_messages()},
-            context={"user_id": user.id} if user else None,
-        )
-        return response
+    cache = ResponseCache.for_request(params, params.metadata.user_id, store)
+    cached = await cache.lookup(params) if cache else None
+    if cached:
+        return {"messages": params.to_langchain_messages() + cached}
+    agent = await construct_agent(
+        params, checkpointer, store, user_id=user.id if user else None
+    )
+    response = await agent.invoke(
+        {"messages": params.to_langchain_messages()},
+        context={"user_id": user.id} if user else None,
+    )
+    if cache:
+        await cache.save(params, response)
+    return response
 
 
 ################################################################################
@@ -93,68 +104,172 @@ async def llm_stream(
     params: LLMRequest = Body(openapi_examples=Examples.LLM_STREAM_EXAMPLES),
     user: ProtectedUser = Depends(get_optional_user),
     store=Depends(get_store),
+    checkpointer=Depends(get_checkpointer),
 ) -> StreamingResponse:
     """
     Streams LLM output as server-sent events (SSE).
     """
     try:
+        serialize = StreamSerializer(params.stream_format or STREAM_FORMAT)
+        # Scopes memories, budgets and usage, so never taken from the request body
+        params.metadata.user_id = user.id if user else None
         if user:
-            thread_service.store = store
-            thread_service.user_id = user.id
-            params.metadata.user_id = user.id
             if params.metadata.assistant_id:
-                assistant_service.user_id = user.id
-                assistant_service.store = store
-                assistant: Assistant = await assistant_service.get(params.metadata.assistant_id)
+                assistant_service = AssistantService(user_id=user.id, store=store)
+                assistant: Assistant = await assistant_service.get(
+                    params.metadata.assistant_id
+                )
                 params = assistant.to_llm_request(
                     messages=params.messages,
                     model=params.model,
                     prompt=params.system,
                     metadata=params.metadata,
                 )
-                
-        async def event_generator():                    
-            async with get_checkpoint_db() as checkpointer:
-                checkpoint_service.checkpointer = checkpointer
-                agent = await construct_agent(params, checkpointer, store)
-                checkpoint_service.graph = agent.graph
-                try:
-                    async for chunk in agent.astream(
-                        {"messages": params.to_langchain_messages()},
-                        stream_mode=["messages", "values"],
-                        context={"user_id": user.id} if user else None,
-                    ):
-                        # Serialize and yield each chunk as SSE
-                        stream_chunk = handle_multi_mode(chunk)
-                        if stream_chunk:
-                            data = ujson.dumps(stream_chunk)
-                            log_to_file(
-                                str(data), params.model
-                            ) and APP_LOG_LEVEL == "DEBUG"
-                            logger.debug(f"data: {str(data)}")
-                            yield f"data: {data}\n\n"
-
-                except Exception as e:
-                    # Yield error as SSE if streaming fails
-                    logger.exception("Error in event_generator: %s", e)
-                    # raise HTTPException(status_code=500, detail=str(e))
-                    error_msg = ujson.dumps(("error", str(e)))
-                    yield f"data: {error_msg}\n\n"
-                finally:
-                    # Update model info in checkpoint after streaming
+
+        async def event_generator():
+            agent = None
+            try:
+                agent = await construct_agent(
+                    params, checkpointer, store, user_id=user.id if user else None
+                )
+                async for chunk in agent.astream(
+                    {"messages": params.to_langchain_messages()},
+                    stream_mode=["messages", "values"],
+                    context={"user_id": user.id} if user else None,
+                ):
+                    # Serialize each chunk, the run frames it as an SSE event
+                    stream_chunk = serialize(chunk)
+                    if stream_chunk:
+                        data = ujson.dumps(stream_chunk)
+                        if APP_LOG_LEVEL == "DEBUG":
+                            log_to_file(data, params.model)
+                            logger.debug(f"data: {data}")
+                        yield data
+
+            except Exception as e:
+                # Yield error as SSE if streaming fails
+                logger.exception("Error in event_generator: %s", e)
+                # raise HTTPException(status_code=500, detail=str(e))
+                yield ujson.dumps(("error", str(e)))
+            finally:
+                # Update model info in checkpoint after streaming
+                if agent:
                     await agent.add_model_to_ai_message(params.model)
 
-        # Return streaming response with appropriate headers
-        return StreamingResponse(
-            event_generator(),
-            media_type="text/event-stream",
-            headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
-        )
+        # The run outlives this connection, clients resume with its run id
+        run = stream_service.create(user.id if user else None)
+        run.start(instrument_stream(event_generator(), params.model))
+        return stream_response(run)
     except Exception as e:
         logger.exception("Error in llm_stream: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def stream_response(run: RunStream, last_event_id: int = 0) -> StreamingResponse:
+    # Return streaming response with appropriate headers
+    return StreamingResponse(
+        FrameCoalescer(run.subscribe(last_event_id)),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Run-ID": run.run_id,
+        },
+    )
+
+
+def get_user_run(run_id: str, user: ProtectedUser | None) -> RunStream:
+    run = stream_service.get(run_id)
+    if not run or (run.user_id and (not user or user.id != run.user_id)):
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@llm_router.get("/stream/{run_id}", name="Resume Stream")
+async def llm_stream_resume(
+    run_id: str,
+    user: ProtectedUser = Depends(get_optional_user),
+    last_event_id: int | None = Header(default=None, alias="Last-Event-ID"),
+    after: int | None = Query(
+        default=None,
+        description="Event id to resume after, for clients that can't set Last-Event-ID",
+    ),
+) -> StreamingResponse:
+    """
+    Replays a run's events after Last-Event-ID, then follows it until it ends.
+    """
+    run = get_user_run(run_id, user)
+    return stream_response(run, last_event_id or after or 0)
+
+
+@llm_router.delete("/stream/{run_id}", name="Cancel Stream")
+async def llm_stream_cancel(
+    run_id: str,
+    user: ProtectedUser = Depends(get_optional_user),
+):
+    """
+    Cancels a streamed run. Closing the connection no longer stops it.
+    """
+    run = get_user_run(run_id, user)
+    run.cancel()
+    return JSONResponse(content={"run_id": run_id, "cancelled": not run.done})
+
+
+################################################################################
+### Runs
+################################################################################
+@llm_router.post("/runs", status_code=status.HTTP_202_ACCEPTED, name="Enqueue Run")
+@limiter.limit(TIME_LIMIT)
+async def llm_run_create(
+    request: Request,
+    params: LLMRequest = Body(openapi_examples=Examples.LLM_INVOKE_EXAMPLES),
+    user: ProtectedUser = Depends(verify_credentials),
+    store=Depends(get_store),
+):
+    """
+    Queues an invocation for the run workers and returns immediately. Poll the
+    run for its status and fetch the result once it has finished.
+    """
+    params.metadata.user_id = user.id
+    if params.metadata.assistant_id:
+        assistant_service = AssistantService(user_id=user.id, store=store)
+        assistant: Assistant = await assistant_service.get(params.metadata.assistant_id)
+        params = assistant.to_llm_request(
+            messages=params.messages,
+            model=params.model,
+            prompt=params.system,
+            metadata=params.metadata,
+        )
+    run = await RunService(user_id=user.id).enqueue(params)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content={"run": run.to_dict()}
+    )
+
+
+@llm_router.get("/runs/{run_id}", name="Get Run")
+async def llm_run_get(
+    run_id: UUID,
+    user: ProtectedUser = Depends(verify_credentials),
+):
+    run = await RunService(user_id=user.id).get(run_id)
+    return JSONResponse(content={"run": run.to_dict()})
+
+
+@llm_router.get("/runs/{run_id}/result", name="Get Run Result")
+async def llm_run_result(
+    run_id: UUID,
+    user: ProtectedUser = Depends(verify_credentials),
+):
+    run = await RunService(user_id=user.id).get(run_id)
+    if not run.finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Run is {run.status}",
+            headers={"Retry-After": "5"},
+        )
+    return JSONResponse(content={"run": run.to_dict(include_result=True)})
+
+
 ################################################################################
 ### Transcribe
 ################################################################################
@@ -0,0 +1,75 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.services.db import SharedDB
+from src.utils.metrics import REGISTRY, CallbackMetric, Labels
+from src.utils.retry import retry_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+POOL_STATS = ("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting")
+
+
+def pool_stats() -> dict[Labels, float]:
+    samples = {}
+    for name, db in (
+        ("store", SharedDB.store),
+        ("checkpointer", SharedDB.checkpointer),
+    ):
+        pool = getattr(db, "conn", None)
+        if not hasattr(pool, "get_stats"):
+            continue
+        stats = pool.get_stats()
+        for stat in POOL_STATS:
+            samples[(("pool", name), ("stat", stat))] = stats.get(stat, 0)
+    return samples
+
+
+def retry_counter(field: str):
+    def collect() -> dict[Labels, float]:
+        return {
+            (("dependency", name),): stats[field]
+            for name, stats in retry_metrics().items()
+        }
+
+    return collect
+
+
+def circuit_open() -> dict[Labels, float]:
+    return {
+        (("dependency", name),): int(stats["circuit"] != "closed")
+        for name, stats in retry_metrics().items()
+    }
+
+
+REGISTRY.register(
+    CallbackMetric(
+        "db_pool_connections",
+        "Connection pool size, idle connections and waiting requests.",
+        pool_stats,
+    )
+)
+for field in ("calls", "retries", "failures", "rejected"):
+    REGISTRY.register(
+        CallbackMetric(
+            f"db_retry_{field}_total",
+            f"Database calls through the retry wrapper ({field}).",
+            retry_counter(field),
+            type="counter",
+        )
+    )
+REGISTRY.register(
+    CallbackMetric(
+        "db_circuit_open",
+        "1 while a dependency's circuit breaker is open or half-open.",
+        circuit_open,
+    )
+)
+
+
+@router.get("/metrics", name="Metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -8,12 +8,13 @@ from src.schemas.models import ProtectedUser
 from src.services.db import get_store
 from src.utils.auth import verify_credentials
 from src.utils.logger import logger
-from src.services.prompt import prompt_service, PromptSearch, Prompt, PROMPT_EXAMPLES
+from src.services.prompt import PromptService, PromptSearch, Prompt, PROMPT_EXAMPLES
 from src.utils.format import raw_html
 
 
 router = APIRouter(tags=["Prompt"], prefix="/prompts")
 
+
 ################################################################################
 ### Search Prompts
 ################################################################################
@@ -23,19 +24,20 @@ async def search_prompts(
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    prompt_service.store = store
-    prompt_service.user_id = user.id
+    prompt_service = PromptService(user_id=user.id, store=store)
     # Return single prompt revision
     if "id" in prompt_search.filter and "v" in prompt_search.filter:
-        prompt = await prompt_service.get(prompt_search.filter["id"], prompt_search.filter["v"])
+        prompt = await prompt_service.get(
+            prompt_search.filter["id"], prompt_search.filter["v"]
+        )
         return {"prompts": [prompt]}
     ## Return single prompt
     if "id" in prompt_search.filter:
         prompt = await prompt_service.get(prompt_search.filter["id"])
         return {"prompts": [prompt]}
     # Return all prompts
-    prompts = await prompt_service.search(prompt_search)
-    return {"prompts": prompts}
+    prompts, next_cursor = await prompt_service.search(prompt_search)
+    return {"prompts": prompts, "next_cursor": next_cursor}
 
 
 ################################################################################
@@ -48,8 +50,7 @@ async def create_prompt(
     store: AsyncPostgresStore = Depends(get_store),
 ):
     try:
-        prompt_service.store = store
-        prompt_service.user_id = user.id
+        prompt_service = PromptService(user_id=user.id, store=store)
         prompt_id = str(uuid.uuid4())
         prompt = await prompt_service.revision(prompt_id, prompt)
         return {"prompt_id": prompt_id}
@@ -67,12 +68,15 @@ async def view_public_prompt(
     prompt_id: str = Path(..., description="The ID of the prompt to get"),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    prompt_service.store = store
+    prompt_service = PromptService(store=store)
     revisions = await prompt_service.list_revisions(prompt_id, public=True)
     if not revisions:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Prompt not found"
+        )
     return Response(content=revisions[-1].content, media_type="text/plain")
 
+
 ################################################################################
 ### Search Prompts
 ################################################################################
@@ -83,8 +87,7 @@ async def toggle_prompt_public(
     store: AsyncPostgresStore = Depends(get_store),
 ):
     try:
-        prompt_service.store = store
-        prompt_service.user_id = user.id
+        prompt_service = PromptService(user_id=user.id, store=store)
         public = await prompt_service.toggle_public(prompt_id)
         return {"prompt_id": prompt_id, "public": public}
 
@@ -93,5 +96,6 @@ async def toggle_prompt_public(
     except Exception as e:
         logger.exception(f"Error creating prompt: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    
-router.include_router(revision_router)
\ No newline at end of file
+
+
+router.include_router(revision_router)
@@ -6,10 +6,11 @@ from src.schemas.models import ProtectedUser
 from src.services.db import get_store
 from src.utils.auth import verify_credentials
 from src.utils.logger import logger
-from src.services.prompt import prompt_service, Prompt, PROMPT_EXAMPLES
+from src.services.prompt import PromptService, Prompt, PROMPT_EXAMPLES
 
 router = APIRouter()
 
+
 ################################################################################
 ### Prompt Revision
 ################################################################################
@@ -21,8 +22,7 @@ async def revise_prompt(
     store: AsyncPostgresStore = Depends(get_store),
 ):
     try:
-        prompt_service.store = store
-        prompt_service.user_id = user.id
+        prompt_service = PromptService(user_id=user.id, store=store)
         revisions = await prompt_service.list_revisions(prompt_id)
         existing_prompt = revisions[-1]
         if not existing_prompt:
@@ -42,6 +42,7 @@ async def revise_prompt(
         logger.exception(f"Error creating prompt: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+
 ################################################################################
 ### List Prompt Revisions
 ################################################################################
@@ -51,11 +52,11 @@ async def list_prompt_revisions(
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    prompt_service.store = store
-    prompt_service.user_id = user.id
+    prompt_service = PromptService(user_id=user.id, store=store)
     revisions = await prompt_service.list_revisions(prompt_id)
     return {"revisions": revisions}
 
+
 ################################################################################
 ### Delete Prompt
 ################################################################################
@@ -66,7 +67,6 @@ async def delete_prompt(
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
 ):
-    prompt_service.user_id = user.id
-    prompt_service.store = store
+    prompt_service = PromptService(user_id=user.id, store=store)
     await prompt_service.delete(prompt_id, v)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,4 @@
+import functools
 from typing import Any
 from uuid import UUID
 from fastapi import (
@@ -7,23 +8,26 @@ from fastapi import (
     Query,
     Request,
     APIRouter,
-    Response,
     UploadFile,
     status,
 )
-from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
 
-from src.utils.openapi import fetch_openapi_spec_sync, get_response_model
+from src.utils.openapi import get_response_model, load_openapi_spec
 from src.utils.retrieval import langconnect_proxy
 from src.constants import LANGCONNECT_SERVER_URL
 
 
-CLIENT_SPEC = (
-    fetch_openapi_spec_sync(f"{LANGCONNECT_SERVER_URL}/openapi.json")
-    if LANGCONNECT_SERVER_URL
-    else None
-)
+# Read from disk so startup never waits on LangConnect, see refresh_openapi_spec
+CLIENT_SPEC = load_openapi_spec() if LANGCONNECT_SERVER_URL else None
+
+
+@functools.cache
+def spec_model(name: str) -> type:
+    """Model of a LangConnect schema, built once however many routes use it."""
+    return get_response_model(name, CLIENT_SPEC)
+
+
 TAG = "RAG"
 if CLIENT_SPEC:
     gateway = APIRouter(prefix=f"/rag")
@@ -39,11 +43,10 @@ if CLIENT_SPEC:
         },
         summary=CLIENT_SPEC["paths"]["/collections"]["get"]["summary"],
         description=CLIENT_SPEC["paths"]["/collections"]["get"]["description"],
-        # response_model=list[get_response_model("CollectionResponse", CLIENT_SPEC)],
+        # response_model=list[spec_model("CollectionResponse")],
     )
     async def collection_list(request: Request):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.post(
         "/collections",
@@ -60,14 +63,13 @@ if CLIENT_SPEC:
         status_code=status.HTTP_201_CREATED,
         summary=CLIENT_SPEC["paths"]["/collections"]["post"]["summary"],
         description=CLIENT_SPEC["paths"]["/collections"]["post"]["description"],
-        response_model=get_response_model("CollectionCreate", CLIENT_SPEC),
+        response_model=spec_model("CollectionCreate"),
     )
     async def collection_create(
         request: Request,
-        collection_data: get_response_model("CollectionCreate", CLIENT_SPEC),  # type: ignore
+        collection_data: spec_model("CollectionCreate"),  # type: ignore
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.get(
         "/collections/{collection_id}",
@@ -82,11 +84,10 @@ if CLIENT_SPEC:
         description=CLIENT_SPEC["paths"]["/collections/{collection_id}"]["get"][
             "description"
         ],
-        response_model=get_response_model("CollectionResponse", CLIENT_SPEC),
+        response_model=spec_model("CollectionResponse"),
     )
     async def collection_get(request: Request, collection_id: UUID):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.patch(
         "/collections/{collection_id}",
@@ -106,15 +107,14 @@ if CLIENT_SPEC:
                 "patch"
             ]["responses"]["200"],
         },
-        response_model=get_response_model("CollectionResponse", CLIENT_SPEC),
+        response_model=spec_model("CollectionResponse"),
     )
     async def collection_update(
         request: Request,
         collection_id: UUID,
-        collection_data: get_response_model("CollectionCreate", CLIENT_SPEC),  # type: ignore
+        collection_data: spec_model("CollectionCreate"),  # type: ignore
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.delete(
         "/collections/{collection_id}",
@@ -132,8 +132,7 @@ if CLIENT_SPEC:
         ],
     )
     async def collection_delete(request: Request, collection_id: UUID):
-        response = await langconnect_proxy(request)
-        return Response(status_code=response.status_code)
+        return await langconnect_proxy(request)
 
     #####################################################################################################
     ## Documents
@@ -156,7 +155,7 @@ if CLIENT_SPEC:
         operation_id=CLIENT_SPEC["paths"]["/collections/{collection_id}/documents"][
             "get"
         ]["operationId"],
-        response_model=list[get_response_model("DocumentResponse", CLIENT_SPEC)],
+        response_model=list[spec_model("DocumentResponse")],
     )
     async def documents_list(
         request: Request,
@@ -164,8 +163,7 @@ if CLIENT_SPEC:
         limit: int = Query(10, ge=1, le=100),
         offset: int = Query(0, ge=0),
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.post(
         "/collections/{collection_id}/documents",
@@ -193,8 +191,7 @@ if CLIENT_SPEC:
         files: list[UploadFile] = File(...),
         metadatas_json: str | None = Form(None),
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.post(
         "/collections/{collection_id}/documents/search",
@@ -226,15 +223,14 @@ if CLIENT_SPEC:
         operation_id=CLIENT_SPEC["paths"][
             "/collections/{collection_id}/documents/search"
         ]["post"]["operationId"],
-        # response_model=list[get_response_model("SearchResult", CLIENT_SPEC)],
+        # response_model=list[spec_model("SearchResult")],
     )
     async def documents_search(
         request: Request,
         collection_id: UUID,
-        search_query: get_response_model("SearchQuery", CLIENT_SPEC),  # type: ignore
+        search_query: spec_model("SearchQuery"),  # type: ignore
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
 
     @gateway.delete(
         "/collections/{collection_id}/documents/{document_id}",
@@ -261,5 +257,4 @@ if CLIENT_SPEC:
         collection_id: UUID,
         document_id: str,
     ):
-        response = await langconnect_proxy(request)
-        return JSONResponse(status_code=response.status_code, content=response.json())
+        return await langconnect_proxy(request)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Response, HTTPException, Body
 from fastapi.responses import JSONResponse
 
-from src.services.schedule import schedule_service
+from src.services.schedule import ScheduleService
 from src.schemas.models import ProtectedUser
 from src.utils.auth import verify_credentials
 from src.constants.examples import Examples
@@ -28,7 +28,7 @@ router = APIRouter(tags=["Schedule"])
 async def get_jobs(
     user: ProtectedUser = Depends(verify_credentials),
 ):
-    schedule_service.user_id = user.id
+    schedule_service = ScheduleService(user_id=user.id)
     schedules = schedule_service.get_jobs()
     return {"schedules": [schedule.model_dump() for schedule in schedules]}
 
@@ -48,7 +48,7 @@ async def get_job(
     job_id: str,
     user: ProtectedUser = Depends(verify_credentials),
 ):
-    schedule_service.user_id = user.id
+    schedule_service = ScheduleService(user_id=user.id)
     schedule = schedule_service.get_job(job_id)
     return {"schedule": schedule.model_dump()}
 
@@ -63,7 +63,7 @@ async def create_job(
     ),
     user: ProtectedUser = Depends(verify_credentials),
 ):
-    schedule_service.user_id = user.id
+    schedule_service = ScheduleService(user_id=user.id)
     schedule = schedule_service.create_job(job)
     return JSONResponse(
         status_code=201,
@@ -87,7 +87,7 @@ async def update_job(
     ),
     user: ProtectedUser = Depends(verify_credentials),
 ):
-    schedule_service.user_id = user.id
+    schedule_service = ScheduleService(user_id=user.id)
     schedule = schedule_service.update_job(job_id, job_update)
     return JSONResponse(
         status_code=200,
@@ -108,6 +108,6 @@ async def delete_job(
     job_id: str,
     user: ProtectedUser = Depends(verify_credentials),
 ):
-    schedule_service.user_id = user.id
+    schedule_service = ScheduleService(user_id=user.id)
     schedule_service.delete_job(job_id)
     return Response(status_code=204)
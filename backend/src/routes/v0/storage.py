@@ -1,16 +1,18 @@
 import os
 import json
+import asyncio
 import traceback
+from urllib.parse import quote
 
 from src.utils.logger import logger as logging
-import mimetypes
 from typing import List, Any
 
-from fastapi.responses import UJSONResponse
+from fastapi.responses import StreamingResponse, UJSONResponse
 from fastapi import (
     APIRouter,
     Depends,
     File,
+    Header,
     HTTPException,
     Response,
     UploadFile,
@@ -42,7 +44,7 @@ async def list_files(
     user: User = Depends(verify_credentials),
 ):
     try:
-        files = storage_service.retrieve_all_files(
+        files = await storage_service.retrieve_all_files(
             BUCKET,
             prefix=f"users/{user.id or TEST_USER_ID}/{path}"
             if path
@@ -81,28 +83,25 @@ async def list_presigned_urls(
             prefix = f"users/{user.id or TEST_USER_ID}/{path}"
         if not path:
             prefix = f"users/{user.id or TEST_USER_ID}"
-        # Retrieve filenames from the bucket with optional path prefix
-        files = storage_service.retrieve_all_files(BUCKET, prefix=prefix)
-        urls = {}
+        # Retrieve files from the bucket with optional path prefix
+        files = await storage_service.retrieve_all_files(BUCKET, prefix=prefix)
+        # Sign the URLs of every content type concurrently
+        by_type: dict[str, list[str]] = {}
         for file in files:
-            if file in prefix:
-                file_path = prefix
-            else:
-                extension = os.path.splitext(file)[1].lower().strip(".")
-                file_path = (
-                    f"{prefix}/{extension}/{file}" if not path else f"{prefix}/{file}"
+            by_type.setdefault(file["content_type"], []).append(file["object_name"])
+        signed = await asyncio.gather(
+            *(
+                storage_service.create_presigned_urls(
+                    BUCKET,
+                    object_names,
+                    3600,
+                    response_content_type=content_type,
+                    inline=not download,  # Invert the download flag here
                 )
-            # Determine MIME type for the file
-            content_type = mimetypes.guess_type(file)[0] or "application/octet-stream"
-            # Generate URLs with specified content disposition, note the inversion of the `download` flag for `inline`
-            url = storage_service.create_presigned_urls(
-                BUCKET,
-                [file_path],
-                3600,
-                response_content_type=content_type,
-                inline=not download,  # Invert the download flag here
+                for content_type, object_names in by_type.items()
             )
-            urls[file] = url.get(file_path)
+        )
+        urls = {name: url for batch in signed for name, url in batch.items()}
 
         # Return formatted JSON response
         return UJSONResponse(content={"urls": urls})
@@ -117,6 +116,95 @@ async def list_presigned_urls(
         ) from err
 
 
+#################################################
+## Download a file
+#################################################
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into (start, end), both inclusive.
+
+    Returns None when the header should be ignored and raises 416 when the
+    range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start, _, end = spec.strip().partition("-")
+    try:
+        if not start:
+            # Suffix range: the last `end` bytes
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+@router.get(
+    "/storage/download",
+    tags=[TAG],
+    name="storage_download_file",
+)
+async def download_file(
+    path: str,
+    download: bool = Query(False, description="Send as an attachment"),
+    range: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+    user: User = Depends(verify_credentials),
+):
+    """
+    Stream a file from the user's storage. Supports a single byte ``Range``
+    and ``If-None-Match`` against the object's ETag.
+    """
+    if ".." in path.split("/"):
+        raise HTTPException(status_code=400, detail="Invalid path")
+    object_name = f"users/{user.id or TEST_USER_ID}/{path.lstrip('/')}"
+    stat = await storage_service.stat_file(BUCKET, object_name)
+    if stat is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    etag = f'"{stat.etag}"'
+    filename = quote(os.path.basename(object_name))
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": (
+            f"{'attachment' if download else 'inline'}; filename*=UTF-8''{filename}"
+        ),
+    }
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = parse_range(range, stat.size) if range and stat.size else None
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{stat.size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        start, end = 0, stat.size - 1
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        storage_service.stream_file(
+            BUCKET, object_name, offset=start, length=end - start + 1
+        )
+        if stat.size
+        else iter(()),
+        status_code=status_code,
+        media_type=stat.content_type or "application/octet-stream",
+        headers=headers,
+    )
+
+
 #################################################
 ## Add files to storage
 #################################################
@@ -131,7 +219,7 @@ async def save_files(
     user: User = Depends(verify_credentials),
 ):
     try:
-        result = storage_service.upload_files(files, BUCKET, f"users/{user.id}")
+        result = await storage_service.upload_files(files, BUCKET, f"users/{user.id}")
         ## Format Response
         data = json.dumps(
             {
@@ -165,7 +253,7 @@ async def delete_file(
     try:
         ## Delete File
         s3client = StorageService(ACCESS_KEY_ID, ACCESS_SECRET_KEY)
-        s3client.delete_file(BUCKET, prefix)
+        await s3client.delete_file(BUCKET, prefix)
         return Response(status_code=204)
     except Exception as err:
         raise HTTPException(status_code=404, detail=str(err)) from err
@@ -191,7 +279,7 @@ async def upload_files_with_urls(
     Upload multiple files and return their presigned URLs
     """
     try:
-        results = storage_service.upload_and_get_presigned_urls(
+        results = await storage_service.upload_and_get_presigned_urls(
             files=files,
             bucket=BUCKET,
             prefix=f"users/{user.id or TEST_USER_ID}",  # You might want to make this dynamic based on user
@@ -1,13 +1,17 @@
 # https://langchain-ai.github.io/langgraph/reference/checkpoints/#langgraph.checkpoint.postgres.BasePostgresSaver
-from fastapi import APIRouter, Body, HTTPException, Depends, status
-from fastapi.responses import Response
+import json
+from typing import Literal, Optional
+from fastapi import APIRouter, Body, HTTPException, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from src.constants import CHECKPOINT_HISTORY_LIMIT, CHECKPOINT_HISTORY_MAX
 from src.schemas.entities import ThreadSearch
 from src.utils.logger import logger
-from src.services.checkpoint import checkpoint_service
-from src.services.thread import thread_service
+from src.services.checkpoint import CheckpointService
+from src.services.thread import ThreadService
 from src.constants.examples import Examples
 from src.schemas.models import ProtectedUser
-from src.services.db import get_store, get_checkpoint_db
+from src.services.db import get_store, get_checkpointer
 from src.utils.auth import verify_credentials
 from langchain_core.runnables import RunnableConfig
 from langgraph.store.postgres import AsyncPostgresStore
@@ -25,46 +29,95 @@ async def search_threads(
     ),
     user: ProtectedUser = Depends(verify_credentials),
     store: AsyncPostgresStore = Depends(get_store),
+    checkpointer: AsyncPostgresSaver = Depends(get_checkpointer),
 ):
     try:
-        thread_service.store = store
-        thread_service.user_id = user.id
-        checkpoint_service.user_id = user.id
-        async with get_checkpoint_db() as checkpointer:
-            checkpoint_service.checkpointer = checkpointer
-            filter = thread_search.model_dump(exclude_none=True).get("filter", {})
-            if "thread_id" in filter and not "checkpoint_id" in filter:
-                checkpoints = await checkpoint_service.list_checkpoints(
-                    filter["thread_id"]
-                )
-                if checkpoints is None:
-                    raise HTTPException(status_code=404, detail="Checkpoints not found")
-                return {"checkpoints": checkpoints}
+        thread_service = ThreadService(user_id=user.id, store=store)
+        checkpoint_service = CheckpointService(
+            user_id=user.id, checkpointer=checkpointer
+        )
+        filter = thread_search.model_dump(exclude_none=True).get("filter", {})
+        if "thread_id" in filter and not "checkpoint_id" in filter:
+            checkpoints = await checkpoint_service.list_checkpoints(filter["thread_id"])
+            if checkpoints is None:
+                raise HTTPException(status_code=404, detail="Checkpoints not found")
+            return {"checkpoints": checkpoints}
 
-            threads = await thread_service.search(filter=filter)
-            return {"threads": threads}
+        threads, next_cursor = await thread_service.search(
+            limit=thread_search.limit, filter=filter, cursor=thread_search.cursor
+        )
+        return {"threads": threads, "next_cursor": next_cursor}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.exception(f"Error searching threads: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/threads/{thread_id}/history", name="List Thread History")
+async def thread_history(
+    thread_id: str,
+    limit: int = Query(
+        default=CHECKPOINT_HISTORY_LIMIT, ge=1, le=CHECKPOINT_HISTORY_MAX
+    ),
+    before: Optional[str] = Query(
+        default=None, description="Return checkpoints older than this checkpoint id"
+    ),
+    metadata_only: bool = Query(
+        default=False, description="Leave out the messages of each checkpoint"
+    ),
+    format: Literal["json", "ndjson"] = Query(
+        default="json", description="'ndjson' streams one checkpoint per line"
+    ),
+    user: ProtectedUser = Depends(verify_credentials),
+    checkpointer: AsyncPostgresSaver = Depends(get_checkpointer),
+):
+    checkpoint_service = CheckpointService(user_id=user.id, checkpointer=checkpointer)
+    history = checkpoint_service.history(
+        thread_id, limit=limit, before=before, metadata_only=metadata_only
+    )
+
+    if format == "ndjson":
+
+        async def lines():
+            try:
+                async for checkpoint in history:
+                    yield json.dumps(jsonable_encoder(checkpoint)) + "\n"
+            except Exception as e:
+                # Headers are sent, so end the stream with an error line
+                logger.exception(f"Error streaming thread history: {e}")
+                yield json.dumps({"error": str(e)}) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    try:
+        checkpoints = [checkpoint async for checkpoint in history]
+        next_before = None
+        if len(checkpoints) == limit:
+            next_before = checkpoints[-1]["config"]["configurable"]["checkpoint_id"]
+        return {"checkpoints": checkpoints, "next_before": next_before}
+    except Exception as e:
+        logger.exception(f"Error listing thread history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/threads/{thread_id}", name="Delete Thread")
 async def delete_thread(
     thread_id: str,
     user: ProtectedUser = Depends(verify_credentials),
     store=Depends(get_store),
+    checkpointer=Depends(get_checkpointer),
 ):
     try:
-        thread_service.store = store
-        thread_service.user_id = user.id
-        async with get_checkpoint_db() as checkpointer:
-            checkpoint_service.checkpointer = checkpointer
-            checkpoint_service.user_id = user.id
-            await checkpoint_service.delete_checkpoints_for_thread(thread_id)
-            success = await thread_service.delete(thread_id)
-            if not success:
-                raise HTTPException(status_code=404, detail="Thread not found")
-            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        thread_service = ThreadService(user_id=user.id, store=store)
+        checkpoint_service = CheckpointService(
+            user_id=user.id, checkpointer=checkpointer
+        )
+        await checkpoint_service.delete_checkpoints_for_thread(thread_id)
+        success = await thread_service.delete(thread_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Thread not found")
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     except Exception as e:
         logger.exception(f"Error deleting thread: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -78,19 +131,20 @@ async def delete_thread(
     thread_id: str,
     user: ProtectedUser = Depends(verify_credentials),
     store=Depends(get_store),
+    checkpointer=Depends(get_checkpointer),
 ):
     try:
-        thread_service.store = store
-        thread_service.user_id = user.id
-        thread_service.assistant_id = assistant_id
-        async with get_checkpoint_db() as checkpointer:
-            checkpoint_service.checkpointer = checkpointer
-            checkpoint_service.user_id = user.id
-            await checkpoint_service.delete_checkpoints_for_thread(thread_id)
-            success = await thread_service.delete(thread_id)
-            if not success:
-                raise HTTPException(status_code=404, detail="Thread not found")
-            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        thread_service = ThreadService(
+            user_id=user.id, assistant_id=assistant_id, store=store
+        )
+        checkpoint_service = CheckpointService(
+            user_id=user.id, checkpointer=checkpointer
+        )
+        await checkpoint_service.delete_checkpoints_for_thread(thread_id)
+        success = await thread_service.delete(thread_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Thread not found")
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     except Exception as e:
         logger.exception(f"Error deleting thread: {e}")
         raise HTTPException(status_code=500, detail=str(e))
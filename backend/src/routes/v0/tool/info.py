@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Body, status
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, status
 from fastapi.responses import JSONResponse
 from src.constants.examples import MCP_DICT_EXAMPLE
+from src.schemas.models import ProtectedUser
+from src.services.mcp import mcp_service
 from src.services.tool import tool_service
+from src.utils.auth import verify_credentials
 from src.schemas.entities.a2a import A2AServer, McpServer, A2A_DICT_EXAMPLE
 from src.constants.examples import A2A_GET_AGENT_CARD_EXAMPLE
 
@@ -50,6 +54,26 @@ async def list_mcp_info(
         )
 
 
+################################################################################
+### Refresh MCP Tools
+################################################################################
+@router.post("/mcp/refresh", name="Refresh MCP Tools")
+async def refresh_mcp_tools(
+    config: Optional[dict[str, McpServer]] = Body(
+        default=None, openapi_examples=MCP_DICT_EXAMPLE
+    ),
+    user: ProtectedUser = Depends(verify_credentials),
+):
+    """
+    Close cached MCP sessions so their tools are rediscovered on next use.
+    Refreshes every server the user has run with when no config is given.
+    """
+    if config is not None:
+        config = {name: server.model_dump() for name, server in config.items()}
+    closed = await mcp_service.refresh(config, user_id=user.id)
+    return JSONResponse(content={"refreshed": closed}, status_code=status.HTTP_200_OK)
+
+
 ################################################################################
 ### List A2A Info
 ################################################################################
@@ -66,7 +90,7 @@ async def get_a2a_agent_card(
     config: dict[str, A2AServer] = Body(openapi_examples=A2A_DICT_EXAMPLE),
 ):
     try:
-        agent_cards = tool_service.agent_cards(config)
+        agent_cards = await tool_service.agent_cards(config)
 
         return JSONResponse(
             content={"agent_cards": agent_cards}, status_code=status.HTTP_200_OK
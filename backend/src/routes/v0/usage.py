@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.schemas.models import ProtectedUser
+from src.services.usage import UsageService
+from src.utils.auth import verify_credentials
+from src.utils.logger import logger
+
+router = APIRouter(tags=["Usage"])
+
+
+@router.get("/usage", name="Aggregate Token Usage")
+async def aggregate_usage(
+    group_by: list[Literal["day", "assistant", "thread", "model"]] = Query(
+        default=["day"], description="Keys to sum the usage by."
+    ),
+    start: Optional[datetime] = Query(default=None, description="Inclusive start."),
+    end: Optional[datetime] = Query(default=None, description="Exclusive end."),
+    user: ProtectedUser = Depends(verify_credentials),
+):
+    try:
+        usage = await UsageService(user.id).aggregate(
+            list(dict.fromkeys(group_by)), start, end
+        )
+        return {"usage": usage}
+    except Exception as e:
+        logger.exception(f"Error aggregating usage: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
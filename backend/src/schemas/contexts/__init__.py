@@ -1,6 +1,11 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
 class ContextSchema:
-    user_id: str
+    user_id: Optional[str] = None
+    current_time: Optional[str] = None
+    timezone: Optional[str] = None
+    language: Optional[str] = None
+    memories: Optional[str] = None
@@ -160,6 +160,9 @@ class Config(BaseModel):
 class ThreadSearch(BaseModel):
     limit: int = Field(default=100, description="The limit of threads to search")
     offset: int = Field(default=0, description="The offset of threads to search")
+    cursor: Optional[str] = Field(
+        default=None, description="The next_cursor of the previous page"
+    )
     filter: Optional[Config] = Field(
         default_factory=Config, description="The filter of threads to search"
     )
@@ -176,6 +179,21 @@ class LLMRequest(BaseModel):
     metadata: Optional[Config] = Field(
         default={}, description="LangGraph configuration"
     )
+    cache: Optional[bool] = Field(
+        default=False,
+        description=(
+            "Serve repeated requests on new threads from the response cache "
+            "instead of calling the model. Honored by /llm/invoke and runs; "
+            "streams always call the model."
+        ),
+    )
+    stream_format: Optional[Literal["delta", "full"]] = Field(
+        default=None,
+        description=(
+            "Stream payload format. 'delta' sends lean message chunks and only "
+            "new or changed state values, 'full' sends complete dumps."
+        ),
+    )
 
     class ChatMessage(BaseModel):
         role: Literal["user", "assistant", "system", "tool"] = Field(examples=["user"])
@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 from typing import Literal
 from src.common.types import AgentCard
 from src.utils.logger import logger
-from src.utils.a2a import A2ACardResolver, a2a_builder
+from src.utils.a2a import a2a_send_task, resolve_agent_cards
 from src.constants.examples import (
     A2A_SERVER_EXAMPLE,
     A2A_DICT_EXAMPLE,
@@ -52,28 +52,29 @@ class A2AServers(BaseModel):
                 return False
         return True
 
-    def fetch_agent_cards(self) -> list[AgentCard]:
+    async def fetch_agent_cards(self) -> list[AgentCard]:
         agent_cards = []
-        for server in self.a2a.values():
-            try:
-                card = A2ACardResolver(
-                    server.base_url, server.agent_card_path
-                ).get_agent_card()
-                agent_cards.append(card)
-            except Exception as e:
-                logger.error(f"Error fetching agent card for {server.base_url}: {e}")
+        results = await resolve_agent_cards(
+            (server.base_url, server.agent_card_path) for server in self.a2a.values()
+        )
+        for server, card in zip(self.a2a.values(), results):
+            if isinstance(card, Exception):
+                logger.error(f"Error fetching agent card for {server.base_url}: {card}")
+                continue
+            agent_cards.append(card)
         return agent_cards
 
-    def fetch_agent_cards_as_tools(self, thread_id: str) -> list[StructuredTool]:
+    async def fetch_agent_cards_as_tools(self, thread_id: str) -> list[StructuredTool]:
         tools = []
-        for key, config in self.a2a.items():
-            card = A2ACardResolver(
-                config.base_url, config.agent_card_path
-            ).get_agent_card()
-
-            async def send_task(query: str, config: A2AServer = config):
-                return await a2a_builder(config.base_url, query, thread_id)
-
+        results = await resolve_agent_cards(
+            (config.base_url, config.agent_card_path) for config in self.a2a.values()
+        )
+        for (key, config), card in zip(self.a2a.items(), results):
+            if isinstance(card, Exception):
+                logger.error(f"Error fetching agent card for {config.base_url}: {card}")
+                continue
+
+            send_task = a2a_send_task(config.base_url, thread_id)
             send_task.__doc__ = (
                 f"Part of {key} A2A (Agent to Agent) server. "
                 f"Send query to remote agent: {card.name}. "
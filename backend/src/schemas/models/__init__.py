@@ -3,6 +3,9 @@ from src.schemas.models.agent import Agent, Revision
 from src.schemas.models.setting import Settings
 from src.schemas.models.thread import Thread
 from src.schemas.models.tool import Server
+from src.schemas.models.run import Run, RunStatus
+from src.schemas.models.rate_limit import RateLimit
+from src.schemas.models.usage import TokenUsage
 
 __all__ = [
     "User",
@@ -13,4 +16,8 @@ __all__ = [
     "Settings",
     "Thread",
     "Server",
+    "Run",
+    "RunStatus",
+    "RateLimit",
+    "TokenUsage",
 ]
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 class AssistantSearch(BaseModel):
     limit: int = 200
     offset: int = 0
+    cursor: Optional[str] = None
     sort: str = "updated_at"
     sort_order: str = "desc"
     filter: dict = {}
@@ -28,6 +29,7 @@ class Assistant(BaseModel):
     mcp: Optional[dict] = {}
     a2a: Optional[dict] = {}
     metadata: dict = {}
+    cache: bool = False
     updated_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
 
@@ -43,12 +45,13 @@ class Assistant(BaseModel):
     def to_llm_request(
         self,
         messages: list[BaseMessage],
-        prompt: str = None, 
+        prompt: str = None,
         model: str = None,
         metadata: "Config" = None,
     ) -> "LLMRequest":
         from src.schemas.entities import Config
         from src.schemas.entities import LLMRequest
+
         if metadata and isinstance(metadata, Config):
             metadata = metadata.model_dump()
         return LLMRequest(
@@ -59,5 +62,6 @@ class Assistant(BaseModel):
             mcp=self.mcp,
             subagents=self.subagents,
             metadata=metadata or self.metadata,
-            messages=messages
-        )
\ No newline at end of file
+            cache=self.cache,
+            messages=messages,
+        )
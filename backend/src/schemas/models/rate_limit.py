@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy.sql import func
+
+from src.services.db import get_db_base
+
+
+class RateLimit(get_db_base()):
+    """A token bucket shared by every worker, refilled lazily when taken from."""
+
+    __tablename__ = "rate_limits"
+
+    key = Column(String, primary_key=True)  # user:<id> or ip:<address>
+    bucket = Column(String, primary_key=True)  # tokens or requests:<endpoint>
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
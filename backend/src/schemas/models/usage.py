@@ -0,0 +1,31 @@
+import sqlalchemy as sa
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.services.db import get_db_base
+
+
+class TokenUsage(get_db_base()):
+    """Model tokens spent by one run, one row per model it called."""
+
+    __tablename__ = "token_usage"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=sa.text("gen_random_uuid()"),
+    )
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    assistant_id = Column(String, nullable=True)
+    thread_id = Column(String, nullable=True)
+    model = Column(String, nullable=False)
+    calls = Column(Integer, nullable=False, server_default="0")
+    input_tokens = Column(Integer, nullable=False, server_default="0")
+    output_tokens = Column(Integer, nullable=False, server_default="0")
+    total_tokens = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
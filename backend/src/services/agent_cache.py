@@ -0,0 +1,69 @@
+import hashlib
+import ujson
+from collections import OrderedDict
+from typing import Any
+from langgraph.graph.state import CompiledStateGraph
+
+from src.constants import AGENT_CACHE_MAX_SIZE
+from src.utils.logger import logger
+
+
+class AgentCache:
+    """LRU cache of compiled agent graphs keyed on the assistant configuration.
+
+    Graphs are stored without a bound checkpointer or store so they can be
+    reused across requests; callers rebind them with ``graph.copy``.
+    """
+
+    def __init__(self, max_size: int = AGENT_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._graphs: OrderedDict[str, CompiledStateGraph] = OrderedDict()
+        self._assistant_keys: dict[str, set[str]] = {}
+
+    @staticmethod
+    def make_key(**config: Any) -> str:
+        """Stable hash of the configuration that determines a compiled graph."""
+        payload = ujson.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CompiledStateGraph | None:
+        graph = self._graphs.get(key)
+        if graph is not None:
+            self._graphs.move_to_end(key)
+        return graph
+
+    def set(
+        self, key: str, graph: CompiledStateGraph, assistant_id: str | None = None
+    ) -> None:
+        self._graphs[key] = graph
+        self._graphs.move_to_end(key)
+        if assistant_id:
+            self._assistant_keys.setdefault(assistant_id, set()).add(key)
+        while len(self._graphs) > self.max_size:
+            evicted, _ = self._graphs.popitem(last=False)
+            self._forget(evicted)
+
+    def invalidate(self, assistant_id: str) -> int:
+        """Drop every graph compiled for the given assistant."""
+        keys = self._assistant_keys.pop(assistant_id, set())
+        for key in keys:
+            self._graphs.pop(key, None)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached graph(s) for {assistant_id}")
+        return len(keys)
+
+    def clear(self) -> None:
+        self._graphs.clear()
+        self._assistant_keys.clear()
+
+    def _forget(self, key: str) -> None:
+        for assistant_id, keys in list(self._assistant_keys.items()):
+            keys.discard(key)
+            if not keys:
+                del self._assistant_keys[assistant_id]
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+
+agent_cache = AgentCache()
@@ -1,8 +1,11 @@
-import asyncio
-from typing import Any
+from typing import Any, Optional
+from fastapi import HTTPException
 from langgraph.store.memory import InMemoryStore
 from langgraph.store.base import BaseStore
 from src.utils.logger import logger
+from src.utils.retry import async_retry
+from src.services.agent_cache import agent_cache
+from src.services.store import paginate
 from src.schemas.models.assistant import *
 from langgraph.store.base import SearchItem
 from src.constants.examples import Examples
@@ -21,6 +24,7 @@ class AssistantService:
             await self.store.aput(
                 namespace=(STORE_KEY, self.user_id), key=assistant_id, value=data
             )
+            agent_cache.invalidate(assistant_id)
             return True
         except Exception as e:
             logger.exception(f"Error updating {STORE_KEY} {assistant_id}: {e}")
@@ -28,6 +32,7 @@ class AssistantService:
 
         return True
 
+    @async_retry("store")
     async def get(self, key: str) -> Any:
         assistant_raw = await self.store.aget((STORE_KEY, self.user_id), key)
         if assistant_raw:
@@ -37,6 +42,7 @@ class AssistantService:
     async def delete(self, key: str) -> bool:
         try:
             await self.store.adelete((STORE_KEY, self.user_id), key)
+            agent_cache.invalidate(key)
             return True
         except Exception as e:
             logger.exception(f"Error deleting {STORE_KEY} {key}: {e}")
@@ -44,55 +50,20 @@ class AssistantService:
 
     async def search(
         self,
-        limit: int = 1000,
-    ) -> list[dict]:
+        limit: int = 200,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[Assistant], Optional[str]]:
+        """Assistants newest first, with the cursor of the next page."""
         try:
-            assistants = []
-            if isinstance(self.store, InMemoryStore):
-                assistants = await self._in_memory_search(limit)
-            else:
-                assistants = await self._postgres_search(limit)
-            return self._format_assistant(assistants)
+            assistants, next_cursor = await paginate(
+                self.store, (STORE_KEY, self.user_id), limit=limit, cursor=cursor
+            )
+            return self._format_assistant(assistants), next_cursor
+        except HTTPException as e:
+            raise e
         except Exception as e:
             logger.error(f"Error searching {STORE_KEY}: {e}")
-            return []
-
-    ###########################################################################
-    ## Search
-    ###########################################################################
-    async def _in_memory_search(self, limit: int = 1000) -> list[dict]:
-        items = await self.store.asearch((STORE_KEY, self.user_id), limit=limit)
-        return sorted(
-            [item for item in items],
-            key=lambda x: x.updated_at,
-            reverse=True,
-        )
-
-    async def _postgres_search(self, limit: int = 1000) -> list[dict]:
-        max_retries = 3
-        retry_delay = 1  # seconds
-
-        for attempt in range(max_retries):
-            try:
-                async with self.store as store:
-                    items = await store.asearch((STORE_KEY, self.user_id), limit=limit)
-                    return sorted(
-                        [item for item in items],
-                        key=lambda x: x.updated_at,
-                        reverse=True,
-                    )
-            except Exception as e:
-                error_msg = str(e).lower()
-                if "connection" in error_msg and "closed" in error_msg:
-                    logger.warning(
-                        f"Store connection closed on attempt {attempt + 1}/{max_retries}: {e}"
-                    )
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(
-                            retry_delay * (2**attempt)
-                        )  # Exponential backoff
-                        continue
-                raise e
+            return [], None
 
     def _format_assistant(self, items: list[SearchItem]) -> list[Assistant]:
         assistants = []
@@ -105,6 +76,4 @@ class AssistantService:
         return assistants
 
 
-assistant_service = AssistantService()
-
 ASSISTANT_EXAMPLES = {"currency_agent": Examples.ASSISTANT_EXAMPLES["currency_agent"]}
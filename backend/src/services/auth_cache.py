@@ -0,0 +1,84 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.constants import AUTH_CACHE_ENABLED, AUTH_CACHE_MAX_SIZE, AUTH_CACHE_TTL
+from src.schemas.models import ProtectedUser
+from src.utils.logger import logger
+
+
+class AuthCache:
+    """LRU cache of users verified from a bearer token, keyed on its hash.
+
+    Entries expire at the token's ``exp`` or after ``ttl`` seconds, whichever
+    comes first, so a deleted user or revoked token is honored within ``ttl``
+    even on workers that did not see the change.
+    """
+
+    def __init__(
+        self,
+        max_size: int = AUTH_CACHE_MAX_SIZE,
+        ttl: int = AUTH_CACHE_TTL,
+        enabled: bool = AUTH_CACHE_ENABLED,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._users: OrderedDict[str, tuple[ProtectedUser, float]] = OrderedDict()
+        self._user_keys: dict[str, set[str]] = {}
+
+    @staticmethod
+    def make_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> ProtectedUser | None:
+        if not self.enabled:
+            return None
+        key = self.make_key(token)
+        entry = self._users.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if time.time() >= expires_at:
+            self._pop(key)
+            return None
+        self._users.move_to_end(key)
+        return user
+
+    def set(self, token: str, user: ProtectedUser, exp: float) -> None:
+        if not self.enabled:
+            return
+        key = self.make_key(token)
+        self._users[key] = (user, min(exp, time.time() + self.ttl))
+        self._users.move_to_end(key)
+        self._user_keys.setdefault(user.id, set()).add(key)
+        while len(self._users) > self.max_size:
+            evicted = next(iter(self._users))
+            self._pop(evicted)
+
+    def invalidate(self, user_id: str) -> int:
+        """Drop every cached token of the given user."""
+        keys = self._user_keys.pop(str(user_id), set())
+        for key in keys:
+            self._users.pop(key, None)
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached token(s) for {user_id}")
+        return len(keys)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._user_keys.clear()
+
+    def _pop(self, key: str) -> None:
+        user, _ = self._users.pop(key)
+        keys = self._user_keys.get(user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[user.id]
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+auth_cache = AuthCache()
@@ -1,12 +1,17 @@
+from typing import AsyncIterator
 from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langchain_core.runnables.config import RunnableConfig
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.checkpoint.base import Checkpoint, BaseCheckpointSaver, CheckpointTuple
 from langgraph.types import StateSnapshot
 from langchain_core.messages import BaseMessage
+from src.constants import CHECKPOINT_HISTORY_LIMIT
+from src.repos.checkpoint_repo import CheckpointRepo
+from src.services.db import AsyncSessionLocal
 from src.utils.logger import logger
 from src.utils.messages import from_message_to_dict
-from src.utils.retry import retry_db_operation
+from src.utils.retry import async_retry
 
 
 IN_MEMORY_CHECKPOINTER = InMemorySaver()
@@ -43,31 +48,101 @@ class CheckpointService:
             checkpoints.append(checkpoint)
         return checkpoints
 
-    @retry_db_operation(tries=3, delay=1, backoff=2, exceptions=(Exception,))
+    def _format_checkpoint(
+        self, checkpoint: CheckpointTuple, metadata_only: bool = False
+    ) -> dict:
+        if metadata_only:
+            values = {}
+        else:
+            messages = self._collect_messages(checkpoint)
+            values = {"messages": from_message_to_dict(messages)}
+        snapshot = StateSnapshot(
+            values=values,
+            config=checkpoint.config,
+            parent_config=checkpoint.parent_config,
+            metadata=checkpoint.metadata,
+            created_at=checkpoint.checkpoint["ts"],
+            interrupts=[],
+            next=[],
+            tasks=[],
+        )
+        formatted_snapshot = snapshot._asdict()
+        del formatted_snapshot["tasks"]
+        return formatted_snapshot
+
+    @staticmethod
+    def _format_metadata_row(row: dict) -> dict:
+        def config(checkpoint_id: str) -> RunnableConfig:
+            return RunnableConfig(
+                configurable={
+                    "thread_id": row["thread_id"],
+                    "checkpoint_ns": row["checkpoint_ns"],
+                    "checkpoint_id": checkpoint_id,
+                }
+            )
+
+        parent_id = row["parent_checkpoint_id"]
+        return {
+            "values": {},
+            "next": [],
+            "config": config(row["checkpoint_id"]),
+            "metadata": row["metadata"],
+            "created_at": row["ts"],
+            "parent_config": config(parent_id) if parent_id else None,
+            "interrupts": [],
+        }
+
+    async def history(
+        self,
+        thread_id: str,
+        limit: int = CHECKPOINT_HISTORY_LIMIT,
+        before: str | None = None,
+        metadata_only: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Checkpoints of a thread newest first, at most ``limit`` of them and
+        starting below the ``before`` checkpoint id. ``metadata_only`` leaves
+        the messages out of every checkpoint, and on Postgres reads only the
+        ids and metadata.
+        """
+        if metadata_only and isinstance(self.checkpointer, AsyncPostgresSaver):
+            # Skip loading checkpoints and channel blobs that would be dropped
+            async with AsyncSessionLocal() as db:
+                rows = await CheckpointRepo(db, self.user_id).list_metadata(
+                    thread_id, limit, before
+                )
+            for row in rows:
+                yield self._format_metadata_row(row)
+            return
+
+        config = RunnableConfig(configurable={"thread_id": thread_id})
+        before_config = None
+        if before:
+            before_config = RunnableConfig(
+                configurable={"thread_id": thread_id, "checkpoint_id": before}
+            )
+        filter = {"user_id": self.user_id} if self.user_id else None
+        async for checkpoint in self.checkpointer.alist(
+            config, filter=filter, before=before_config, limit=limit
+        ):
+            yield self._format_checkpoint(checkpoint, metadata_only)
+
     async def list_checkpoints(self, thread_id: str) -> list[StateSnapshot]:
         try:
-            config = RunnableConfig(configurable={"thread_id": thread_id})
-            checkpoints = []
-            async for checkpoint in self.checkpointer.alist(config):
-                messages = self._collect_messages(checkpoint)
-                snapshot = StateSnapshot(
-                    values={"messages": from_message_to_dict(messages)},
-                    config=checkpoint.config,
-                    parent_config=checkpoint.parent_config,
-                    metadata=checkpoint.metadata,
-                    created_at=checkpoint.checkpoint["ts"],
-                    interrupts=[],
-                    next=[],
-                    tasks=[],
-                )
-                formatted_snapshot = snapshot._asdict()
-                del formatted_snapshot["tasks"]
-                checkpoints.append(formatted_snapshot)
-            return checkpoints
+            return await self._list_checkpoints(thread_id)
         except Exception as e:
             logger.exception(f"Error listing checkpoints: {e}")
             return []
 
+    @async_retry("checkpointer")
+    async def _list_checkpoints(self, thread_id: str) -> list[dict]:
+        config = RunnableConfig(configurable={"thread_id": thread_id})
+        checkpoints = []
+        async for checkpoint in self.checkpointer.alist(config):
+            checkpoints.append(self._format_checkpoint(checkpoint))
+        return checkpoints
+
+    @async_retry("checkpointer")
     async def get_checkpoint(
         self,
         thread_id: str,
@@ -97,6 +172,3 @@ class CheckpointService:
         except Exception as e:
             logger.exception(f"Error deleting checkpoints for thread: {e}")
             return False
-
-
-checkpoint_service = CheckpointService()
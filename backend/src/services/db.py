@@ -1,6 +1,9 @@
+from contextlib import asynccontextmanager
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from fastapi import Request
 from typing import AsyncGenerator, Generator, AsyncIterator
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from langgraph.store.postgres.base import PostgresIndexConfig
 from langchain.embeddings import init_embeddings
 from sqlalchemy import create_engine
@@ -13,6 +16,7 @@ from src.constants import (
     DB_POOL_MAX_SIZE,
     DB_POOL_MAX_IDLE_TIME,
     DB_POOL_MAX_LIFETIME,
+    STORE_TTL_SWEEP_INTERVAL,
 )
 from langgraph.store.postgres import AsyncPostgresStore, PoolConfig
 
@@ -46,17 +50,46 @@ def load_models():
         Settings,
         Thread,
         Server,
+        Run,
+        RateLimit,
+        TokenUsage,
     )
 
     return _Base
 
 
+class SharedDB:
+    """Pooled store and checkpointer opened once in main.lifespan.
+
+    Routes receive these through ``get_store``/``get_checkpointer``; code that
+    runs outside a request (e.g. scheduled jobs) reads them from here.
+    """
+
+    store: AsyncPostgresStore | None = None
+    checkpointer: AsyncPostgresSaver | None = None
+
+
 def get_store(req: Request) -> AsyncPostgresStore:
     return req.app.state.store
 
 
-def get_checkpoint_db() -> AsyncIterator[AsyncPostgresSaver]:
-    return AsyncPostgresSaver.from_conn_string(conn_string=DB_URI)
+def get_checkpointer(req: Request) -> AsyncPostgresSaver:
+    return req.app.state.checkpointer
+
+
+@asynccontextmanager
+async def get_checkpoint_db() -> AsyncIterator[AsyncPostgresSaver]:
+    """Checkpointer backed by a connection pool, opened once in main.lifespan."""
+    async with AsyncConnectionPool(
+        conninfo=DB_URI,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        max_idle=DB_POOL_MAX_IDLE_TIME,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    ) as pool:
+        yield AsyncPostgresSaver(conn=pool)
 
 
 def get_store_db(
@@ -73,6 +106,8 @@ def get_store_db(
             embed=init_embeddings(embed),
             dims=1536,
         ),
+        # Items written with a ttl are deleted by the sweeper
+        ttl={"sweep_interval_minutes": STORE_TTL_SWEEP_INTERVAL},
     )
 
 
@@ -1,10 +1,214 @@
+import asyncio
+import hashlib
+import itertools
+import time
+import ujson
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+from src.constants import MCP_TOOLS_TTL
+from src.utils.logger import logger
+
+
+def normalize_connection(connection: dict) -> dict:
+    """Drop unset fields so a server gets the same key whether its connection
+    comes from a request body, an assistant or a validated ``McpServer``."""
+    return {
+        key: value
+        for key, value in connection.items()
+        if value is not None and value != {} and value != []
+    }
+
+
+class McpSession:
+    """A long-lived session to a single MCP server.
+
+    The session is opened and closed by one background task so the
+    transport's context managers are entered and exited in the same task.
+    ``generation`` identifies the session in agent cache keys, ``leases``
+    counts the runs whose graphs are bound to its tools and ``users`` are
+    the users who have run with it.
+    """
+
+    _generations = itertools.count(1)
+
+    def __init__(self, name: str, connection: dict):
+        self.name = name
+        self.connection = connection
+        self.generation = next(self._generations)
+        self.tools: list[BaseTool] = []
+        self.loaded_at = 0.0
+        self.leases = 0
+        self.users: set[str] = set()
+        self.retired = False
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> list[BaseTool]:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        self.tools = await ready
+        self.loaded_at = time.monotonic()
+        return self.tools
+
+    async def close(self) -> None:
+        self._stop.set()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            client = MultiServerMCPClient({self.name: self.connection})
+            async with client.session(self.name) as session:
+                ready.set_result(await load_mcp_tools(session))
+                await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session {self.name} closed: {e}")
 
 
 class McpService:
-    def __init__(self, config: dict):
-        self.config = config
-        self.client = MultiServerMCPClient(config)
+    """Keeps one open session per MCP server config and caches its tools.
+
+    Replaced sessions are retired rather than closed while a run still
+    holds a lease on them; the last release closes them.
+    """
+
+    def __init__(self, ttl: int = MCP_TOOLS_TTL):
+        self.ttl = ttl
+        self._sessions: dict[str, McpSession] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(name: str, connection: dict) -> str:
+        payload = ujson.dumps(
+            [name, normalize_connection(connection)], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_fresh(self, session: McpSession | None) -> bool:
+        return (
+            session is not None
+            and session.alive
+            and time.monotonic() - session.loaded_at < self.ttl
+        )
+
+    async def get_tools(
+        self,
+        config: dict[str, dict],
+        sessions: dict[str, McpSession] | None = None,
+    ) -> list[BaseTool]:
+        """Discover tools for every server in the config concurrently.
+
+        Servers found in ``sessions`` (from ``acquire``) reuse those tools.
+        """
+        resolved = await self._server_sessions([config], sessions)
+        return [tool for session in resolved.values() for tool in session.tools]
+
+    async def acquire(
+        self, *configs: dict[str, dict], user_id: str | None = None
+    ) -> dict[str, McpSession]:
+        """Open (or reuse) sessions for the configs and lease them to a run."""
+        sessions = await self._server_sessions(configs)
+        for session in sessions.values():
+            session.leases += 1
+            if user_id:
+                session.users.add(user_id)
+        return sessions
+
+    async def release(self, sessions: dict[str, McpSession]) -> None:
+        """Return leases taken by ``acquire``, closing retired sessions."""
+        for session in sessions.values():
+            session.leases -= 1
+        await asyncio.gather(
+            *(
+                session.close()
+                for session in sessions.values()
+                if session.retired and session.leases <= 0
+            )
+        )
+
+    async def _server_sessions(
+        self,
+        configs: list[dict[str, dict]],
+        sessions: dict[str, McpSession] | None = None,
+    ) -> dict[str, McpSession]:
+        sessions = sessions or {}
+        servers = {
+            self._key(name, connection): (name, connection)
+            for config in configs
+            for name, connection in (config or {}).items()
+        }
+        pending = [key for key in servers if key not in sessions]
+        results = await asyncio.gather(
+            *(self._server_session(*servers[key]) for key in pending),
+            return_exceptions=True,
+        )
+        loaded = dict(zip(pending, results))
+        resolved = {}
+        for key in servers:
+            result = sessions.get(key) or loaded[key]
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Error fetching MCP tools from {servers[key][0]}: {result}"
+                )
+                continue
+            resolved[key] = result
+        return resolved
+
+    async def refresh(
+        self, config: dict[str, dict] | None = None, user_id: str | None = None
+    ) -> int:
+        """Close cached sessions (all, or only those in the config) so the
+        next request rediscovers their tools. Without a config, ``user_id``
+        limits the refresh to sessions that user has run with."""
+        if config is None:
+            keys = [
+                key
+                for key, session in self._sessions.items()
+                if user_id is None or user_id in session.users
+            ]
+        else:
+            keys = [self._key(name, connection) for name, connection in config.items()]
+        sessions = [self._sessions.pop(key) for key in keys if key in self._sessions]
+        await asyncio.gather(*(self._retire(session) for session in sessions))
+        return len(sessions)
+
+    async def aclose(self) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
+
+    async def _retire(self, session: McpSession) -> None:
+        session.retired = True
+        if session.leases <= 0:
+            await session.close()
+
+    async def _server_session(self, name: str, connection: dict) -> McpSession:
+        key = self._key(name, connection)
+        session = self._sessions.get(key)
+        if self._is_fresh(session):
+            return session
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            session = self._sessions.get(key)
+            if self._is_fresh(session):
+                return session
+            if session:
+                self._sessions.pop(key, None)
+                await self._retire(session)
+
+            session = McpSession(name, connection)
+            await session.start()
+            self._sessions[key] = session
+            return session
+
 
-    async def get_tools(self):
-        return await self.client.get_tools()
+mcp_service = McpService()
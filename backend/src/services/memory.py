@@ -1,26 +1,123 @@
+import time
+from collections import OrderedDict
 from typing import Any
+from langgraph.store.base import BaseStore, Item
 from langgraph.store.memory import InMemoryStore
 
+from src.constants import (
+    TEST_USER_ID,
+    MEMORY_PROMPT_CACHE_SIZE,
+    MEMORY_PROMPT_MODE,
+    MEMORY_PROMPT_TOP_K,
+    MEMORY_PROMPT_MAX,
+    MEMORY_PROMPT_TTL,
+)
+
 in_memory_store = InMemoryStore()
 
 
+def memory_to_xml(memory: Item) -> str:
+    items = []
+    for key, value in memory.dict().items():
+        items.append(f"<{key}>{value}</{key}>")
+    return f"<memory>{''.join(items)}</memory>"
+
+
+class MemoryContext:
+    """Formatted memories of one namespace, kept in step with writes."""
+
+    def __init__(self, items: dict[str, str]):
+        self.items = items
+        self.loaded_at = time.monotonic()
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "\n".join(self.items.values())
+        return self._text
+
+    def put(self, key: str, xml: str) -> None:
+        self.items[key] = xml
+        self._text = None
+
+    def remove(self, key: str) -> None:
+        if self.items.pop(key, None) is not None:
+            self._text = None
+
+
+# Memoized prompt contexts keyed by namespace (LRU), shared by every request
+_contexts: OrderedDict[tuple[str, ...], MemoryContext] = OrderedDict()
+
+
+def _get_context(namespace: tuple[str, ...]) -> MemoryContext | None:
+    context = _contexts.get(namespace)
+    if context is not None:
+        _contexts.move_to_end(namespace)
+    return context
+
+
+def _set_context(namespace: tuple[str, ...], context: MemoryContext) -> None:
+    _contexts[namespace] = context
+    _contexts.move_to_end(namespace)
+    while len(_contexts) > MEMORY_PROMPT_CACHE_SIZE:
+        _contexts.popitem(last=False)
+
+
 class MemoryService:
-    def __init__(self, store: InMemoryStore = in_memory_store):
-        self.store = store
+    """
+    Memories of a single user under ("memories", user_id). Signed-in users
+    are kept in the shared Postgres store, where the memory text is vector
+    indexed; anonymous sessions fall back to an in-process store.
+    """
+
+    def __init__(self, user_id: str = None, store: BaseStore = None):
+        self.user_id = user_id or TEST_USER_ID
+        self.store: BaseStore = store if user_id and store else in_memory_store
+        self.namespace = ("memories", self.user_id)
 
     async def set(self, key: str, value: Any, ttl: int | None = None) -> bool:
-        await self.store.aput(namespace=("memories",), key=key, value=value, ttl=ttl)
+        await self.store.aput(
+            namespace=self.namespace, key=key, value=value, index=["memory"], ttl=ttl
+        )
+        context = _get_context(self.namespace)
+        if context:
+            item = await self.store.aget(self.namespace, key)
+            if item:
+                context.put(key, memory_to_xml(item))
         return True
 
     async def get(self, key: str) -> Any:
-        return await self.store.aget(("memories",), key)
+        return await self.store.aget(self.namespace, key)
 
     async def delete(self, key: str) -> bool:
-        await self.store.adelete(("memories",), key)
+        await self.store.adelete(self.namespace, key)
+        context = _get_context(self.namespace)
+        if context:
+            context.remove(key)
         return True
 
-    async def search(self) -> Any:
-        return await self.store.asearch(("memories",))
+    async def search(self, query: str | None = None, limit: int = 10) -> list[Item]:
+        return await self.store.asearch(self.namespace, query=query, limit=limit)
 
+    async def prompt_context(
+        self, query: str | None = None, mode: str = MEMORY_PROMPT_MODE
+    ) -> str:
+        """
+        Memories formatted for the system prompt. In ``top_k`` mode only the
+        memories closest to the query are included; otherwise all memories
+        (up to MEMORY_PROMPT_MAX) are formatted once and reused until they
+        change or MEMORY_PROMPT_TTL passes.
+        """
+        if mode == "top_k" and query:
+            memories = await self.search(query, limit=MEMORY_PROMPT_TOP_K)
+            return "\n".join(memory_to_xml(memory) for memory in memories)
 
-memory_service = MemoryService()
+        context = _get_context(self.namespace)
+        if context is None or time.monotonic() - context.loaded_at > MEMORY_PROMPT_TTL:
+            memories = await self.search(limit=MEMORY_PROMPT_MAX)
+            context = MemoryContext(
+                {memory.key: memory_to_xml(memory) for memory in memories}
+            )
+            _set_context(self.namespace, context)
+        return context.text
@@ -0,0 +1,148 @@
+import hashlib
+import re
+import ujson
+from datetime import datetime, timezone
+from typing import Any, Optional
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langgraph.store.base import BaseStore
+
+from src.constants import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_SIMILARITY,
+    RESPONSE_CACHE_TTL,
+)
+from src.schemas.entities import LLMRequest
+from src.utils.logger import logger
+
+
+def _normalize(content: Any) -> Any:
+    if isinstance(content, str):
+        return re.sub(r"\s+", " ", content).strip()
+    return content
+
+
+def _hash(payload: Any) -> str:
+    data = ujson.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+class ResponseCache:
+    """
+    Final responses of stateless requests under ("response_cache", user_id).
+
+    A request is identified by its normalized model, system prompt, tools
+    (including MCP, A2A and subagents) and messages. Exact matches are served
+    first; otherwise a cached response is reused when everything but the last
+    user message matches and that message is semantically close
+    (RESPONSE_CACHE_SIMILARITY) to the cached one.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        store: BaseStore,
+        ttl: int = RESPONSE_CACHE_TTL,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+    ):
+        self.store = store
+        self.namespace = ("response_cache", user_id)
+        self.ttl = ttl
+        self.similarity = similarity
+
+    @classmethod
+    def for_request(
+        cls, params: LLMRequest, user_id: str | None, store: BaseStore | None
+    ) -> Optional["ResponseCache"]:
+        """The cache for requests that opted in, None when it does not apply.
+
+        Only requests starting a new thread carry their whole context.
+        """
+        if (
+            RESPONSE_CACHE_ENABLED
+            and params.cache
+            and store
+            and user_id
+            and not params.metadata.thread_id
+        ):
+            return cls(user_id, store)
+        return None
+
+    @staticmethod
+    def keys(params: LLMRequest) -> tuple[str, str, str]:
+        """Exact key, key of the context before the last message, and its text."""
+        messages = [(m.role, _normalize(m.content)) for m in params.messages]
+        context = {
+            "model": params.model,
+            "system": _normalize(params.system),
+            "tools": sorted(params.tools or []),
+            **params.model_dump(mode="json", include={"a2a", "mcp", "subagents"}),
+            "messages": messages[:-1],
+        }
+        last = messages[-1] if messages else None
+        query = _text(last[1]) if last else ""
+        return _hash({**context, "last": last}), _hash(context), query
+
+    def _fresh(self, item) -> bool:
+        age = datetime.now(timezone.utc) - item.updated_at
+        return age.total_seconds() < self.ttl
+
+    async def get(self, params: LLMRequest) -> Optional[list[BaseMessage]]:
+        key, context, query = self.keys(params)
+        item = await self.store.aget(self.namespace, key)
+        if item and self._fresh(item):
+            logger.debug(f"Response cache hit (exact) for {key}")
+            return messages_from_dict(item.value["messages"])
+        if self.similarity <= 0 or not query:
+            return None
+        items = await self.store.asearch(
+            self.namespace, query=query, filter={"context": context}, limit=1
+        )
+        for item in items:
+            # Stores without a vector index return no score
+            if (
+                item.score is not None
+                and item.score >= self.similarity
+                and self._fresh(item)
+            ):
+                logger.debug(f"Response cache hit ({item.score:.3f}) for {key}")
+                return messages_from_dict(item.value["messages"])
+        return None
+
+    async def set(self, params: LLMRequest, messages: list[BaseMessage]) -> None:
+        key, context, query = self.keys(params)
+        await self.store.aput(
+            self.namespace,
+            key,
+            {
+                "context": context,
+                "query": query,
+                "messages": [message_to_dict(m) for m in messages],
+            },
+            index=["query"] if self.similarity > 0 else False,
+            # Store TTLs are in minutes; expired entries are swept
+            ttl=self.ttl / 60 if self.store.supports_ttl else None,
+        )
+
+    async def lookup(self, params: LLMRequest) -> Optional[list[BaseMessage]]:
+        """``get`` that treats cache failures as misses."""
+        try:
+            return await self.get(params)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+
+    async def save(self, params: LLMRequest, response: dict) -> None:
+        """Cache the messages the agent added after the request's own messages."""
+        try:
+            await self.set(params, response["messages"][len(params.messages) :])
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
@@ -0,0 +1,165 @@
+import os
+import asyncio
+import socket
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from src.constants import (
+    RUN_WORKERS,
+    RUN_QUEUE_POLL_INTERVAL,
+    RUN_QUEUE_MAX_DEPTH,
+    RUN_TIMEOUT,
+    RUN_MAX_ATTEMPTS,
+)
+from src.repos.run_repo import RunRepo
+from src.schemas.entities import LLMRequest
+from src.schemas.models import Run, RunStatus
+from src.services.db import AsyncSessionLocal
+from src.utils.logger import logger
+
+
+class RunWorkerPool:
+    """
+    Async workers that claim queued runs from Postgres and execute them. Any
+    number of pools, in the API process or in ``python -m src.worker``, can
+    share the queue.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = RUN_WORKERS,
+        poll_interval: float = RUN_QUEUE_POLL_INTERVAL,
+        timeout: float = RUN_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"run-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} run worker(s) on {self.worker_id}")
+
+    async def stop(self) -> None:
+        """Stop the workers. In-flight runs are handed back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def wait(self) -> None:
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def notify(self) -> None:
+        """Wake idle workers, used when a run is enqueued in this process."""
+        self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                run = await self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming run: {e}")
+                run = None
+
+            if run is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self._execute(run)
+            except Exception as e:
+                logger.error(f"Error finishing run {run.id}: {e}")
+
+    async def _claim(self) -> Run | None:
+        async with AsyncSessionLocal() as db:
+            repo = RunRepo(db)
+            run = await repo.claim(self.worker_id, RUN_TIMEOUT, RUN_MAX_ATTEMPTS)
+            if run is None:
+                expired = await repo.expire_stale(RUN_TIMEOUT, RUN_MAX_ATTEMPTS)
+                if expired:
+                    logger.warning(f"Failed {expired} stale run(s)")
+            return run
+
+    async def _execute(self, run: Run) -> None:
+        """
+        Run one claimed attempt. It is bounded by the stale timeout so a run is
+        never still executing once other workers may claim it again.
+        """
+        from src.controllers.llm import llm_invoke
+
+        logger.info(f"Run {run.id} started (attempt {run.attempts})")
+        lease = {"worker_id": self.worker_id, "attempt": run.attempts}
+        try:
+            params = LLMRequest(**run.payload)
+            async with asyncio.timeout(self.timeout):
+                response = await llm_invoke(params, user_id=str(run.user_id))
+            status, result, error = (
+                RunStatus.SUCCEEDED,
+                jsonable_encoder(response),
+                None,
+            )
+        except asyncio.CancelledError:
+            async with AsyncSessionLocal() as db:
+                await RunRepo(db).requeue(run.id, **lease)
+            logger.info(f"Run {run.id} returned to the queue")
+            raise
+        except TimeoutError:
+            logger.error(f"Run {run.id} timed out after {self.timeout}s")
+            status, result, error = RunStatus.FAILED, None, "Run timed out"
+        except Exception as e:
+            logger.exception(f"Run {run.id} failed: {e}")
+            status, result, error = RunStatus.FAILED, None, str(e)
+
+        async with AsyncSessionLocal() as db:
+            finished = await RunRepo(db).finish(
+                run.id, status, result=result, error=error, **lease
+            )
+        if not finished:
+            logger.warning(f"Run {run.id} attempt {run.attempts} was claimed again")
+            return
+        logger.info(f"Run {run.id} {status}")
+
+
+run_worker_pool = RunWorkerPool()
+
+
+class RunService:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+
+    async def enqueue(self, params: LLMRequest) -> Run:
+        async with AsyncSessionLocal() as db:
+            repo = RunRepo(db, self.user_id)
+            # Backpressure: reject new work instead of letting runs time out
+            if await repo.count_queued() >= RUN_QUEUE_MAX_DEPTH:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Run queue is full, try again later",
+                    headers={"Retry-After": "30"},
+                )
+            run = await repo.create(params.model_dump(mode="json"))
+        run_worker_pool.notify()
+        return run
+
+    async def get(self, run_id: str) -> Run:
+        async with AsyncSessionLocal() as db:
+            run = await RunRepo(db, self.user_id).find_by_id(run_id)
+        if not run:
+            raise HTTPException(status_code=404, detail="Run not found")
+        return run
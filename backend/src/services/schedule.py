@@ -57,10 +57,10 @@ def create_trigger(trigger: JobTrigger):
 async def scheduled_llm_invoke_wrapper(task_dict: dict, metadata: dict):
     """
     Wrapper function for scheduled LLM invocations.
-    Reconstructs LLMRequest from dict and invokes the LLM.
+    Reconstructs LLMRequest from dict and queues it for the run workers.
     """
     from src.schemas.entities import LLMRequest
-    from src.controllers.llm import llm_invoke
+    from src.services.run import RunService
 
     logger.info(f"🚀 Starting scheduled LLM job with task: {task_dict}")
     print(f"🚀 Starting scheduled LLM job")
@@ -68,13 +68,15 @@ async def scheduled_llm_invoke_wrapper(task_dict: dict, metadata: dict):
     try:
         # Reconstruct LLMRequest from dict
         task = LLMRequest(**task_dict)
+        # Every scheduled execution starts a new thread
+        task.metadata.thread_id = None
         logger.info(f"✓ Successfully reconstructed LLMRequest")
 
-        # Invoke the LLM
-        result = await llm_invoke(task, user_id=metadata["user_id"])
-        logger.info(f"✓ LLM invocation completed successfully")
-        print(f"✓ LLM invocation completed successfully")
-        return result
+        # Queue the run instead of executing it on the API event loop
+        run = await RunService(user_id=metadata["user_id"]).enqueue(task)
+        logger.info(f"✓ LLM invocation queued as run {run.id}")
+        print(f"✓ LLM invocation queued as run {run.id}")
+        return str(run.id)
     except Exception as e:
         logger.error(f"❌ Error in scheduled job: {e}", exc_info=True)
         print(f"❌ Error in scheduled job: {e}")
@@ -1,15 +1,38 @@
 """Storage Service using MinIO"""
 
 import os
+import asyncio
 from src.utils.logger import logger as logging
 import datetime
-import threading
+import functools
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
 from fastapi import UploadFile
 from minio import Minio
 from minio.error import S3Error
 
-from src.constants import MINIO_HOST, S3_REGION
+from src.constants import (
+    MINIO_HOST,
+    S3_REGION,
+    STORAGE_MAX_WORKERS,
+    STORAGE_PART_SIZE,
+    STORAGE_PARALLEL_PARTS,
+    STORAGE_CHUNK_SIZE,
+)
+
+# MinIO's client is blocking; its calls run here so they never hold the event
+# loop, and at most STORAGE_MAX_WORKERS of them are in flight per process.
+_executor = ThreadPoolExecutor(
+    max_workers=STORAGE_MAX_WORKERS, thread_name_prefix="storage"
+)
+
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, functools.partial(func, *args, **kwargs)
+    )
 
 
 class StorageService:
@@ -37,8 +60,11 @@ class StorageService:
             secure=False if MINIO_HOST else True,
         )
 
-    def retrieve_all_files_raw(self, bucket: str, prefix: str = ""):
+    async def retrieve_all_files_raw(self, bucket: str, prefix: str = ""):
         """Retrieve all file details from a bucket"""
+        return await _run(self._list_objects, bucket, prefix)
+
+    def _list_objects(self, bucket: str, prefix: str = ""):
         files = []
         try:
             objects = self.client.list_objects(bucket, prefix=prefix, recursive=True)
@@ -48,58 +74,101 @@ class StorageService:
             logging.error("Error retrieving files: %s", err)
         return files
 
-    def retrieve_all_files(self, bucket: str, prefix: str = ""):
+    async def retrieve_all_files(self, bucket: str, prefix: str = ""):
         """Retrieve all files from a bucket with detailed information
 
         :param bucket: The bucket name
         :param prefix: Optional prefix to filter files
         :return: List of dictionaries containing file details
         """
-        files = []
-        try:
-            objects = self.client.list_objects(bucket, prefix=prefix, recursive=True)
-            for obj in objects:
-                # Get the file extension
-                _, extension = os.path.splitext(obj.object_name)
-                extension = extension.lower().strip(".")
-
-                # Create a response similar to upload_and_get_presigned_urls
-                file_info = {
-                    "filename": os.path.basename(obj.object_name),
-                    "size": obj.size,
-                    "content_type": mimetypes.guess_type(obj.object_name)[0]
-                    or "application/octet-stream",
-                    "object_name": obj.object_name,
-                    "last_modified": obj.last_modified.isoformat(),
-                    "etag": obj.etag,
-                    "directory": os.path.dirname(obj.object_name),
-                }
-                files.append(file_info)
-        except S3Error as err:
-            logging.error("Error retrieving files: %s", err)
-        return files
+        return [
+            {
+                "filename": os.path.basename(obj.object_name),
+                "size": obj.size,
+                "content_type": mimetypes.guess_type(obj.object_name)[0]
+                or "application/octet-stream",
+                "object_name": obj.object_name,
+                "last_modified": obj.last_modified.isoformat(),
+                "etag": obj.etag,
+                "directory": os.path.dirname(obj.object_name),
+            }
+            for obj in await self.retrieve_all_files_raw(bucket, prefix)
+        ]
 
-    def retrieve_file(self, bucket: str, path: str):
+    async def retrieve_file(self, bucket: str, path: str):
         """Retrieve a file from a bucket"""
+        return await _run(self._get_object, bucket, path)
+
+    def _get_object(self, bucket: str, path: str):
         try:
             response = self.client.get_object(bucket, path)
-            return response.data
+            try:
+                return response.data
+            finally:
+                response.close()
+                response.release_conn()
         except S3Error as err:
             logging.error("Error retrieving file %s: %s", path, err)
             return None
 
-    def delete_file(self, bucket: str, path: str):
+    async def stat_file(self, bucket: str, path: str):
+        """Size, ETag and content type of a file, or None if it does not exist"""
+        try:
+            return await _run(self.client.stat_object, bucket, path)
+        except S3Error as err:
+            if err.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise
+
+    async def stream_file(
+        self,
+        bucket: str,
+        path: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = STORAGE_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Yield ``length`` bytes of a file from ``offset`` (0 for the rest) in
+        chunks, releasing the connection when done or when the client leaves.
+        """
+        response = await _run(
+            self.client.get_object, bucket, path, offset=offset, length=length
+        )
+        try:
+            chunks = response.stream(chunk_size)
+            while True:
+                chunk = await _run(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def delete_file(self, bucket: str, path: str):
         """Delete a file from a bucket"""
         try:
-            self.client.remove_object(bucket, path)
+            await _run(self.client.remove_object, bucket, path)
         except S3Error as err:
             logging.error("Error deleting file %s: %s", path, err)
             raise ValueError(f"Failed to delete file: {err}") from err
 
-    def upload_file(
+    @staticmethod
+    def object_name_for(upload_file: UploadFile, prefix=None):
+        """Files are grouped in a directory per extension, under ``prefix``"""
+        extension = os.path.splitext(upload_file.filename)[1].lower().strip(".")
+        directory = f"{prefix}/{extension}" if prefix else extension
+        return os.path.join(directory, upload_file.filename)
+
+    async def upload_file(
         self, upload_file: UploadFile, bucket, directory=None, object_name=None
     ):
-        """Upload a file to a MinIO bucket asynchronously with appropriate content type"""
+        """Upload a file to a MinIO bucket with appropriate content type.
+
+        The file is streamed from its spooled temporary file in parts of
+        STORAGE_PART_SIZE, uploaded STORAGE_PARALLEL_PARTS at a time, so large
+        files are never read into memory whole.
+        """
         if object_name is None:
             object_name = upload_file.filename
 
@@ -110,43 +179,38 @@ class StorageService:
         # Prepend directory to object name if specified
         object_name = os.path.join(directory, object_name) if directory else object_name
 
-        def upload_action():
-            try:
-                file_data = upload_file.file
-                self.client.put_object(
-                    bucket,
-                    object_name,
-                    file_data,
-                    upload_file.size,
-                    content_type=content_type,
-                )
-                logging.info(
-                    f"Successfully uploaded {upload_file.filename} to {object_name}"
-                )
-            except S3Error as err:
-                logging.error("Error uploading file %s: %s", upload_file.filename, err)
-
-        thread = threading.Thread(target=upload_action)
-        thread.start()
-        return thread
+        try:
+            await _run(
+                self.client.put_object,
+                bucket,
+                object_name,
+                upload_file.file,
+                upload_file.size if upload_file.size is not None else -1,
+                content_type=content_type,
+                part_size=STORAGE_PART_SIZE,
+                num_parallel_uploads=STORAGE_PARALLEL_PARTS,
+            )
+            logging.info(
+                f"Successfully uploaded {upload_file.filename} to {object_name}"
+            )
+        except S3Error as err:
+            logging.error("Error uploading file %s: %s", upload_file.filename, err)
+            raise ValueError(f"Failed to upload file: {err}") from err
+        return object_name
 
-    def upload_files(self, files, bucket, prefix=None):
+    async def upload_files(self, files, bucket, prefix=None):
         """Upload multiple files concurrently.
         :param files: List of FastAPI UploadFile objects
         :param bucket: Bucket to upload to
         """
-        threads = []
-        for file in files:
-            extension = os.path.splitext(file.filename)[1].lower()
-            directory = (
-                f"{prefix}/{extension.strip('.')}" if prefix else extension.strip(".")
+        await asyncio.gather(
+            *(
+                self.upload_file(
+                    file, bucket, object_name=self.object_name_for(file, prefix)
+                )
+                for file in files
             )
-            thread = self.upload_file(file, bucket, directory=directory)
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
-
+        )
         return [
             {
                 "filename": file.filename,
@@ -156,7 +220,7 @@ class StorageService:
             for file in files
         ]
 
-    def create_presigned_urls(
+    async def create_presigned_urls(
         self,
         bucket,
         object_names,
@@ -174,6 +238,16 @@ class StorageService:
         :param inline: Whether to set 'Content-Disposition' to 'inline' or 'attachment'.
         :return: Dictionary of object names to their presigned URLs or None if an error occurs.
         """
+        return await _run(
+            self._presign,
+            bucket,
+            object_names,
+            expiration,
+            response_content_type,
+            inline,
+        )
+
+    def _presign(self, bucket, object_names, expiration, response_content_type, inline):
         urls = {}
         expiration_delta = datetime.timedelta(seconds=expiration)
         for object_name in object_names:
@@ -201,7 +275,7 @@ class StorageService:
                 continue
         return urls
 
-    def upload_and_get_presigned_urls(
+    async def upload_and_get_presigned_urls(
         self, files, bucket, prefix=None, expiration=3600, include_presigned=False
     ):
         """Upload files and return their info with direct URLs and optional presigned URLs
@@ -213,22 +287,15 @@ class StorageService:
         :return: List of dictionaries containing file info and URLs
         """
         # First upload all files
-        upload_results = self.upload_files(files, bucket, prefix)
+        upload_results = await self.upload_files(files, bucket, prefix)
 
         # Get object names and generate URLs for all uploaded files
-        object_names = []
-        for file in files:
-            extension = os.path.splitext(file.filename)[1].lower()
-            directory = (
-                f"{prefix}/{extension.strip('.')}" if prefix else extension.strip(".")
-            )
-            object_name = os.path.join(directory, file.filename)
-            object_names.append(object_name)
+        object_names = [self.object_name_for(file, prefix) for file in files]
 
         # Generate presigned URLs if requested
         presigned_urls = {}
         if include_presigned:
-            presigned_urls = self.create_presigned_urls(
+            presigned_urls = await self.create_presigned_urls(
                 bucket, object_names, expiration=expiration
             )
 
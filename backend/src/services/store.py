@@ -0,0 +1,139 @@
+"""
+Keyset pagination over the LangGraph ``store`` table.
+
+Items are listed newest first by ``(updated_at, prefix, key)`` and a page is
+continued from an opaque cursor, so a listing reads only the rows it returns
+no matter how many items the namespace holds. Stores without SQL access (the
+in-memory store) are paged in Python with the same ordering and cursors.
+"""
+
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from langgraph.store.base import BaseStore, Item
+from langgraph.store.postgres import AsyncPostgresStore
+from langgraph.store.postgres.base import _decode_ns_bytes, _row_to_item
+
+from src.utils.logger import logger
+from src.utils.retry import async_retry
+
+IN_MEMORY_SEARCH_LIMIT = 10_000
+
+# Listings are scoped by the first two namespace labels, e.g. ("threads",
+# user_id) or (user_id, "prompts"), and read in cursor order from this index.
+STORE_PAGE_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS store_page_idx ON store (
+    split_part(prefix, '.', 1),
+    split_part(prefix, '.', 2),
+    updated_at DESC,
+    prefix DESC,
+    key DESC
+);
+"""
+
+STORE_PAGE_QUERY = """
+SELECT prefix, key, value, created_at, updated_at
+FROM store
+WHERE split_part(prefix, '.', 1) = %(label_1)s
+  AND split_part(prefix, '.', 2) = %(label_2)s
+  AND prefix LIKE %(prefix)s
+  {after}
+ORDER BY updated_at DESC, prefix DESC, key DESC
+LIMIT %(limit)s
+"""
+
+STORE_PAGE_AFTER = (
+    "AND (updated_at, prefix, key) < (%(updated_at)s, %(after_prefix)s, %(key)s)"
+)
+
+Cursor = tuple[datetime, str, str]
+
+
+def encode_cursor(item: Item) -> str:
+    position = [item.updated_at.isoformat(), ".".join(item.namespace), item.key]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        updated_at, prefix, key = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(updated_at), prefix, key
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _position(item: Item) -> Cursor:
+    return item.updated_at, ".".join(item.namespace), item.key
+
+
+async def setup_page_index(store: AsyncPostgresStore) -> None:
+    """Create the listing index, called once after ``store.setup()``."""
+    try:
+        async with store._cursor() as cur:
+            await cur.execute(STORE_PAGE_INDEX)
+    except Exception as e:
+        logger.error(f"Error creating store page index: {e}")
+
+
+@async_retry("store")
+async def paginate(
+    store: BaseStore,
+    namespace: tuple[str, ...],
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[list[Item], Optional[str]]:
+    """
+    One page of the items under ``namespace`` (and its sub-namespaces), newest
+    first, with the cursor of the next page or None on the last page.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    if isinstance(store, AsyncPostgresStore) and len(namespace) >= 2:
+        items = await _postgres_page(store, namespace, limit + 1, after)
+    else:
+        items = await _in_memory_page(store, namespace, limit + 1, after)
+
+    if len(items) > limit:
+        items = items[:limit]
+        return items, encode_cursor(items[-1])
+    return items, None
+
+
+async def _postgres_page(
+    store: AsyncPostgresStore,
+    namespace: tuple[str, ...],
+    limit: int,
+    after: Optional[Cursor],
+) -> list[Item]:
+    params = {
+        "label_1": namespace[0],
+        "label_2": namespace[1],
+        "prefix": f"{'.'.join(namespace)}%",
+        "limit": limit,
+    }
+    if after:
+        params.update(updated_at=after[0], after_prefix=after[1], key=after[2])
+    query = STORE_PAGE_QUERY.format(after=STORE_PAGE_AFTER if after else "")
+
+    async with store._cursor() as cur:
+        await cur.execute(query, params)
+        rows = await cur.fetchall()
+    return [
+        _row_to_item(_decode_ns_bytes(row["prefix"]), row, loader=store._deserializer)
+        for row in rows
+    ]
+
+
+async def _in_memory_page(
+    store: BaseStore,
+    namespace: tuple[str, ...],
+    limit: int,
+    after: Optional[Cursor],
+) -> list[Item]:
+    items = await store.asearch(namespace, limit=IN_MEMORY_SEARCH_LIMIT)
+    items = sorted(items, key=_position, reverse=True)
+    if after:
+        items = [item for item in items if _position(item) < after]
+    return items[:limit]
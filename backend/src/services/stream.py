@@ -0,0 +1,130 @@
+import asyncio
+import time
+import ujson
+from collections import deque
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator
+from uuid import uuid4
+
+from src.constants import STREAM_BUFFER_SIZE, STREAM_RETENTION
+from src.utils.logger import logger
+
+
+class RunStream:
+    """
+    Output of a single streamed run. A background task drains the run into a
+    bounded ring buffer with increasing event ids, and any number of clients
+    can tail it, resuming after the last id they saw.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        user_id: str | None = None,
+        max_events: int = STREAM_BUFFER_SIZE,
+    ):
+        self.run_id = run_id
+        self.user_id = user_id
+        self.finished_at: float | None = None
+        self._events: deque[tuple[int, str]] = deque(maxlen=max_events)
+        self._last_id = 0
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self, events: AsyncIterable[str]) -> "RunStream":
+        self._task = asyncio.create_task(self._run(events))
+        return self
+
+    def cancel(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    async def aclose(self) -> None:
+        self.cancel()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def publish(self, data: str) -> int:
+        self._last_id += 1
+        self._events.append((self._last_id, data))
+        self._notify()
+        return self._last_id
+
+    async def subscribe(self, last_event_id: int = 0) -> AsyncIterator[str]:
+        """Yield SSE events after ``last_event_id`` until the run finishes."""
+        cursor = last_event_id
+        while True:
+            changed = self._changed
+            if self._events and cursor < self._last_id:
+                oldest = self._events[0][0]
+                if cursor + 1 < oldest:
+                    logger.warning(
+                        f"Run {self.run_id} dropped events {cursor + 1}-{oldest - 1}"
+                    )
+                start = max(cursor + 1 - oldest, 0)
+                # Copy before yielding, the run keeps appending meanwhile
+                pending = list(islice(self._events, start, None))
+                for event_id, data in pending:
+                    yield f"id: {event_id}\ndata: {data}\n\n"
+                cursor = pending[-1][0]
+                continue
+            if self.done:
+                return
+            await changed.wait()
+
+    async def _run(self, events: AsyncIterable[str]) -> None:
+        try:
+            async for data in events:
+                self.publish(data)
+        except asyncio.CancelledError:
+            logger.info(f"Run {self.run_id} cancelled")
+        except Exception as e:
+            logger.exception(f"Run {self.run_id} failed: {e}")
+            # Tell subscribers why the run ended instead of closing silently
+            self.publish(ujson.dumps(("error", str(e))))
+        finally:
+            self.finished_at = time.monotonic()
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class StreamService:
+    """Registry of streamed runs on this worker, kept for a while after they
+    finish so clients can still fetch the tail."""
+
+    def __init__(self, retention: int = STREAM_RETENTION):
+        self.retention = retention
+        self._runs: dict[str, RunStream] = {}
+
+    def create(self, user_id: str | None = None) -> RunStream:
+        self._sweep()
+        run = RunStream(str(uuid4()), user_id)
+        self._runs[run.run_id] = run
+        return run
+
+    def get(self, run_id: str) -> RunStream | None:
+        return self._runs.get(run_id)
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(run.aclose() for run in self._runs.values()))
+        self._runs.clear()
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        expired = [
+            run_id
+            for run_id, run in self._runs.items()
+            if run.done and now - run.finished_at > self.retention
+        ]
+        for run_id in expired:
+            del self._runs[run_id]
+
+
+stream_service = StreamService()
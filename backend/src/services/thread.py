@@ -1,8 +1,10 @@
-import asyncio
-from typing import Any
+from typing import Any, Optional
+from fastapi import HTTPException
 from langgraph.store.memory import InMemoryStore
 from langgraph.store.base import BaseStore
+from src.services.store import paginate
 from src.utils.logger import logger
+from src.utils.retry import async_retry
 from src.constants import TEST_USER_ID
 
 IN_MEMORY_STORE = InMemoryStore()
@@ -30,6 +32,7 @@ class ThreadService:
         await self.store.aput(namespace=namespace, key=thread_id, value=data)
         return True
 
+    @async_retry("store")
     async def get(self, key: str) -> Any:
         namespace = self._get_namespace()
         return await self.store.aget(namespace, key)
@@ -45,41 +48,22 @@ class ThreadService:
 
     async def search(
         self,
-        limit: int = 1000,
+        limit: int = 100,
         filter: dict = {},
-    ) -> list[dict]:
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Threads newest first, with the cursor of the next page."""
         try:
             default_namespace = ("threads", self.user_id)
             if "assistant_id" in filter:
                 default_namespace = ("threads", self.user_id, filter["assistant_id"])
 
-            max_retries = 3
-            retry_delay = 1  # seconds
-
-            for attempt in range(max_retries):
-                try:
-                    async with self.store as store:
-                        threads = await store.asearch(default_namespace, limit=limit)
-                        return sorted(
-                            [thread.dict() for thread in threads],
-                            key=lambda x: x.get("updated_at"),
-                            reverse=True,
-                        )
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if "connection" in error_msg and "closed" in error_msg:
-                        logger.warning(
-                            f"Store connection closed on attempt {attempt + 1}/{max_retries}: {e}"
-                        )
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(
-                                retry_delay * (2**attempt)
-                            )  # Exponential backoff
-                            continue
-                    raise e
+            threads, next_cursor = await paginate(
+                self.store, default_namespace, limit=limit, cursor=cursor
+            )
+            return [thread.dict() for thread in threads], next_cursor
+        except HTTPException as e:
+            raise e
         except Exception as e:
             logger.error(f"Error searching threads: {e}")
-            return []
-
-
-thread_service = ThreadService()
+            return [], None
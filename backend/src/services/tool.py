@@ -1,10 +1,10 @@
 from langchain_core.tools import StructuredTool, BaseTool
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_arcade import ArcadeToolManager
 
 from src.schemas.entities.a2a import A2AServer, McpServer
 from src.tools import TOOL_LIBRARY
-from src.utils.a2a import A2ACardResolver
+from src.services.mcp import mcp_service
+from src.utils.a2a import resolve_agent_cards
 from src.schemas.entities import ArcadeConfig
 from src.utils.logger import logger
 from src.utils.tools import attach_tool_details
@@ -36,25 +36,24 @@ class ToolService:
     @staticmethod
     async def mcp_tools(mcp: dict[str, McpServer]):
         try:
-            mcp_client = MultiServerMCPClient(mcp)
-            mcp_tools = await mcp_client.get_tools()
-            return mcp_tools
+            return await mcp_service.get_tools(mcp)
         except Exception as e:
             logger.error(f"Error fetching MCP tools: {e}")
             return []
 
     @staticmethod
-    def agent_cards(a2a: dict[str, A2AServer]):
+    async def agent_cards(a2a: dict[str, A2AServer]):
         agent_cards = []
-        for _, server in a2a.items():
-            try:
-                a2a_card_resolver = A2ACardResolver(
-                    server.base_url, server.agent_card_path
+        results = await resolve_agent_cards(
+            (server.base_url, server.agent_card_path) for server in a2a.values()
+        )
+        for server, agent_card in zip(a2a.values(), results):
+            if isinstance(agent_card, Exception):
+                logger.error(
+                    f"Error fetching agent card for {server.base_url}: {agent_card}"
                 )
-                agent_card = a2a_card_resolver.get_agent_card()
-                agent_cards.append(agent_card.model_dump())
-            except Exception as e:
-                logger.error(f"Error fetching agent card for {server.base_url}: {e}")
+                continue
+            agent_cards.append(agent_card.model_dump())
         return agent_cards
 
     @staticmethod
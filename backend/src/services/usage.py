@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from src.repos.usage_repo import UsageRepo
+from src.services.db import AsyncSessionLocal
+from src.utils.logger import logger
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "total_tokens")
+
+
+class UsageTracker(AsyncCallbackHandler):
+    """
+    Sums the ``usage_metadata`` of every model call in one run per model and
+    writes it to the usage ledger when the run ends, whether it streamed,
+    was invoked or failed part way.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        assistant_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+    ):
+        self.user_id = user_id
+        self.assistant_id = assistant_id
+        self.thread_id = thread_id
+        self.usage: dict[str, dict[str, int]] = {}
+        self._models: dict[UUID, str] = {}
+
+    async def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs
+    ) -> None:
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or (serialized or {}).get("name")
+        provider = metadata.get("ls_provider")
+        self._models[run_id] = f"{provider}:{model}" if provider else model or "unknown"
+
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        model = self._models.pop(run_id, "unknown")
+        totals = self.usage.setdefault(
+            model, {"calls": 0, **dict.fromkeys(USAGE_FIELDS, 0)}
+        )
+        totals["calls"] += 1
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                for field in USAGE_FIELDS:
+                    totals[field] += usage.get(field, 0)
+
+    async def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._models.pop(run_id, None)
+
+    async def on_chain_end(
+        self, outputs, *, run_id: UUID, parent_run_id=None, **kwargs
+    ):
+        if parent_run_id is None:
+            await self.save()
+
+    async def on_chain_error(
+        self, error, *, run_id: UUID, parent_run_id=None, **kwargs
+    ):
+        if parent_run_id is None:
+            await self.save()
+
+    def rows(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "user_id": self.user_id,
+                "assistant_id": self.assistant_id,
+                "thread_id": self.thread_id,
+                "model": model,
+                **totals,
+            }
+            for model, totals in self.usage.items()
+        ]
+
+    async def save(self) -> None:
+        rows = self.rows()
+        self.usage = {}
+        if not rows:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await UsageRepo(db).create_many(rows)
+        except Exception as e:
+            logger.error(f"Error saving token usage for {self.user_id}: {e}")
+
+
+class UsageService:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+
+    async def aggregate(
+        self,
+        group_by: list[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[dict]:
+        async with AsyncSessionLocal() as db:
+            return await UsageRepo(db, self.user_id).aggregate(group_by, start, end)
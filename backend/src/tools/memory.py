@@ -1,27 +1,46 @@
 from uuid import uuid4
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from src.services.memory import memory_service
+from langgraph.runtime import CONFIG_KEY_RUNTIME
+
+from src.constants import MEMORY_SEARCH_LIMIT
+from src.services.db import SharedDB
+from src.services.memory import MemoryService, memory_to_xml
+
+
+def get_memory_service(config: RunnableConfig | None) -> MemoryService:
+    """
+    Memories of the user the agent is running for, taken from the runtime
+    context set by the server for authenticated requests. The configurable
+    user_id comes from client metadata and is never trusted here.
+    """
+    runtime = (config or {}).get("configurable", {}).get(CONFIG_KEY_RUNTIME)
+    context = getattr(runtime, "context", None)
+    if isinstance(context, dict):
+        user_id = context.get("user_id")
+    else:
+        user_id = getattr(context, "user_id", None)
+    return MemoryService(user_id=user_id, store=SharedDB.store)
 
 
 @tool
-async def upsert_memory(memory: str) -> str:
+async def upsert_memory(memory: str, config: RunnableConfig = None) -> str:
     """
     Toolkit: Memory
     Description: Upsert memory to vectorstore for later semantic retrieval.
     Args:
         memory: The memory to upsert.
-        ttl: The time to live for the memory.
         config: The config for the memory.
     Returns:
         The memory ID.
     """
     memory_id = f"memory_{str(uuid4())}"
-    await memory_service.set(memory_id, {"memory": memory}, ttl=None)
+    await get_memory_service(config).set(memory_id, {"memory": memory}, ttl=None)
     return f"Memory ID {memory_id} saved."
 
 
 @tool
-async def delete_memory(memory_id: str) -> str:
+async def delete_memory(memory_id: str, config: RunnableConfig = None) -> str:
     """
     Toolkit: Memory
     Description: Delete memory from vectorstore.
@@ -31,25 +50,25 @@ async def delete_memory(memory_id: str) -> str:
     Returns:
         Deleted message.
     """
-    await memory_service.delete(memory_id)
+    await get_memory_service(config).delete(memory_id)
     return f"Memory ID {memory_id} deleted."
 
 
-# TODO: Implement search memory
-# @tool
-# async def search_memory(
-#     query: str,
-#     config: RunnableConfig | None = None
-# ) -> str:
-# 	"""
-#     Toolkit: Memory
-#     Description: Search for memories based on a query.
-# 	Args:
-# 		query: The query to search for.
-# 		config: The config for the memory.
-# 	Returns:
-# 		The memories (documents).
-# 	"""
-# 	return await memory_service.search()
-
-MEMORY_TOOLS = [upsert_memory, delete_memory]
+@tool
+async def search_memory(query: str, config: RunnableConfig = None) -> str:
+    """
+    Toolkit: Memory
+    Description: Search for memories based on a query.
+    Args:
+        query: The query to search for.
+        config: The config for the memory.
+    Returns:
+        The memories (documents).
+    """
+    memories = await get_memory_service(config).search(query, limit=MEMORY_SEARCH_LIMIT)
+    if not memories:
+        return "No memories found."
+    return "\n".join(memory_to_xml(memory) for memory in memories)
+
+
+MEMORY_TOOLS = [upsert_memory, delete_memory, search_memory]
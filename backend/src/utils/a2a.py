@@ -1,8 +1,21 @@
+import re
+import time
 import uuid
+import asyncio
 import httpx
 import json
-from httpx_sse import connect_sse
-from typing import Any, AsyncIterable
+import importlib.util
+from httpx_sse import aconnect_sse
+from typing import Any, AsyncIterable, Iterable
+from langchain_core.runnables import RunnableConfig
+from src.constants import (
+    A2A_CARD_TTL,
+    A2A_CARD_TIMEOUT,
+    A2A_HTTP2,
+    A2A_MAX_CONNECTIONS,
+    A2A_MAX_KEEPALIVE_CONNECTIONS,
+    A2A_REQUEST_TIMEOUT,
+)
 from src.utils.logger import logger
 from fastapi.responses import StreamingResponse, JSONResponse
 from src.common.types import (
@@ -26,19 +39,120 @@ from src.common.types import (
 )
 
 
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide async client shared by A2A calls. Connections are pooled and
+    negotiated over HTTP/2 when the h2 package is available, so concurrent
+    requests to the same agent are multiplexed over one connection.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        http2 = A2A_HTTP2 and importlib.util.find_spec("h2") is not None
+        if A2A_HTTP2 and not http2:
+            logger.warning("h2 is not installed, A2A client falling back to HTTP/1.1")
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            timeout=A2A_CARD_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=A2A_MAX_CONNECTIONS,
+                max_keepalive_connections=A2A_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def aclose_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class _CachedCard:
+    def __init__(self, card: AgentCard, etag: str | None, expires_at: float):
+        self.card = card
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+# Agent cards keyed by URL, shared by every request on the worker
+_card_cache: dict[str, _CachedCard] = {}
+_card_fetches: dict[str, asyncio.Future] = {}
+
+
+def _max_age(response: httpx.Response) -> int | None:
+    cache_control = response.headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else None
+
+
 class A2ACardResolver:
     def __init__(self, base_url, agent_card_path="/.well-known/agent.json"):
         self.base_url = base_url.rstrip("/")
         self.agent_card_path = agent_card_path.lstrip("/")
 
-    def get_agent_card(self) -> AgentCard:
-        with httpx.Client() as client:
-            response = client.get(self.base_url + "/" + self.agent_card_path)
-            response.raise_for_status()
-            try:
-                return AgentCard(**response.json())
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+    @property
+    def url(self) -> str:
+        return self.base_url + "/" + self.agent_card_path
+
+    async def aget_agent_card(self) -> AgentCard:
+        """
+        Fetch the agent card without blocking the event loop. Cards are cached
+        per URL for their Cache-Control max-age (or A2A_CARD_TTL) and
+        revalidated with If-None-Match once stale.
+        """
+        cached = _card_cache.get(self.url)
+        if cached and cached.expires_at > time.monotonic():
+            return cached.card
+
+        # Concurrent callers share one in-flight fetch per URL
+        fetch = _card_fetches.get(self.url)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_agent_card(cached))
+            _card_fetches[self.url] = fetch
+            fetch.add_done_callback(lambda _: _card_fetches.pop(self.url, None))
+        return await asyncio.shield(fetch)
+
+    async def _fetch_agent_card(self, cached: _CachedCard | None) -> AgentCard:
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else {}
+        response = await get_http_client().get(self.url, headers=headers)
+        max_age = _max_age(response)
+        ttl = A2A_CARD_TTL if max_age is None else max_age
+        if response.status_code == 304 and cached:
+            cached.expires_at = time.monotonic() + ttl
+            return cached.card
+
+        response.raise_for_status()
+        try:
+            card = AgentCard(**response.json())
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+        _card_cache[self.url] = _CachedCard(
+            card, response.headers.get("etag"), time.monotonic() + ttl
+        )
+        return card
+
+
+async def resolve_agent_cards(
+    servers: Iterable[tuple[str, str]],
+) -> list[AgentCard | Exception]:
+    """
+    Resolve agent cards for (base_url, agent_card_path) pairs concurrently.
+    Failures are returned in place so one slow or broken server does not
+    fail the others.
+    """
+    return await asyncio.gather(
+        *(
+            A2ACardResolver(base_url, agent_card_path).aget_agent_card()
+            for base_url, agent_card_path in servers
+        ),
+        return_exceptions=True,
+    )
 
 
 class A2AClient:
@@ -65,31 +179,36 @@ class A2AClient:
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, "POST", self.url, json=request.model_dump()
+        # Remote agents may think for a while between events, so only the
+        # connect phase is bounded.
+        timeout = httpx.Timeout(A2A_CARD_TIMEOUT, read=None)
+        try:
+            async with aconnect_sse(
+                get_http_client(),
+                "POST",
+                self.url,
+                json=request.model_dump(),
+                timeout=timeout,
             ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
+                async for sse in event_source.aiter_sse():
+                    yield SendTaskStreamingResponse(**json.loads(sse.data))
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
 
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=30
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+        try:
+            # Image generation could take time, adding timeout
+            response = await get_http_client().post(
+                self.url, json=request.model_dump(), timeout=A2A_REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
@@ -176,3 +295,18 @@ async def a2a_builder(
         }
     )
     return response.result.model_dump_json()
+
+
+def a2a_send_task(base_url: str, thread_id: str = None):
+    """
+    Build the coroutine behind an A2A tool. The session id is read from the
+    run's config at call time so the tool can be shared across threads.
+    """
+
+    async def send_task(query: str, config: RunnableConfig = None):
+        configurable = (config or {}).get("configurable", {})
+        return await a2a_builder(
+            base_url, query, configurable.get("thread_id") or thread_id
+        )
+
+    return send_task
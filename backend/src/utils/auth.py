@@ -13,6 +13,7 @@ from src.constants import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_TOKEN_EXPIRE_MINUTE
 from src.schemas.entities import LLMRequest, LLMStreamRequest
 from src.schemas.models import User
 from src.services.db import get_async_db
+from src.services.auth_cache import auth_cache
 from src.utils.logger import logger
 
 security = HTTPBearer(
@@ -85,6 +86,14 @@ async def verify_credentials(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Tokens verified recently skip decoding and the user lookup
+        cached = auth_cache.get(credentials.credentials)
+        if cached is not None:
+            request.state.user = cached
+            request.state.token = credentials.credentials
+            request.state.user_repo = UserRepo(db, cached.id)
+            return cached
+
         # Verify JWT token
         payload = jwt.decode(
             credentials.credentials, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM]
@@ -133,10 +142,12 @@ async def verify_credentials(
 
         logger.info(f"Authenticated user: {user.id} {user.email}")
         user_repo.user_id = user.id
-        request.state.user = user.protected()
+        protected = user.protected()
+        auth_cache.set(credentials.credentials, protected, exp)
+        request.state.user = protected
         request.state.token = credentials.credentials
         request.state.user_repo = user_repo
-        return user.protected()
+        return protected
 
     except JWTError:
         logger.exception(f"Could not validate credentials: {credentials.credentials}")
@@ -1,8 +1,16 @@
 import os
 import sys
+import random
 from loguru import logger
 
-from src.constants import APP_LOG_LEVEL
+from src.constants import (
+    APP_LOG_LEVEL,
+    APP_LOG_ENQUEUE,
+    APP_LOG_MAX_PAYLOAD,
+    APP_LOG_SAMPLING,
+    APP_LOG_SAMPLE_RATE,
+    APP_LOG_FILE_QUEUE_SIZE,
+)
 
 # Define a log format that is readable and user-friendly
 LOG_FORMAT = (
@@ -20,6 +28,7 @@ logger.add(
     format=LOG_FORMAT,
     level=APP_LOG_LEVEL,  # Change to DEBUG for verbose output
     colorize=True,
+    enqueue=APP_LOG_ENQUEUE,  # Write from a background thread, not the event loop
     backtrace=True,  # Show error backtraces for easier debugging
     # diagnose=True,   # Show variable values in tracebacks
     # catch=True,      # Catch exceptions and show full traceback
@@ -38,21 +47,116 @@ logger.add(
 #     catch=True       # Catch exceptions in file logs
 # )
 
+
+def parse_sampling(config: str) -> dict[str, float]:
+    """Parse "route=rate,route=rate" into {route: rate}."""
+    rates = {}
+    for entry in config.split(","):
+        route, _, rate = entry.strip().rpartition("=")
+        if route:
+            rates[route] = float(rate)
+    return rates
+
+
+_sample_rates = parse_sampling(APP_LOG_SAMPLING)
+
+
+def should_log(route: str) -> bool:
+    """Sample request logs per route template."""
+    rate = _sample_rates.get(route, APP_LOG_SAMPLE_RATE)
+    return rate >= 1 or random.random() < rate
+
+
+def truncate(value, limit: int = APP_LOG_MAX_PAYLOAD) -> str:
+    """String form of ``value`` cut to ``limit`` characters for logging."""
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more characters]"
+
+
 import time
+import queue
+import atexit
+import threading
 
 # Generate a timestamp at module load (i.e., per server run)
 _LLM_STREAM_TIMESTAMP = time.strftime("%Y%m%d_%H%M%S")
 
 
+class BufferedFileWriter:
+    """
+    Appends lines to a log file from a background thread. The file is opened
+    up front so failures surface to the caller; afterwards callers only put
+    the line on a bounded queue, dropping (and counting) lines when it is full.
+    The file is flushed once the queue drains.
+    """
+
+    def __init__(self, path: str, maxsize: int = APP_LOG_FILE_QUEUE_SIZE):
+        self.path = path
+        self.dropped = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        with self._file:
+            while True:
+                line = self._queue.get()
+                if line is None:
+                    break
+                try:
+                    self._file.write(line + "\n")
+                    if self._queue.empty():
+                        self._file.flush()
+                except OSError as e:
+                    self.dropped += 1
+                    logger.warning(f"Could not write to {self.path}: {e}")
+        if self.dropped:
+            logger.warning(f"Dropped {self.dropped} line(s) for {self.path}")
+
+
+_file_writers: dict[str, BufferedFileWriter | None] = {}
+_file_writers_lock = threading.Lock()
+
+
+def _file_writer(path: str) -> BufferedFileWriter | None:
+    if path not in _file_writers:
+        with _file_writers_lock:
+            if path not in _file_writers:
+                try:
+                    _file_writers[path] = BufferedFileWriter(path)
+                except OSError as e:
+                    # Remembered as None so the open is not retried per line
+                    logger.warning(f"Not logging to {path}: {e}")
+                    _file_writers[path] = None
+    return _file_writers[path]
+
+
 def log_to_file(message: str, model: str, folder: str = "llm_stream"):
-    logs_dir = os.path.join("logs", folder)
-    os.makedirs(logs_dir, exist_ok=True)
     log_filename = os.path.join(
-        logs_dir, f"{_LLM_STREAM_TIMESTAMP}_{model.split(':')[0]}.log"
+        "logs", folder, f"{_LLM_STREAM_TIMESTAMP}_{model.split(':')[0]}.log"
     )
-    with open(log_filename, "a", encoding="utf-8") as log_file:
-        log_file.write(str(message) + "\n")
+    writer = _file_writer(log_filename)
+    if writer:
+        writer.write(str(message))
 
 
 # Expose the logger for use in other files
-__all__ = ["logger", "log_to_file"]
+__all__ = ["logger", "log_to_file", "should_log", "truncate"]
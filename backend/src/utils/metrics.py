@@ -0,0 +1,242 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Histograms are observed on the hot paths (requests, agent construction, model
+and tool calls, streams); gauges and counters that mirror state owned
+elsewhere (connection pools, retry counters) are read when scraped.
+"""
+
+import math
+from time import perf_counter
+from contextlib import contextmanager
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterator
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = labels + ((extra,) if extra else ())
+    if not pairs:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (math.inf,)
+        # labels -> [bucket counts..., sum, count]
+        self._series: dict[Labels, list[float]] = {}
+
+    def _labels(self, labels: dict[str, Any]) -> Labels:
+        return tuple((name, str(labels.get(name, ""))) for name in self.labelnames)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._labels(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the block in seconds, also when it raises."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def collect(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, series in self._series.items():
+            for bound, count in zip(self.buckets, series):
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(labels, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+
+class CallbackMetric:
+    """A gauge or counter whose samples are read from ``function`` when scraped."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        function: Callable[[], dict[Labels, float]],
+        type: str = "gauge",
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.type = type
+
+    def collect(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, value in self.function().items():
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Histogram | CallbackMetric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            try:
+                lines.extend(metric.collect())
+            except Exception:
+                # A failing source must not take the whole scrape down
+                continue
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+AGENT_CONSTRUCT_SECONDS = REGISTRY.register(
+    Histogram(
+        "agent_construct_duration_seconds",
+        "Time spent constructing an agent, by phase.",
+        ("phase",),
+    )
+)
+TIME_TO_FIRST_TOKEN_SECONDS = REGISTRY.register(
+    Histogram(
+        "agent_time_to_first_token_seconds",
+        "Time from the start of a stream to its first event.",
+        ("model",),
+        buckets=LLM_BUCKETS,
+    )
+)
+MODEL_CALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "agent_model_call_duration_seconds",
+        "Chat model call latency.",
+        ("model", "status"),
+        buckets=LLM_BUCKETS,
+    )
+)
+TOOL_CALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "agent_tool_call_duration_seconds",
+        "Tool call latency.",
+        ("tool", "status"),
+        buckets=LLM_BUCKETS,
+    )
+)
+STREAM_CHUNKS = REGISTRY.register(
+    Histogram(
+        "sse_chunks_per_stream",
+        "SSE events sent per stream.",
+        ("model",),
+        buckets=COUNT_BUCKETS,
+    )
+)
+
+
+async def instrument_stream(
+    events: AsyncIterable[str], model: str | None = None
+) -> AsyncIterator[str]:
+    """Pass a stream through, observing its time to first event and length."""
+    start = perf_counter()
+    count = 0
+    try:
+        async for event in events:
+            if count == 0:
+                TIME_TO_FIRST_TOKEN_SECONDS.observe(perf_counter() - start, model=model)
+            count += 1
+            yield event
+    finally:
+        STREAM_CHUNKS.observe(count, model=model)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Times chat model and tool calls of every agent run it is attached to."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._started: dict[UUID, tuple[float, str]] = {}
+
+    def _start(self, run_id: UUID, name: str) -> None:
+        self._started[run_id] = (perf_counter(), name)
+
+    def _end(self, run_id: UUID, histogram: Histogram, label: str, status: str):
+        started = self._started.pop(run_id, None)
+        if started:
+            start, name = started
+            histogram.observe(perf_counter() - start, **{label: name, "status": status})
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        model = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name")
+        self._start(run_id, model or "unknown")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id, MODEL_CALL_SECONDS, "model", "ok")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, MODEL_CALL_SECONDS, "model", "error")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, (serialized or {}).get("name") or "unknown")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, TOOL_CALL_SECONDS, "tool", "ok")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, TOOL_CALL_SECONDS, "tool", "error")
+
+
+metrics_callback = MetricsCallbackHandler()
@@ -1,4 +1,34 @@
+import os
+import json
+import asyncio
 import httpx
+from typing import Any
+
+from src.constants import LANGCONNECT_SPEC_CACHE, LANGCONNECT_SPEC_REFRESH
+from src.utils.logger import logger
+
+# Snapshot of the LangConnect spec shipped with the app, used until a fresher
+# copy has been cached
+VENDORED_LANGCONNECT_SPEC = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "constants", "langconnect_openapi.json"
+)
+
+# What the RAG gateway reads from the LangConnect spec: every operation's
+# summary, description and operationId, the listed response codes, and the
+# component schemas its models are built from
+LANGCONNECT_SPEC_PATHS = {
+    "/collections": {"get": ("200",), "post": ("201", "422")},
+    "/collections/{collection_id}": {"get": ("200",), "patch": ("200",), "delete": ()},
+    "/collections/{collection_id}/documents": {"get": ("200",), "post": ("200",)},
+    "/collections/{collection_id}/documents/search": {"post": ()},
+    "/collections/{collection_id}/documents/{document_id}": {"delete": ("200",)},
+}
+LANGCONNECT_SPEC_SCHEMAS = (
+    "CollectionCreate",
+    "CollectionResponse",
+    "DocumentResponse",
+    "SearchQuery",
+)
 
 
 async def fetch_openapi_spec(url: str = "http://localhost:8080/openapi.json") -> dict:
@@ -38,6 +68,89 @@ def fetch_openapi_spec_sync(url: str = "http://localhost:8080/openapi.json") ->
         raise Exception(f"Failed to fetch OpenAPI spec: {str(e)}")
 
 
+def missing_from_openapi_spec(
+    spec: Any,
+    paths: dict[str, dict[str, tuple[str, ...]]] = LANGCONNECT_SPEC_PATHS,
+    schemas: tuple[str, ...] = LANGCONNECT_SPEC_SCHEMAS,
+) -> list[str]:
+    """List the required operations, fields and schemas the spec lacks."""
+    if not isinstance(spec, dict):
+        return ["spec"]
+    missing = []
+    spec_paths = spec.get("paths") or {}
+    for path, methods in paths.items():
+        for method, codes in methods.items():
+            operation = (spec_paths.get(path) or {}).get(method)
+            if not isinstance(operation, dict):
+                missing.append(f"{method.upper()} {path}")
+                continue
+            for field in ("summary", "description", "operationId"):
+                if field not in operation:
+                    missing.append(f"{method.upper()} {path} {field}")
+            responses = operation.get("responses") or {}
+            for code in codes:
+                if code not in responses:
+                    missing.append(f"{method.upper()} {path} response {code}")
+    spec_schemas = (spec.get("components") or {}).get("schemas") or {}
+    missing.extend(f"schema {name}" for name in schemas if name not in spec_schemas)
+    return missing
+
+
+def load_openapi_spec(
+    cache_path: str = LANGCONNECT_SPEC_CACHE,
+    vendored_path: str = VENDORED_LANGCONNECT_SPEC,
+) -> dict:
+    """
+    Load an OpenAPI specification from disk without touching the network:
+    the cached copy written by ``refresh_openapi_spec`` when it exists, parses
+    and has everything the gateway uses, otherwise the vendored snapshot.
+    """
+    for path in (cache_path, vendored_path):
+        try:
+            with open(path) as f:
+                spec = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable OpenAPI spec {path}: {e}")
+            continue
+        missing = missing_from_openapi_spec(spec)
+        if missing:
+            logger.warning(f"Ignoring OpenAPI spec {path} missing {', '.join(missing)}")
+            continue
+        return spec
+    raise FileNotFoundError(
+        f"No usable OpenAPI spec at {cache_path} or {vendored_path}"
+    )
+
+
+async def refresh_openapi_spec(
+    url: str,
+    cache_path: str = LANGCONNECT_SPEC_CACHE,
+    interval: int = LANGCONNECT_SPEC_REFRESH,
+) -> None:
+    """
+    Keep the cached copy of a remote spec current, fetching it now and then
+    every ``interval`` seconds. Specs lacking what the gateway uses are never
+    cached. Failures are logged and retried on the next tick; new workers pick
+    the refreshed spec up when they start.
+    """
+    while True:
+        try:
+            spec = await fetch_openapi_spec(url)
+            missing = missing_from_openapi_spec(spec)
+            if missing:
+                raise ValueError(f"spec is missing {', '.join(missing)}")
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(spec, f)
+            os.replace(tmp_path, cache_path)
+            logger.debug(f"Cached OpenAPI spec from {url} at {cache_path}")
+        except Exception as e:
+            logger.warning(f"Could not refresh OpenAPI spec from {url}: {e}")
+        await asyncio.sleep(interval)
+
+
 def get_response_model(name: str, spec: dict) -> type:
     """
     Get the response model for a given schema name from the OpenAPI spec.
@@ -1,10 +1,160 @@
-from fastapi import Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import math
+import time
+import functools
+from fastapi import HTTPException, Request, status
+from langchain_core.callbacks import AsyncCallbackHandler
 
+from src.constants import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_STORAGE,
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_TOKENS,
+)
+from src.repos.rate_limit_repo import RateLimitRepo
+from src.services.db import AsyncSessionLocal
+from src.utils.logger import logger
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["200/day"])
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
 
 
-def get_limiter(request: Request) -> Limiter:
-    return request.app.state.limiter
+def parse_limit(limit: str) -> tuple[float, float]:
+    """Parse "200/day" into a bucket capacity and its refill rate per second."""
+    amount, _, period = limit.partition("/")
+    capacity = float(amount)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+def rate_limit_key(request: Request) -> str:
+    """The authenticated user when auth ran for this request, else the client IP."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return f"user:{user.id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class MemoryBucketStorage:
+    """Token buckets local to this process, for development and tests."""
+
+    def __init__(self):
+        self.buckets: dict[tuple[str, str], tuple[float, float]] = {}
+
+    async def take(
+        self,
+        key: str,
+        bucket: str,
+        capacity: float,
+        rate: float,
+        cost: float = 1,
+        force: bool = False,
+    ) -> tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get((key, bucket), (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        allowed = tokens >= cost
+        if allowed or force:
+            tokens = max(tokens - cost, -capacity)
+        self.buckets[(key, bucket)] = (tokens, now)
+        return allowed, tokens
+
+
+class PostgresBucketStorage:
+    """Token buckets in the rate_limits table, shared by every worker."""
+
+    async def take(self, *args, **kwargs) -> tuple[bool, float]:
+        async with AsyncSessionLocal() as db:
+            return await RateLimitRepo(db).take(*args, **kwargs)
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per user (per client IP for anonymous requests) with
+    separate budgets: requests per endpoint, and model tokens consumed across
+    all endpoints. Limits fail open when the storage is unavailable.
+    """
+
+    def __init__(self, storage=None, tokens: str = RATE_LIMIT_TOKENS):
+        self.storage = storage or (
+            PostgresBucketStorage()
+            if RATE_LIMIT_STORAGE == "postgres"
+            else MemoryBucketStorage()
+        )
+        self.tokens = parse_limit(tokens)
+
+    async def _take(
+        self, key: str, bucket: str, limit: tuple, cost: float, force: bool = False
+    ) -> tuple[bool, float]:
+        capacity, rate = limit
+        try:
+            return await self.storage.take(key, bucket, capacity, rate, cost, force)
+        except Exception as e:
+            logger.warning(f"Rate limit storage unavailable, allowing {key}: {e}")
+            return True, capacity
+
+    async def hit(
+        self, key: str, bucket: str, limit: str = RATE_LIMIT_REQUESTS
+    ) -> None:
+        """Take one request, raising 429 when the budget is spent."""
+        capacity, rate = parse_limit(limit)
+        allowed, tokens = await self._take(key, bucket, (capacity, rate), 1)
+        if not allowed:
+            raise self._exceeded(f"Rate limit exceeded: {limit}", 1 - tokens, rate)
+
+    async def check_tokens(self, key: str) -> None:
+        """Raise 429 while a user's model token budget is overdrawn."""
+        _, tokens = await self._take(key, "tokens", self.tokens, 0)
+        if tokens <= 0:
+            raise self._exceeded("Token budget exceeded", 1 - tokens, self.tokens[1])
+
+    async def charge(self, key: str, tokens: int) -> None:
+        """Take model tokens that were already spent, even past the budget."""
+        await self._take(key, "tokens", self.tokens, tokens, force=True)
+
+    def _exceeded(self, detail: str, missing: float, rate: float) -> HTTPException:
+        retry_after = max(math.ceil(missing / rate), 1)
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def limit(self, limit: str = RATE_LIMIT_REQUESTS):
+        """
+        Limit an endpoint, which must take ``request: Request``. Signed-in
+        users are also held to their token budget.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if RATE_LIMIT_ENABLED:
+                    request: Request = kwargs["request"]
+                    key = rate_limit_key(request)
+                    await self.hit(key, f"requests:{func.__name__}", limit)
+                    if key.startswith("user:"):
+                        await self.check_tokens(key)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+limiter = RateLimiter()
+
+
+class TokenBudgetCallback(AsyncCallbackHandler):
+    """Charges the model tokens of every call in a run to a user's budget."""
+
+    def __init__(self, user_id: str):
+        self.key = f"user:{user_id}"
+
+    async def on_llm_end(self, response, **kwargs) -> None:
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        if tokens and RATE_LIMIT_ENABLED:
+            await limiter.charge(self.key, tokens)
@@ -1,25 +1,33 @@
 import os
 import json
 from datetime import datetime
+from typing import AsyncIterator
 from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_core.documents import Document
 from langchain.embeddings.base import init_embeddings
 from langchain.embeddings.base import Embeddings
-from fastapi import Request, UploadFile
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
+from src.constants import (
+    LANGCONNECT_MAX_CONNECTIONS,
+    LANGCONNECT_PROXY_TIMEOUT,
+    LANGCONNECT_UPLOAD_CHUNK_SIZE,
+)
 from src.utils.logger import logger
 import httpx
 
 from src.utils.llm import get_api_key
 
 
-def extract_file_metadata(filename: str, content: bytes, content_type: str) -> dict:
+def extract_file_metadata(filename: str, size: int, content_type: str) -> dict:
     """Extract metadata from file"""
     metadata = {
         "source": filename.strip(),
         "content_type": content_type,
-        "file_size": len(content),
+        "file_size": size,
         "creationdate": datetime.now().isoformat(),
     }
 
@@ -49,12 +57,139 @@ def extract_file_metadata(filename: str, content: bytes, content_type: str) -> d
     return metadata
 
 
+# Hop-by-hop headers are meaningful for a single connection only
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+_proxy_client: httpx.AsyncClient | None = None
+
+
+def get_proxy_client() -> httpx.AsyncClient:
+    """Process-wide client for the LangConnect gateway, so connections are pooled."""
+    global _proxy_client
+    if _proxy_client is None or _proxy_client.is_closed:
+        _proxy_client = httpx.AsyncClient(
+            timeout=LANGCONNECT_PROXY_TIMEOUT,
+            limits=httpx.Limits(max_connections=LANGCONNECT_MAX_CONNECTIONS),
+        )
+    return _proxy_client
+
+
+async def aclose_proxy_client() -> None:
+    global _proxy_client
+    if _proxy_client is not None:
+        await _proxy_client.aclose()
+        _proxy_client = None
+
+
+def _forward_headers(headers, exclude: set[str]) -> dict[str, str]:
+    return {
+        k: v
+        for k, v in headers.items()
+        if k.lower() not in exclude and k.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+
+# Escapes for quoted multipart parameters, as httpx applies them
+_FORM_PARAM_ESCAPES = {
+    ord('"'): "%22",
+    ord("\\"): "\\\\",
+    ord("\r"): "%0D",
+    ord("\n"): "%0A",
+}
+
+
+def _form_part_headers(name: str, upload: StarletteUploadFile | None = None) -> bytes:
+    def quote(value: str) -> str:
+        return value.translate(_FORM_PARAM_ESCAPES)
+
+    disposition = f'Content-Disposition: form-data; name="{quote(name)}"'
+    if upload is None:
+        return f"{disposition}\r\n\r\n".encode()
+    content_type = upload.content_type or "application/octet-stream"
+    return (
+        f'{disposition}; filename="{quote(upload.filename or "")}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+
+
+async def _multipart(request: Request) -> tuple[AsyncIterator[bytes], dict[str, str]]:
+    """
+    Body and headers re-encoding a multipart form, with ``metadatas_json``
+    describing every uploaded file added to the fields. Files stay in their
+    spooled temporary files and are read in chunks with ``UploadFile.read``,
+    which moves disk reads off the event loop.
+    """
+    form = await request.form()
+    files, data, metadatas = [], [], []
+    for key, value in form.multi_items():
+        if isinstance(value, StarletteUploadFile):
+            metadatas.append(
+                extract_file_metadata(value.filename, value.size, value.content_type)
+            )
+            files.append((key, value))
+        else:
+            data.append((key, value))
+    if metadatas:
+        data.append(("metadatas_json", json.dumps(metadatas)))
+        logger.debug(f"Adding metadatas_json to request: {data[-1][1]}")
+
+    boundary = os.urandom(16).hex().encode()
+    delimiter = b"--" + boundary + b"\r\n"
+    fields = [
+        delimiter + _form_part_headers(key, None) + value.encode() + b"\r\n"
+        for key, value in data
+    ]
+    file_headers = [
+        delimiter + _form_part_headers(key, upload) for key, upload in files
+    ]
+    closing = b"--" + boundary + b"--\r\n"
+    length = (
+        sum(map(len, fields))
+        + sum(
+            len(headers) + upload.size + 2
+            for headers, (_, upload) in zip(file_headers, files)
+        )
+        + len(closing)
+    )
+
+    async def body() -> AsyncIterator[bytes]:
+        for field in fields:
+            yield field
+        for headers, (_, upload) in zip(file_headers, files):
+            yield headers
+            await upload.seek(0)
+            while chunk := await upload.read(LANGCONNECT_UPLOAD_CHUNK_SIZE):
+                yield chunk
+            yield b"\r\n"
+        yield closing
+
+    headers = {
+        "content-type": f"multipart/form-data; boundary={boundary.decode()}",
+        "content-length": str(length),
+    }
+    return body(), headers
+
+
 async def langconnect_proxy(
     request: Request,
     service_url: str = "http://localhost:8080",
     strip_prefix: str = "/api/rag/",
 ):
-    logger.info(f"Request: {request.__dict__}")
+    """
+    Forward a request to LangConnect over a pooled connection, streaming the
+    response body back with its status and headers.
+    """
+    logger.debug(f"Proxying {request.method} {request.url.path} to {service_url}")
     try:
         stripped_path = request.url.path.replace(strip_prefix, "")
 
@@ -64,96 +199,46 @@ async def langconnect_proxy(
         if query_params:
             full_url += f"?{query_params}"
 
-        async with httpx.AsyncClient() as client:
-            # Handle form data and files
-            files_data = {}
-            data_fields = {}
-            extracted_metadatas = []
-
-            if request.headers.get("content-type", "").startswith(
-                "multipart/form-data"
-            ):
-                form = await request.form()
-
-                for key, value in form.items():
-                    if isinstance(value, UploadFile) or isinstance(
-                        value, StarletteUploadFile
-                    ):
-                        # Read file content
-                        try:
-                            content = await value.read()
-                            logger.debug(
-                                f"File content type: {type(content)}, size: {len(content)}"
-                            )
-
-                            # Extract metadata from the file
-                            file_metadata = extract_file_metadata(
-                                filename=value.filename,
-                                content=content,
-                                content_type=value.content_type,
-                            )
-                            extracted_metadatas.append(file_metadata)
-                            logger.debug(
-                                f"Extracted metadata for {value.filename}: {file_metadata}"
-                            )
-
-                            files_data[key] = (
-                                value.filename,
-                                content,
-                                value.content_type,
-                            )
-
-                        except Exception as file_error:
-                            logger.error(
-                                f"Error reading file {value.filename}: {file_error}"
-                            )
-                            raise file_error
-                    else:
-                        # Handle regular form fields
-                        data_fields[key] = value
-
-                # Add extracted metadata as JSON to the request
-                if extracted_metadatas:
-                    data_fields["metadatas_json"] = json.dumps(extracted_metadatas)
-                    logger.debug(
-                        f"Adding metadatas_json to request: {data_fields['metadatas_json']}"
-                    )
-
-            # Build request with appropriate content
-            if files_data or data_fields:
-                proxy_resp = await client.request(
-                    request.method,
-                    full_url,
-                    files=files_data if files_data else None,
-                    data=data_fields if data_fields else None,
-                    headers={
-                        k: v
-                        for k, v in request.headers.items()
-                        if k.lower() not in ["host", "content-length", "content-type"]
-                    },
-                )
-            else:
-                body = await request.body()
-                proxy_resp = await client.request(
-                    request.method,
-                    full_url,
-                    content=body,
-                    headers={
-                        k: v
-                        for k, v in request.headers.items()
-                        if k.lower() not in ["host", "content-length"]
-                    },
-                )
-
-            return proxy_resp
+        client = get_proxy_client()
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            content, headers = await _multipart(request)
+            proxy_req = client.build_request(
+                request.method,
+                full_url,
+                content=content,
+                headers={
+                    **_forward_headers(
+                        request.headers, {"host", "content-length", "content-type"}
+                    ),
+                    **headers,
+                },
+            )
+        else:
+            # The body is piped through; its Content-Length is kept so the
+            # upstream request is not chunked
+            has_body = "content-length" in request.headers or (
+                "transfer-encoding" in request.headers
+            )
+            proxy_req = client.build_request(
+                request.method,
+                full_url,
+                content=request.stream() if has_body else None,
+                headers=_forward_headers(request.headers, {"host"}),
+            )
+        proxy_resp = await client.send(proxy_req, stream=True)
     except Exception as e:
         logger.exception(f"Error forwarding request: {e}")
-        return httpx.Response(
-            status_code=500,
-            content=b'{"detail": "Internal server error"}',
-            headers={"content-type": "application/json"},
+        return JSONResponse(
+            status_code=500, content={"detail": "Internal server error"}
         )
 
+    return StreamingResponse(
+        proxy_resp.aiter_raw(),
+        status_code=proxy_resp.status_code,
+        headers=_forward_headers(proxy_resp.headers, set()),
+        background=BackgroundTask(proxy_resp.aclose),
+    )
+
 
 ## Retrieval Utils
 def get_embedding_model(model_name: str = "openai:text-embedding-3-large"):
@@ -1,31 +1,187 @@
 import time
+import random
+import asyncio
 import functools
+from dataclasses import dataclass, asdict
+from typing import Callable
 
+import psycopg
+from psycopg import errors
 
-def retry_db_operation(tries=3, delay=1, backoff=2, exceptions=(Exception,)):
+from src.constants import (
+    DB_RETRY_TRIES,
+    DB_RETRY_DELAY,
+    DB_RETRY_MAX_DELAY,
+    DB_CIRCUIT_THRESHOLD,
+    DB_CIRCUIT_RESET,
+)
+from src.utils.logger import logger
+
+# Failures worth another try: dropped or exhausted connections (PoolTimeout and
+# AdminShutdown are OperationalErrors) and transactions Postgres asks to retry.
+TRANSIENT_ERRORS = (
+    psycopg.OperationalError,
+    psycopg.InterfaceError,
+    errors.SerializationFailure,
+    errors.DeadlockDetected,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency that keeps failing."""
+
+
+@dataclass
+class RetryStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+
+
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` consecutive transient failures and rejects calls
+    for ``reset_after`` seconds, then lets one trial call through (half-open)
+    that either closes it again or re-opens it. A trial that never reports
+    back (e.g. cancelled) is replaced after another ``reset_after``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = DB_CIRCUIT_THRESHOLD,
+        reset_after: float = DB_CIRCUIT_RESET,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        if state == "half_open" and (
+            self._trial_at is None or now - self._trial_at >= self.reset_after
+        ):
+            self._trial_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_at = None
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"Circuit {self.name} opened after {self.failures} failures"
+                )
+            self.opened_at = time.monotonic()
+
+
+breakers: dict[str, CircuitBreaker] = {}
+retry_stats: dict[str, RetryStats] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    if name not in breakers:
+        breakers[name] = CircuitBreaker(name)
+    return breakers[name]
+
+
+def get_retry_stats(name: str) -> RetryStats:
+    if name not in retry_stats:
+        retry_stats[name] = RetryStats()
+    return retry_stats[name]
+
+
+def retry_metrics() -> dict[str, dict]:
+    """Retry counters and circuit state per dependency, e.g. for /metrics."""
+    return {
+        name: {**asdict(stats), "circuit": get_breaker(name).state}
+        for name, stats in retry_stats.items()
+    }
+
+
+def backoff_delay(attempt: int, delay: float, max_delay: float) -> float:
+    """Full jitter: a random wait up to the exponential backoff for ``attempt``."""
+    return random.uniform(0, min(max_delay, delay * 2**attempt))
+
+
+def async_retry(
+    name: str,
+    tries: int = DB_RETRY_TRIES,
+    delay: float = DB_RETRY_DELAY,
+    max_delay: float = DB_RETRY_MAX_DELAY,
+    retry_on: Callable[[BaseException], bool] = is_transient,
+):
     """
-    A decorator to retry a database operation on specified exceptions.
+    Retry an async function on transient errors with jittered exponential
+    backoff, behind the circuit breaker shared by every call site of ``name``.
+    Other errors are raised straight away and do not trip the breaker.
 
     Args:
-        tries (int): The maximum number of retry attempts.
-        delay (int): The initial delay in seconds between retries.
-        backoff (int): The multiplier for the delay between subsequent retries.
-        exceptions (tuple): A tuple of exception types to catch and trigger a retry.
+        name (str): The dependency, e.g. "store", used for the breaker and metrics.
+        tries (int): The maximum number of attempts.
+        delay (float): The base delay in seconds, doubled on every retry.
+        max_delay (float): The upper bound of a single delay.
+        retry_on (Callable): Decides whether an error is worth another try.
     """
 
     def decorator(func):
         @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            mtries, mdelay = tries, delay
-            while mtries > 1:
+        async def wrapper(*args, **kwargs):
+            breaker = get_breaker(name)
+            stats = get_retry_stats(name)
+            stats.calls += 1
+            for attempt in range(tries):
+                if not breaker.allow():
+                    stats.rejected += 1
+                    raise CircuitOpenError(f"{name} is unavailable, circuit is open")
                 try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    print(f"Caught exception: {e}. Retrying in {mdelay} seconds...")
-                    time.sleep(mdelay)
-                    mtries -= 1
-                    mdelay *= backoff
-            return func(*args, **kwargs)  # Last attempt without catching exceptions
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    if not retry_on(e):
+                        # The dependency answered, only this call was wrong
+                        breaker.record_success()
+                        raise
+                    breaker.record_failure()
+                    if attempt == tries - 1:
+                        stats.failures += 1
+                        raise
+                    stats.retries += 1
+                    wait = backoff_delay(attempt, delay, max_delay)
+                    logger.warning(
+                        f"{func.__qualname__} failed on attempt {attempt + 1}/{tries}, "
+                        f"retrying in {wait:.2f}s: {e}"
+                    )
+                    await asyncio.sleep(wait)
+                else:
+                    breaker.record_success()
+                    return result
 
         return wrapper
 
@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import AsyncIterable, List
 from langgraph.types import StreamMode
 from src.utils.messages import from_message_to_dict
 from langchain_core.messages import (
@@ -7,6 +8,7 @@ from langchain_core.messages import (
     BaseMessage,
     BaseMessageChunk,
 )
+from src.constants import SSE_FRAME_INTERVAL_MS, SSE_FRAME_MAX_BYTES, STREAM_FORMAT
 from src.utils.logger import logger
 
 
@@ -148,3 +150,234 @@ def handle_multi_mode(chunk: dict):
     except Exception as e:
         logger.error(f"Error in handle_multi_mode: {e}")
     return None
+
+
+###########################################################################
+## Lean Serialization
+###########################################################################
+FINISH_KEYS = ("finish_reason", "stop_reasoning", "stop_reason")
+
+# Run metadata clients read from each message event
+STREAM_METADATA_KEYS = (
+    "thread_id",
+    "assistant_id",
+    "checkpoint_ns",
+    "langgraph_node",
+    "langgraph_step",
+    "ls_provider",
+    "ls_model_name",
+    "ls_temperature",
+)
+
+
+def message_chunk_to_dict(msg: AIMessageChunk) -> dict:
+    data = {
+        "type": msg.type,
+        "id": msg.id,
+        "content": msg.content,
+        "response_metadata": {
+            key: msg.response_metadata[key]
+            for key in FINISH_KEYS
+            if msg.response_metadata.get(key)
+        },
+    }
+    if msg.tool_call_chunks:
+        data["tool_call_chunks"] = msg.tool_call_chunks
+    if msg.additional_kwargs.get("reasoning_content"):
+        data["additional_kwargs"] = {
+            "reasoning_content": msg.additional_kwargs["reasoning_content"]
+        }
+    if msg.usage_metadata:
+        data["usage_metadata"] = msg.usage_metadata
+    return data
+
+
+def tool_message_to_dict(msg: ToolMessage) -> dict:
+    return {
+        "type": msg.type,
+        "id": msg.id,
+        "content": msg.content,
+        # Clients read response_metadata on every message event
+        "response_metadata": {
+            key: msg.response_metadata[key]
+            for key in FINISH_KEYS
+            if msg.response_metadata.get(key)
+        },
+        "name": msg.name,
+        "tool_call_id": msg.tool_call_id,
+        "status": msg.status,
+    }
+
+
+class StreamSerializer:
+    """
+    Converts ``(mode, payload)`` chunks from ``agent.astream`` into JSON-ready
+    values. The ``delta`` format sends lean message chunks and, for ``values``,
+    only the messages and keys that changed since the previous step (plus the
+    ids of removed messages). The ``full`` format is ``handle_multi_mode``.
+    """
+
+    def __init__(self, format: str = STREAM_FORMAT):
+        self.format = format
+        self._messages: dict[str, BaseMessage] = {}
+        self._values: dict = {}
+
+    def __call__(self, chunk: tuple):
+        if self.format == "full":
+            return handle_multi_mode(chunk)
+        try:
+            mode, payload = chunk
+            if mode == "values":
+                return self._values_delta(payload)
+            if mode == "messages":
+                return self._message(payload)
+            logger.error(f"Invalid chunk: {chunk}")
+        except Exception as e:
+            logger.error(f"Error in StreamSerializer: {e}")
+        return None
+
+    def _message(self, payload: tuple):
+        msg, metadata = payload
+        metadata = {
+            key: metadata[key]
+            for key in STREAM_METADATA_KEYS
+            if key in (metadata or {})
+        } or None
+
+        if isinstance(msg, ToolMessage):
+            return ("messages", (tool_message_to_dict(msg), metadata))
+
+        if isinstance(msg, AIMessageChunk):
+            data = message_chunk_to_dict(msg)
+            content = msg.content or msg.additional_kwargs.get("reasoning_content")
+            if (
+                msg.tool_calls
+                or msg.tool_call_chunks
+                or data["response_metadata"]
+                or content
+            ):
+                return ("messages", (data, metadata))
+            return None
+
+        logger.error(f"Invalid message chunk: {msg}")
+        return None
+
+    def _values_delta(self, state: dict):
+        delta = {}
+        changed, seen = [], set()
+        for message in state.get("messages", []):
+            key = message.id or str(id(message))
+            seen.add(key)
+            # Messages kept by the reducer are the same objects between steps
+            if self._messages.get(key) is not message:
+                self._messages[key] = message
+                changed.append(message.model_dump())
+        removed = [key for key in self._messages if key not in seen]
+        for key in removed:
+            del self._messages[key]
+
+        if changed:
+            delta["messages"] = changed
+        if removed:
+            delta["removed"] = removed
+        for key, value in state.items():
+            if key == "messages":
+                continue
+            if key not in self._values or self._values[key] != value:
+                self._values[key] = value
+                delta[key] = value
+        return ("values", delta) if delta else None
+
+
+###########################################################################
+## Frame Coalescing
+###########################################################################
+class FrameCoalescer:
+    """
+    Groups SSE events into frames so a fast token stream reaches the socket in
+    a few writes instead of one per token. A frame is flushed once its first
+    event is ``interval_ms`` old or it holds ``max_bytes``. Events are kept
+    intact, so clients parse the same ``data:`` lines as before.
+
+    The source is drained by a single producer task so it keeps running in
+    one context for its whole life.
+    """
+
+    _END = object()
+
+    def __init__(
+        self,
+        events: AsyncIterable[str],
+        interval_ms: int = SSE_FRAME_INTERVAL_MS,
+        max_bytes: int = SSE_FRAME_MAX_BYTES,
+    ):
+        self.events = events
+        self.interval = interval_ms / 1000
+        self.max_bytes = max_bytes
+        self.event_count = 0
+        self.frame_count = 0
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        try:
+            async for event in self.events:
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(self._END)
+
+    def _frame(self, buffer: list[str]) -> str:
+        self.frame_count += 1
+        frame = "".join(buffer)
+        buffer.clear()
+        return frame
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._produce(queue))
+        buffer: list[str] = []
+        size = 0
+        deadline = None
+        error = None
+        try:
+            while True:
+                if not queue.empty():
+                    event = queue.get_nowait()
+                else:
+                    timeout = (
+                        None if deadline is None else max(deadline - loop.time(), 0)
+                    )
+                    try:
+                        event = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        # Time budget spent while waiting on the next event
+                        size, deadline = 0, None
+                        yield self._frame(buffer)
+                        continue
+
+                if event is self._END:
+                    break
+                if isinstance(event, Exception):
+                    error = event
+                    continue
+
+                self.event_count += 1
+                buffer.append(event)
+                size += len(event)
+                if deadline is None:
+                    deadline = loop.time() + self.interval
+                if size >= self.max_bytes or loop.time() >= deadline:
+                    size, deadline = 0, None
+                    yield self._frame(buffer)
+
+            if buffer:
+                yield self._frame(buffer)
+            if error:
+                raise error
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            logger.debug(
+                f"SSE stream closed: {self.event_count} events in {self.frame_count} frames"
+            )
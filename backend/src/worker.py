@@ -0,0 +1,56 @@
+"""
+Run queue worker, for executing queued runs outside the API process.
+
+    python -m src.worker --concurrency 4
+
+Set RUN_WORKERS=0 on the API to leave all runs to dedicated workers.
+"""
+
+import signal
+import asyncio
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.constants import RUN_WORKERS
+from src.services.db import SharedDB, get_checkpoint_db, get_store_db
+from src.services.mcp import mcp_service
+from src.services.run import RunWorkerPool
+from src.utils.a2a import aclose_http_client
+from src.utils.logger import logger
+
+
+async def main(concurrency: int) -> None:
+    async with (
+        get_checkpoint_db() as saver,
+        get_store_db() as store,
+    ):
+        SharedDB.store = store
+        SharedDB.checkpointer = saver
+
+        pool = RunWorkerPool(concurrency=concurrency)
+        pool.start()
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+
+        logger.info("Stopping run workers...")
+        await pool.stop()
+        await mcp_service.aclose()
+        await aclose_http_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Execute queued runs")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(RUN_WORKERS, 1),
+        help="Number of runs executed at once",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
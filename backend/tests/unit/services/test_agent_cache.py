@@ -0,0 +1,137 @@
+import unittest
+
+import httpx
+from langchain_core.language_models.fake_chat_models import (
+    FakeMessagesListChatModel,
+)
+from langchain_core.messages import AIMessage
+
+from src.flows import construct_agent, graph_builder
+from src.schemas.contexts import ContextSchema
+from src.schemas.entities import LLMRequest
+from src.services.agent_cache import AgentCache, agent_cache
+from src.utils import a2a
+
+
+class RecordingChatModel(FakeMessagesListChatModel):
+    seen: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, *args, **kwargs):
+        self.seen.append(messages)
+        return super()._generate(messages, *args, **kwargs)
+
+
+class TestAgentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AgentCache(max_size=2)
+
+    def test_make_key_is_order_independent(self):
+        key_a = AgentCache.make_key(model="openai:gpt-5-nano", tools=["a"], mcp={})
+        key_b = AgentCache.make_key(mcp={}, tools=["a"], model="openai:gpt-5-nano")
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, AgentCache.make_key(model="openai:gpt-5-nano"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", "graph_a")
+        self.cache.set("b", "graph_b")
+        self.cache.get("a")
+        self.cache.set("c", "graph_c")
+        self.assertEqual(self.cache.get("a"), "graph_a")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_invalidate_assistant(self):
+        self.cache.set("a", "graph_a", assistant_id="assistant")
+        self.cache.set("b", "graph_b")
+        self.assertEqual(self.cache.invalidate("assistant"), 1)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), "graph_b")
+
+
+class TestRuntimePrompt(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        agent_cache.clear()
+
+    def request(self, current_time: str) -> LLMRequest:
+        return LLMRequest(
+            system="You are a helpful assistant.",
+            messages=[{"role": "user", "content": "Hi"}],
+            metadata={"current_time": current_time, "timezone": "UTC"},
+        )
+
+    async def test_time_does_not_change_the_cache_key(self):
+        first = await construct_agent(self.request("2026-01-01T00:00:00Z"))
+        second = await construct_agent(self.request("2026-01-01T00:00:05Z"))
+        self.assertEqual(len(agent_cache), 1)
+        self.assertEqual(second.context["current_time"], "2026-01-01T00:00:05Z")
+        self.assertNotEqual(first.context, second.context)
+
+    async def test_time_is_applied_at_invocation(self):
+        for graph_id in ("react", "deepagent"):
+            model = RecordingChatModel(responses=[AIMessage("Hello")], seen=[])
+            graph = graph_builder(
+                tools=[],
+                model=model,
+                prompt="Base",
+                context_schema=ContextSchema,
+                graph_id=graph_id,
+            )
+            await graph.ainvoke(
+                {"messages": [("user", "Hi")]},
+                context={"current_time": "T1", "memories": "MEMORIES"},
+            )
+            system = model.seen[-1][0].content
+            self.assertIn("MEMORIES", system)
+            self.assertIn("CURRENT_TIME: T1", system)
+            self.assertNotIn("LANGUAGE", system)
+
+
+class TestA2ACacheKey(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        agent_cache.clear()
+        a2a._card_cache.clear()
+        self.available = False
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if not self.available:
+                return httpx.Response(503)
+            card = {
+                "name": "Currency Agent",
+                "url": "https://a2a.example.com",
+                "version": "1.0.0",
+                "capabilities": {},
+                "skills": [],
+            }
+            return httpx.Response(200, json=card)
+
+        a2a._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await a2a.aclose_http_client()
+
+    def request(self) -> LLMRequest:
+        return LLMRequest(
+            messages=[{"role": "user", "content": "Hi"}],
+            a2a={
+                "currency": {
+                    "base_url": "https://a2a.example.com",
+                    "agent_card_path": "/.well-known/agent.json",
+                }
+            },
+            metadata={},
+        )
+
+    async def test_graph_built_during_outage_is_not_reused(self):
+        first = await construct_agent(self.request())
+        self.assertNotIn("currency_agent", [tool.name for tool in first.tools])
+
+        self.available = True
+        second = await construct_agent(self.request())
+        self.assertIn("currency_agent", [tool.name for tool in second.tools])
+        self.assertEqual(len(agent_cache), 2)
+
+        await construct_agent(self.request())
+        self.assertEqual(len(agent_cache), 2)
@@ -0,0 +1,79 @@
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.schemas.models import ProtectedUser
+from src.services.auth_cache import AuthCache, auth_cache
+from src.utils import auth as auth_module
+from src.utils.auth import create_access_token, verify_credentials
+
+
+def protected_user(user_id: str = "1") -> ProtectedUser:
+    return ProtectedUser(
+        id=user_id,
+        username="ada",
+        email="ada@example.com",
+        name="Ada",
+        created_at=datetime(2025, 1, 1),
+    )
+
+
+class TestAuthCache(unittest.TestCase):
+    def test_expires_at_token_exp_or_ttl(self):
+        cache = AuthCache(ttl=60)
+        cache.set("expired", protected_user(), exp=time.time() - 1)
+        cache.set("valid", protected_user(), exp=time.time() + 3600)
+
+        self.assertIsNone(cache.get("expired"))
+        self.assertEqual(cache.get("valid").id, "1")
+        with patch.object(time, "time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get("valid"))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate_and_eviction(self):
+        cache = AuthCache(max_size=2)
+        exp = time.time() + 3600
+        cache.set("a", protected_user("1"), exp)
+        cache.set("b", protected_user("1"), exp)
+        cache.set("c", protected_user("2"), exp)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.invalidate("1"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_disabled(self):
+        cache = AuthCache(enabled=False)
+        cache.set("a", protected_user(), time.time() + 3600)
+        self.assertIsNone(cache.get("a"))
+
+
+class TestVerifyCredentials(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        auth_cache.clear()
+
+    async def test_user_is_looked_up_once_per_token(self):
+        user = SimpleNamespace(
+            id="1", username="ada", email="ada@example.com", name="Ada"
+        )
+        user.protected = lambda: protected_user()
+        repo = MagicMock()
+        repo.get_by_email = AsyncMock(return_value=user)
+        token = create_access_token(user)
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        with patch.object(auth_module, "UserRepo", return_value=repo):
+            for _ in range(3):
+                request = SimpleNamespace(state=SimpleNamespace())
+                result = await verify_credentials(request, credentials, db=None)
+                self.assertEqual(request.state.user.id, "1")
+            self.assertEqual(result.email, "ada@example.com")
+            repo.get_by_email.assert_awaited_once()
+
+            auth_cache.invalidate("1")
+            await verify_credentials(request, credentials, db=None)
+            self.assertEqual(repo.get_by_email.await_count, 2)
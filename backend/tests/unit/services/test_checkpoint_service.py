@@ -0,0 +1,138 @@
+import importlib
+import json
+import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.graph import START, MessagesState, StateGraph
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from src.repos.checkpoint_repo import CheckpointRepo
+from src.services import checkpoint as checkpoint_module
+from src.services.checkpoint import CheckpointService
+from src.services.db import get_checkpointer
+from src.utils.auth import verify_credentials
+
+# The package re-exports the router under the module's name
+thread_routes = importlib.import_module("src.routes.v0.thread")
+
+
+def reply(state: MessagesState) -> dict:
+    return {"messages": [AIMessage(content="hello")]}
+
+
+class TestCheckpointHistory(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.checkpointer = InMemorySaver()
+        builder = StateGraph(MessagesState)
+        builder.add_node("reply", reply)
+        builder.add_edge(START, "reply")
+        graph = builder.compile(checkpointer=self.checkpointer)
+        config = {"configurable": {"thread_id": "thread-1", "user_id": "user-1"}}
+        for _ in range(3):
+            await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        self.service = CheckpointService(
+            user_id="user-1", checkpointer=self.checkpointer
+        )
+
+    async def collect(self, service: CheckpointService, **kwargs) -> list[dict]:
+        return [
+            checkpoint async for checkpoint in service.history("thread-1", **kwargs)
+        ]
+
+    async def test_pages_with_before(self):
+        everything = await self.collect(self.service, limit=100)
+        first = await self.collect(self.service, limit=4)
+        before = first[-1]["config"]["configurable"]["checkpoint_id"]
+        rest = await self.collect(self.service, limit=100, before=before)
+
+        self.assertEqual(len(first), 4)
+        self.assertEqual(first + rest, everything)
+
+    async def test_metadata_only_leaves_out_messages(self):
+        full = await self.collect(self.service, limit=1)
+        lean = await self.collect(self.service, limit=1, metadata_only=True)
+
+        self.assertEqual(len(full[0]["values"]["messages"]), 6)
+        self.assertEqual(lean[0]["values"], {})
+        self.assertEqual(lean[0]["metadata"], full[0]["metadata"])
+
+    async def test_history_is_scoped_to_user(self):
+        other = CheckpointService(user_id="user-2", checkpointer=self.checkpointer)
+        self.assertEqual(await self.collect(other), [])
+
+
+class TestMetadataOnlyHistory(unittest.IsolatedAsyncioTestCase):
+    def test_query_reads_only_ids_and_metadata(self):
+        query = CheckpointRepo(None, "user-1").metadata_query("thread-1", 20, "cp-9")
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        self.assertNotIn("checkpoint_blobs", sql)
+        self.assertNotIn("checkpoint_writes", sql)
+        self.assertIn("checkpoints.checkpoint ->> ", sql)
+        self.assertIn("checkpoints.metadata @> ", sql)
+        self.assertIn("ORDER BY checkpoints.checkpoint_id DESC", sql)
+
+    async def test_postgres_history_uses_metadata_query(self):
+        row = {
+            "thread_id": "thread-1",
+            "checkpoint_ns": "",
+            "checkpoint_id": "cp-2",
+            "parent_checkpoint_id": "cp-1",
+            "metadata": {"user_id": "user-1", "step": 1},
+            "ts": "2026-01-01T00:00:00+00:00",
+        }
+        repo = MagicMock()
+        repo.list_metadata = AsyncMock(return_value=[row])
+
+        @asynccontextmanager
+        async def session():
+            yield None
+
+        checkpointer = MagicMock(spec=AsyncPostgresSaver)
+        service = CheckpointService(user_id="user-1", checkpointer=checkpointer)
+        with (
+            patch.object(checkpoint_module, "AsyncSessionLocal", session),
+            patch.object(checkpoint_module, "CheckpointRepo", return_value=repo),
+        ):
+            history = [
+                checkpoint
+                async for checkpoint in service.history(
+                    "thread-1", limit=5, metadata_only=True
+                )
+            ]
+
+        checkpointer.alist.assert_not_called()
+        repo.list_metadata.assert_awaited_once_with("thread-1", 5, None)
+        self.assertEqual(
+            history[0]["parent_config"]["configurable"]["checkpoint_id"], "cp-1"
+        )
+        self.assertEqual(history[0]["values"], {})
+        self.assertEqual(history[0]["created_at"], row["ts"])
+
+
+class TestHistoryRoute(unittest.TestCase):
+    def test_ndjson_error_ends_the_stream_with_an_error_line(self):
+        async def history(self, thread_id, **kwargs):
+            yield {"metadata": {"step": 1}}
+            raise RuntimeError("connection lost")
+
+        app = FastAPI()
+        app.include_router(thread_routes.router)
+        app.dependency_overrides[verify_credentials] = lambda: SimpleNamespace(id="1")
+        app.dependency_overrides[get_checkpointer] = lambda: None
+        with patch.object(CheckpointService, "history", history):
+            response = TestClient(app).get(
+                "/threads/thread-1/history", params={"format": "ndjson"}
+            )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            lines, [{"metadata": {"step": 1}}, {"error": "connection lost"}]
+        )
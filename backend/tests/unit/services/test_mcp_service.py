@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.schemas.entities.a2a import McpServer
+from src.services import mcp as mcp_module
+from src.services.mcp import McpService
+
+CONFIG = {"math": {"transport": "streamable_http", "url": "http://mcp/math"}}
+
+
+async def fake_run(self, ready: asyncio.Future) -> None:
+    ready.set_result([f"tool-{self.generation}"])
+    await self._stop.wait()
+
+
+class TestMcpLeases(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = patch.object(mcp_module.McpSession, "_run", fake_run)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = McpService(ttl=300)
+
+    async def asyncTearDown(self):
+        await self.service.aclose()
+
+    async def test_refresh_keeps_leased_session_open_until_released(self):
+        leased = await self.service.acquire(CONFIG)
+        (session,) = leased.values()
+
+        self.assertEqual(await self.service.refresh(), 1)
+        self.assertTrue(session.alive)
+        self.assertTrue(session.retired)
+
+        fresh = await self.service.acquire(CONFIG)
+        (replacement,) = fresh.values()
+        self.assertNotEqual(replacement.generation, session.generation)
+
+        await self.service.release(leased)
+        self.assertFalse(session.alive)
+        self.assertTrue(replacement.alive)
+        await self.service.release(fresh)
+
+    async def test_get_tools_reuses_acquired_sessions(self):
+        leased = await self.service.acquire(CONFIG)
+        (session,) = leased.values()
+        await self.service.refresh()
+
+        tools = await self.service.get_tools(CONFIG, leased)
+        self.assertEqual(tools, session.tools)
+        await self.service.release(leased)
+
+    async def test_unleased_session_closes_on_refresh(self):
+        await self.service.get_tools(CONFIG)
+        (session,) = self.service._sessions.values()
+        await self.service.refresh(CONFIG)
+        self.assertFalse(session.alive)
+
+    async def test_refresh_with_validated_config_matches_raw_config(self):
+        await self.service.get_tools(CONFIG)
+        (session,) = self.service._sessions.values()
+        # The refresh route validates its body through McpServer
+        config = {
+            name: McpServer(headers={}, **server).model_dump()
+            for name, server in CONFIG.items()
+        }
+        self.assertEqual(await self.service.refresh(config), 1)
+        self.assertFalse(session.alive)
+
+    async def test_refresh_without_config_is_scoped_to_user(self):
+        other = {"search": {"transport": "sse", "url": "http://mcp/search"}}
+        await self.service.release(await self.service.acquire(CONFIG, user_id="1"))
+        await self.service.release(await self.service.acquire(other, user_id="2"))
+
+        self.assertEqual(await self.service.refresh(user_id="1"), 1)
+        (session,) = self.service._sessions.values()
+        self.assertEqual(session.name, "search")
+        self.assertTrue(session.alive)
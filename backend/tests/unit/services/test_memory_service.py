@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+from langgraph.runtime import CONFIG_KEY_RUNTIME, Runtime
+from langgraph.store.memory import InMemoryStore
+
+from src.schemas.contexts import ContextSchema
+
+from src.services import memory as memory_module
+from src.services.db import SharedDB
+from src.services.memory import MemoryService
+from src.tools.memory import search_memory, upsert_memory
+
+
+class TestMemoryPromptContext(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        memory_module._contexts.clear()
+        self.store = InMemoryStore()
+        self.service = MemoryService(user_id="user-1", store=self.store)
+
+    def count_searches(self):
+        return patch.object(
+            MemoryService, "search", autospec=True, side_effect=MemoryService.search
+        )
+
+    async def test_context_is_memoized(self):
+        await self.service.set("m1", {"memory": "likes tea"})
+        with self.count_searches() as search:
+            first = await self.service.prompt_context()
+            second = await self.service.prompt_context()
+        self.assertIn("likes tea", first)
+        self.assertIs(first, second)
+        self.assertEqual(search.await_count, 1)
+
+    async def test_writes_update_cached_context(self):
+        await self.service.set("m1", {"memory": "likes tea"})
+        await self.service.prompt_context()
+        with self.count_searches() as search:
+            await self.service.set("m2", {"memory": "lives in Dallas"})
+            self.assertIn("lives in Dallas", await self.service.prompt_context())
+            await self.service.delete("m1")
+            context = await self.service.prompt_context()
+        self.assertNotIn("likes tea", context)
+        self.assertEqual(search.await_count, 0)
+
+    async def test_top_k_mode_limits_memories(self):
+        for i in range(10):
+            await self.service.set(f"m{i}", {"memory": f"note {i}"})
+        with patch.object(memory_module, "MEMORY_PROMPT_TOP_K", 3):
+            context = await self.service.prompt_context("notes", mode="top_k")
+        self.assertEqual(context.count("<memory>"), 3)
+
+    async def test_memories_are_scoped_per_user(self):
+        other = MemoryService(user_id="user-2", store=self.store)
+        await self.service.set("m1", {"memory": "likes tea"})
+        await other.set("m2", {"memory": "likes coffee"})
+        self.assertNotIn("coffee", await self.service.prompt_context())
+        self.assertNotIn("tea", await other.prompt_context())
+        self.assertEqual([item.key for item in await other.search("coffee")], ["m2"])
+
+
+def run_config(authenticated: str | None = None, **configurable) -> dict:
+    """Config as a graph run passes it to tools, with the server-set context."""
+    context = ContextSchema(user_id=authenticated) if authenticated else None
+    return {
+        "configurable": {CONFIG_KEY_RUNTIME: Runtime(context=context), **configurable}
+    }
+
+
+class TestMemoryTools(unittest.IsolatedAsyncioTestCase):
+    async def test_tools_use_the_authenticated_user(self):
+        store = InMemoryStore()
+        config = run_config("user-1")
+        with patch.object(SharedDB, "store", store):
+            await upsert_memory.ainvoke({"memory": "likes tea"}, config=config)
+            found = await search_memory.ainvoke({"query": "tea"}, config=config)
+            missing = await search_memory.ainvoke(
+                {"query": "tea"}, config=run_config("user-2")
+            )
+        self.assertIn("likes tea", found)
+        self.assertEqual(missing, "No memories found.")
+        self.assertEqual(len(await store.asearch(("memories", "user-1"))), 1)
+
+    async def test_client_metadata_cannot_select_the_user(self):
+        store = InMemoryStore()
+        await MemoryService(user_id="victim", store=store).set(
+            "m1", {"memory": "secret"}
+        )
+        with patch.object(SharedDB, "store", store):
+            found = await search_memory.ainvoke(
+                {"query": "secret"}, config=run_config(user_id="victim")
+            )
+        self.assertNotIn("secret", found)
+
+    def test_config_is_not_part_of_the_tool_schema(self):
+        self.assertEqual(list(search_memory.args), ["query"])
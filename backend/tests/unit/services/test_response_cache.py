@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta, timezone
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage
+from langgraph.store.memory import InMemoryStore
+
+from src.schemas.entities import LLMRequest
+from src.services.response_cache import ResponseCache
+
+
+class TopicEmbeddings(Embeddings):
+    """Texts about reports are identical, everything else is orthogonal."""
+
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0] if "report" in text.lower() else [0.0, 1.0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def request(content: str, **kwargs) -> LLMRequest:
+    return LLMRequest(messages=[{"role": "user", "content": content}], **kwargs)
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.store = InMemoryStore()
+        self.cache = ResponseCache("user-1", self.store, similarity=0)
+
+    async def test_exact_match_is_normalized(self):
+        await self.cache.set(request("Daily  report\n"), [AIMessage(content="Done")])
+
+        cached = await self.cache.get(request(" Daily report"))
+        self.assertEqual([m.content for m in cached], ["Done"])
+        self.assertIsNone(await self.cache.get(request("Weekly report")))
+        self.assertIsNone(
+            await self.cache.get(request("Daily report", system="Be brief."))
+        )
+        self.assertIsNone(
+            await ResponseCache("user-2", self.store, similarity=0).get(
+                request("Daily report")
+            )
+        )
+
+    async def test_expired_entries_are_ignored(self):
+        await self.cache.set(request("Daily report"), [AIMessage(content="Done")])
+        key, _, _ = ResponseCache.keys(request("Daily report"))
+        item = self.store._data[self.cache.namespace][key]
+        item.updated_at = datetime.now(timezone.utc) - timedelta(
+            seconds=self.cache.ttl + 1
+        )
+
+        self.assertIsNone(await self.cache.get(request("Daily report")))
+
+    async def test_similar_last_message_in_same_context(self):
+        store = InMemoryStore(index={"embed": TopicEmbeddings(), "dims": 2})
+        cache = ResponseCache("user-1", store, similarity=0.9)
+        await cache.set(request("Daily report"), [AIMessage(content="Done")])
+
+        self.assertIsNotNone(await cache.get(request("Send me the report")))
+        self.assertIsNone(await cache.get(request("What is the weather?")))
+        self.assertIsNone(
+            await cache.get(request("Send me the report", model="openai:gpt-5"))
+        )
+
+    async def test_entries_are_written_with_a_store_ttl(self):
+        store = MagicMock(supports_ttl=True)
+        store.aput = AsyncMock()
+        cache = ResponseCache("user-1", store, ttl=3600, similarity=0)
+        await cache.set(request("Daily report"), [AIMessage(content="Done")])
+        self.assertEqual(store.aput.await_args.kwargs["ttl"], 60)
+
+    def test_applies_only_to_opted_in_new_threads(self):
+        def new_thread(**kwargs):
+            return request("Hi", metadata={}, **kwargs)
+
+        self.assertIsInstance(
+            ResponseCache.for_request(new_thread(cache=True), "user-1", self.store),
+            ResponseCache,
+        )
+        self.assertIsNone(ResponseCache.for_request(new_thread(), "user-1", self.store))
+        self.assertIsNone(
+            ResponseCache.for_request(new_thread(cache=True), None, self.store)
+        )
+        on_thread = request("Hi", cache=True, metadata={"thread_id": "t-1"})
+        self.assertIsNone(ResponseCache.for_request(on_thread, "user-1", self.store))
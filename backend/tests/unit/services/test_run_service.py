@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.schemas.models import RunStatus
+from src.services import run as run_module
+
+
+class FakeRunRepo:
+    """In-memory stand-in for RunRepo sharing one queue across sessions."""
+
+    queue: list = []
+    finished: dict = {}
+    requeued: list = []
+
+    def __init__(self, db, user_id=None):
+        pass
+
+    async def claim(self, worker_id, stale_after, max_attempts):
+        return self.queue.pop(0) if self.queue else None
+
+    async def expire_stale(self, stale_after, max_attempts):
+        return 0
+
+    async def finish(self, run_id, status, worker_id, attempt, result=None, error=None):
+        self.finished[run_id] = (status, result, error)
+        return True
+
+    async def requeue(self, run_id, worker_id, attempt):
+        self.requeued.append(run_id)
+        return True
+
+
+@asynccontextmanager
+async def fake_session():
+    yield None
+
+
+def make_run(run_id: str) -> SimpleNamespace:
+    payload = {"messages": [{"role": "user", "content": "hi"}]}
+    return SimpleNamespace(id=run_id, user_id="user-1", payload=payload, attempts=1)
+
+
+class TestRunWorkerPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        FakeRunRepo.queue = [make_run(f"run-{i}") for i in range(6)]
+        FakeRunRepo.finished = {}
+        FakeRunRepo.requeued = []
+        patches = [
+            patch.object(run_module, "RunRepo", FakeRunRepo),
+            patch.object(run_module, "AsyncSessionLocal", fake_session),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def wait_for(self, condition, timeout: float = 2):
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
+
+    async def test_workers_run_queued_invocations_concurrently(self):
+        running, peak = 0, 0
+
+        async def llm_invoke(params, user_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return {"messages": [], "user_id": user_id}
+
+        pool = run_module.RunWorkerPool(concurrency=3, poll_interval=0.01)
+        with patch("src.controllers.llm.llm_invoke", llm_invoke):
+            pool.start()
+            await self.wait_for(lambda: len(FakeRunRepo.finished) == 6)
+            await pool.stop()
+
+        self.assertEqual(peak, 3)
+        status, result, _ = FakeRunRepo.finished["run-0"]
+        self.assertEqual(status, RunStatus.SUCCEEDED)
+        self.assertEqual(result["user_id"], "user-1")
+
+    async def test_failed_invocation_is_recorded(self):
+        async def llm_invoke(params, user_id):
+            raise RuntimeError("model unavailable")
+
+        pool = run_module.RunWorkerPool(concurrency=1, poll_interval=0.01)
+        with patch("src.controllers.llm.llm_invoke", llm_invoke):
+            pool.start()
+            await self.wait_for(lambda: len(FakeRunRepo.finished) == 6)
+            await pool.stop()
+
+        self.assertEqual(
+            FakeRunRepo.finished["run-0"],
+            (RunStatus.FAILED, None, "model unavailable"),
+        )
+
+    async def test_stop_returns_in_flight_runs_to_queue(self):
+        started = asyncio.Event()
+
+        async def llm_invoke(params, user_id):
+            started.set()
+            await asyncio.sleep(10)
+
+        FakeRunRepo.queue = FakeRunRepo.queue[:1]
+        pool = run_module.RunWorkerPool(concurrency=1, poll_interval=0.01)
+        with patch("src.controllers.llm.llm_invoke", llm_invoke):
+            pool.start()
+            await started.wait()
+            await pool.stop()
+
+        self.assertEqual(FakeRunRepo.requeued, ["run-0"])
+        self.assertEqual(FakeRunRepo.finished, {})
+
+    async def test_run_is_failed_when_it_outlives_the_timeout(self):
+        async def llm_invoke(params, user_id):
+            await asyncio.sleep(10)
+
+        FakeRunRepo.queue = FakeRunRepo.queue[:1]
+        pool = run_module.RunWorkerPool(concurrency=1, poll_interval=0.01, timeout=0.05)
+        with patch("src.controllers.llm.llm_invoke", llm_invoke):
+            pool.start()
+            await self.wait_for(lambda: len(FakeRunRepo.finished) == 1)
+            await pool.stop()
+
+        self.assertEqual(
+            FakeRunRepo.finished["run-0"], (RunStatus.FAILED, None, "Run timed out")
+        )
+        self.assertEqual(FakeRunRepo.requeued, [])
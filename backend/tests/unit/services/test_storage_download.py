@@ -0,0 +1,100 @@
+import importlib
+import unittest
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from minio.error import S3Error
+
+from src.utils.auth import verify_credentials
+
+# The package re-exports the router under the module's name
+storage_routes = importlib.import_module("src.routes.v0.storage")
+
+CONTENT = b"0123456789" * 100
+
+
+class FakeResponse:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.released = False
+
+    def stream(self, amt):
+        for i in range(0, len(self.data), amt):
+            yield self.data[i : i + amt]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeMinio:
+    def __init__(self):
+        self.responses = []
+
+    def stat_object(self, bucket, object_name):
+        if object_name != "users/1/pdf/report.pdf":
+            raise S3Error(None, "NoSuchKey", "missing", object_name, "req", "host")
+        return SimpleNamespace(
+            size=len(CONTENT), etag="abc", content_type="application/pdf"
+        )
+
+    def get_object(self, bucket, object_name, offset=0, length=0):
+        end = offset + length if length else None
+        response = FakeResponse(CONTENT[offset:end])
+        self.responses.append(response)
+        return response
+
+
+class TestDownloadFile(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(storage_routes.router)
+        app.dependency_overrides[verify_credentials] = lambda: SimpleNamespace(id="1")
+        self.minio = FakeMinio()
+        self._client = storage_routes.storage_service.client
+        storage_routes.storage_service.client = self.minio
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        storage_routes.storage_service.client = self._client
+
+    def get(self, headers=None, path="pdf/report.pdf"):
+        return self.client.get(
+            "/storage/download", params={"path": path}, headers=headers
+        )
+
+    def test_full_download(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, CONTENT)
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        self.assertEqual(response.headers["content-type"], "application/pdf")
+        self.assertTrue(self.minio.responses[0].released)
+
+    def test_ranges(self):
+        response = self.get({"Range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, CONTENT[10:20])
+        self.assertEqual(response.headers["content-range"], "bytes 10-19/1000")
+
+        response = self.get({"Range": "bytes=-5"})
+        self.assertEqual(response.content, CONTENT[-5:])
+        response = self.get({"Range": "bytes=995-"})
+        self.assertEqual(response.headers["content-range"], "bytes 995-999/1000")
+
+        response = self.get({"Range": "bytes=2000-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["content-range"], "bytes */1000")
+
+    def test_if_none_match(self):
+        response = self.get({"If-None-Match": '"xyz", "abc"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.minio.responses, [])
+
+    def test_missing_and_invalid_paths(self):
+        self.assertEqual(self.get(path="missing.pdf").status_code, 404)
+        self.assertEqual(self.get(path="../2/secret.pdf").status_code, 400)
@@ -0,0 +1,78 @@
+import asyncio
+import io
+import threading
+import time
+import unittest
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from src.services.storage import StorageService
+
+
+class FakeMinio:
+    def __init__(self):
+        self.objects = {}
+        self.threads = set()
+
+    def put_object(self, bucket, object_name, data, length, **kwargs):
+        # A blocking call, as in the real client
+        time.sleep(0.05)
+        self.threads.add(threading.current_thread().name)
+        self.objects[object_name] = (data.read(), length, kwargs)
+
+
+def upload(name: str, content: bytes) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename=name,
+        headers=Headers({"content-type": "text/plain"}),
+    )
+
+
+class TestStorageService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = StorageService("key", "secret", minio_server="localhost:9000")
+        self.service.client = FakeMinio()
+
+    async def test_uploads_run_off_the_event_loop(self):
+        files = [upload(f"{i}.txt", b"hello") for i in range(4)]
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        result = await self.service.upload_files(files, "bucket", prefix="users/1")
+        task.cancel()
+
+        self.assertEqual(
+            [r["filename"] for r in result], [f"{i}.txt" for i in range(4)]
+        )
+        self.assertEqual(
+            sorted(self.service.client.objects),
+            [f"users/1/txt/{i}.txt" for i in range(4)],
+        )
+        data, length, kwargs = self.service.client.objects["users/1/txt/0.txt"]
+        self.assertEqual(
+            (data, length, kwargs["content_type"]), (b"hello", 5, "text/plain")
+        )
+        self.assertTrue(
+            all(name.startswith("storage") for name in self.service.client.threads)
+        )
+        # The loop kept running while the uploads blocked their threads
+        self.assertGreater(ticks, 2)
+
+    async def test_upload_errors_are_raised(self):
+        from minio.error import S3Error
+
+        def put_object(*args, **kwargs):
+            raise S3Error(None, "NoSuchBucket", "missing", "bucket", "req", "host")
+
+        self.service.client.put_object = put_object
+        with self.assertRaises(ValueError):
+            await self.service.upload_files([upload("a.txt", b"x")], "bucket")
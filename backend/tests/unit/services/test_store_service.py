@@ -0,0 +1,64 @@
+import unittest
+
+from fastapi import HTTPException
+from langgraph.store.memory import InMemoryStore
+
+from src.services.store import paginate
+from src.services.thread import ThreadService
+
+
+class TestPaginate(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.store = InMemoryStore()
+        for i in range(7):
+            await self.store.aput(("threads", "user-1"), f"thread-{i}", {"i": i})
+        await self.store.aput(
+            ("threads", "user-1", "assistant-1"), "thread-7", {"i": 7}
+        )
+        await self.store.aput(("threads", "user-2"), "thread-8", {"i": 8})
+
+    async def test_pages_cover_namespace_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            items, cursor = await paginate(
+                self.store, ("threads", "user-1"), limit=3, cursor=cursor
+            )
+            seen.extend(item.value["i"] for item in items)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [7, 6, 5, 4, 3, 2, 1, 0])
+
+    async def test_last_page_has_no_cursor(self):
+        items, cursor = await paginate(self.store, ("threads", "user-2"), limit=3)
+        self.assertEqual([item.key for item in items], ["thread-8"])
+        self.assertIsNone(cursor)
+
+    async def test_items_updated_between_pages_are_not_repeated(self):
+        items, cursor = await paginate(self.store, ("threads", "user-1"), limit=4)
+        await self.store.aput(("threads", "user-1"), items[0].key, {"i": 0})
+
+        rest, _ = await paginate(
+            self.store, ("threads", "user-1"), limit=10, cursor=cursor
+        )
+        keys = [item.key for item in rest]
+        self.assertEqual(len(keys), 4)
+        self.assertNotIn(items[0].key, keys)
+
+    async def test_invalid_cursor(self):
+        with self.assertRaises(HTTPException) as ctx:
+            await paginate(self.store, ("threads", "user-1"), cursor="not-a-cursor")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    async def test_thread_service_search(self):
+        thread_service = ThreadService(user_id="user-1", store=self.store)
+
+        threads, cursor = await thread_service.search(limit=5)
+        self.assertEqual(len(threads), 5)
+        self.assertIsNotNone(cursor)
+
+        threads, cursor = await thread_service.search(
+            limit=5, filter={"assistant_id": "assistant-1"}
+        )
+        self.assertEqual([t["key"] for t in threads], ["thread-7"])
+        self.assertIsNone(cursor)
@@ -0,0 +1,118 @@
+import asyncio
+import importlib
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services.db import get_checkpointer, get_store
+from src.services.stream import RunStream, StreamService
+from src.utils.auth import get_optional_user
+from src.utils.rate_limit import MemoryBucketStorage, limiter
+
+# The package re-exports the router under the module's name
+llm_routes = importlib.import_module("src.routes.v0.llm")
+
+
+async def events(count: int, delay: float = 0):
+    for i in range(count):
+        await asyncio.sleep(delay)
+        yield f'["messages", {i}]'
+
+
+async def collect(stream) -> list[str]:
+    return [event async for event in stream]
+
+
+class TestRunStream(unittest.IsolatedAsyncioTestCase):
+    async def test_events_have_increasing_ids(self):
+        run = RunStream("run-1").start(events(3))
+        received = await collect(run.subscribe())
+        self.assertEqual(
+            received,
+            [f'id: {i + 1}\ndata: ["messages", {i}]\n\n' for i in range(3)],
+        )
+
+    async def test_resume_after_last_event_id(self):
+        run = RunStream("run-1").start(events(5))
+        received = await collect(run.subscribe(last_event_id=3))
+        self.assertEqual(
+            [event.split("\n")[0] for event in received], ["id: 4", "id: 5"]
+        )
+
+    async def test_run_continues_after_subscriber_leaves(self):
+        run = RunStream("run-1").start(events(20, delay=0.001))
+        subscription = run.subscribe()
+        await anext(subscription)
+        await subscription.aclose()
+        received = await collect(run.subscribe(last_event_id=1))
+        self.assertTrue(run.done)
+        self.assertEqual(len(received), 19)
+
+    async def test_buffer_is_bounded(self):
+        run = RunStream("run-1", max_events=4).start(events(10))
+        await collect(run.subscribe(last_event_id=10))
+        received = await collect(run.subscribe())
+        self.assertEqual(received[0].split("\n")[0], "id: 7")
+        self.assertEqual(len(received), 4)
+
+    async def test_concurrent_subscribers(self):
+        run = RunStream("run-1").start(events(10, delay=0.001))
+        results = await asyncio.gather(*(collect(run.subscribe()) for _ in range(5)))
+        self.assertTrue(all(len(result) == 10 for result in results))
+
+    async def test_failed_run_publishes_error(self):
+        async def failing():
+            yield '["messages", 0]'
+            raise RuntimeError("boom")
+
+        run = RunStream("run-1").start(failing())
+        received = await collect(run.subscribe())
+        self.assertEqual(received[-1], 'id: 2\ndata: ["error","boom"]\n\n')
+
+    async def test_cancel_ends_stream(self):
+        run = RunStream("run-1").start(events(1000, delay=0.01))
+        await asyncio.sleep(0.02)
+        run.cancel()
+        await collect(run.subscribe())
+        self.assertTrue(run.done)
+
+
+class TestStreamService(unittest.IsolatedAsyncioTestCase):
+    async def test_finished_runs_expire(self):
+        service = StreamService(retention=0)
+        run = service.create("user-1").start(events(1))
+        await collect(run.subscribe())
+        self.assertIs(service.get(run.run_id), run)
+        await asyncio.sleep(0.01)
+        service.create()
+        self.assertIsNone(service.get(run.run_id))
+
+
+class TestLlmStream(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(llm_routes.llm_router)
+        app.dependency_overrides[get_optional_user] = lambda: None
+        app.dependency_overrides[get_store] = lambda: None
+        app.dependency_overrides[get_checkpointer] = lambda: None
+        for patcher in (
+            patch.object(limiter, "storage", MemoryBucketStorage()),
+            patch.object(llm_routes, "stream_service", StreamService()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_construct_agent_error_is_streamed(self):
+        async def construct_agent(*args, **kwargs):
+            raise ValueError("Unknown model")
+
+        with patch.object(llm_routes, "construct_agent", construct_agent):
+            response = self.client.post(
+                "/llm/stream",
+                json={"messages": [{"role": "user", "content": "Hi"}], "metadata": {}},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, 'id: 1\ndata: ["error","Unknown model"]\n\n')
@@ -0,0 +1,33 @@
+import asyncio
+import unittest
+from uuid import uuid4
+
+from langgraph.store.memory import InMemoryStore
+
+from src.services.thread import ThreadService
+from src.utils.format import get_time
+
+
+class TestThreadServiceConcurrency(unittest.IsolatedAsyncioTestCase):
+    async def test_no_cross_user_leakage_under_parallel_load(self):
+        store = InMemoryStore()
+        user_ids = [str(uuid4()) for _ in range(100)]
+
+        async def run(user_id: str) -> list[dict]:
+            thread_service = ThreadService(user_id=user_id, store=store)
+            for i in range(3):
+                thread_id = f"{user_id}-{i}"
+                await thread_service.update(
+                    thread_id,
+                    {"thread_id": thread_id, "user": user_id, "updated_at": get_time()},
+                )
+                # Yield so other users' requests interleave with this one
+                await asyncio.sleep(0)
+            threads, _ = await thread_service.search()
+            return threads
+
+        results = await asyncio.gather(*(run(user_id) for user_id in user_ids))
+
+        for user_id, threads in zip(user_ids, results):
+            self.assertEqual(len(threads), 3)
+            self.assertTrue(all(t["value"]["user"] == user_id for t in threads))
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.services import usage as usage_module
+from src.services.usage import UsageTracker
+
+
+def reply(input_tokens: int, output_tokens: int) -> AIMessage:
+    return AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+
+
+class TestUsageTracker(unittest.IsolatedAsyncioTestCase):
+    async def test_sums_usage_per_model_and_saves_once(self):
+        model = GenericFakeChatModel(messages=iter([reply(10, 2), reply(20, 5)]))
+
+        async def agent(query: str):
+            await model.ainvoke(query)
+            return await model.ainvoke(query)
+
+        tracker = UsageTracker("user-1", assistant_id="a-1", thread_id="t-1")
+        repo = MagicMock()
+        repo.create_many = AsyncMock()
+        with (
+            patch.object(usage_module, "AsyncSessionLocal", MagicMock()),
+            patch.object(usage_module, "UsageRepo", return_value=repo),
+        ):
+            await RunnableLambda(agent).ainvoke("hi", config={"callbacks": [tracker]})
+
+        repo.create_many.assert_awaited_once()
+        (rows,) = repo.create_many.await_args.args
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            {k: v for k, v in rows[0].items() if k != "model"},
+            {
+                "user_id": "user-1",
+                "assistant_id": "a-1",
+                "thread_id": "t-1",
+                "calls": 2,
+                "input_tokens": 30,
+                "output_tokens": 7,
+                "total_tokens": 37,
+            },
+        )
+        self.assertEqual(tracker.usage, {})
+
+    async def test_save_errors_are_logged(self):
+        tracker = UsageTracker("user-1")
+        tracker.usage = {"openai:gpt": {"calls": 1, "total_tokens": 3}}
+        with patch.object(
+            usage_module, "AsyncSessionLocal", side_effect=ConnectionError()
+        ):
+            await tracker.save()
+        self.assertEqual(tracker.usage, {})
+
+
+class TestUsageOwner(unittest.TestCase):
+    def test_usage_is_recorded_for_the_authenticated_user_only(self):
+        from src.flows import init_config
+        from src.schemas.entities import LLMRequest
+
+        params = LLMRequest(
+            messages=[{"role": "user", "content": "hi"}],
+            metadata={"user_id": "victim"},
+        )
+        trackers = lambda config: [
+            callback.user_id
+            for callback in config["callbacks"]
+            if isinstance(callback, UsageTracker)
+        ]
+        self.assertEqual(trackers(init_config(params)), [])
+        self.assertEqual(trackers(init_config(params, user_id="1")), ["1"])
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from src.utils import a2a
+
+CARD = {
+    "name": "Currency Agent",
+    "url": "https://a2a.example.com",
+    "version": "1.0.0",
+    "capabilities": {},
+    "skills": [],
+}
+
+
+class TestA2ACardResolver(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests: list[httpx.Request] = []
+        a2a._card_cache.clear()
+        a2a._card_fetches.clear()
+
+    def use_transport(self, handler):
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        a2a._http_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    async def test_cached_card_is_reused(self):
+        self.use_transport(lambda request: httpx.Response(200, json=CARD))
+        resolver = a2a.A2ACardResolver("https://a2a.example.com")
+        first = await resolver.aget_agent_card()
+        second = await resolver.aget_agent_card()
+        self.assertEqual(first.name, "Currency Agent")
+        self.assertIs(first, second)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(a2a._card_fetches, {})
+
+    async def test_stale_card_is_revalidated_with_etag(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200, json=CARD, headers={"etag": '"v1"', "cache-control": "max-age=0"}
+            )
+
+        self.use_transport(handler)
+        resolver = a2a.A2ACardResolver("https://a2a.example.com")
+        first = await resolver.aget_agent_card()
+        second = await resolver.aget_agent_card()
+        self.assertIs(first, second)
+        self.assertEqual(self.requests[1].headers["if-none-match"], '"v1"')
+
+    async def test_resolve_agent_cards_isolates_failures(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "broken.example.com":
+                return httpx.Response(500)
+            return httpx.Response(200, json=CARD)
+
+        self.use_transport(handler)
+        cards = await a2a.resolve_agent_cards(
+            [
+                ("https://a2a.example.com", "/.well-known/agent.json"),
+                ("https://broken.example.com", "/.well-known/agent.json"),
+            ]
+        )
+        self.assertEqual(cards[0].name, "Currency Agent")
+        self.assertIsInstance(cards[1], httpx.HTTPStatusError)
+
+
+def status_event(task_id: str, state: str, final: bool = False) -> str:
+    result = {"id": task_id, "status": {"state": state}, "final": final}
+    return f"data: {json.dumps({'jsonrpc': '2.0', 'result': result})}\n\n"
+
+
+class TestA2AClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            task_id = json.loads(request.content)["params"]["id"]
+            if request.headers.get("accept") == "text/event-stream":
+                body = status_event(task_id, "working") + status_event(
+                    task_id, "completed", final=True
+                )
+                return httpx.Response(
+                    200, text=body, headers={"content-type": "text/event-stream"}
+                )
+            result = {"id": task_id, "status": {"state": "completed"}}
+            return httpx.Response(200, json={"jsonrpc": "2.0", "result": result})
+
+        a2a._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await a2a.aclose_http_client()
+
+    def payload(self, task_id: str) -> dict:
+        return {
+            "id": task_id,
+            "sessionId": task_id,
+            "message": {"role": "user", "parts": [{"type": "text", "text": "hi"}]},
+        }
+
+    async def test_requests_share_one_client(self):
+        client = a2a.get_http_client()
+        response = await a2a.A2AClient(url="https://a2a.example.com").send_task(
+            self.payload("task-1")
+        )
+        self.assertEqual(response.result.status.state, "completed")
+        self.assertIs(a2a.get_http_client(), client)
+        self.assertFalse(client.is_closed)
+
+    async def test_concurrent_streams(self):
+        client = a2a.A2AClient(url="https://a2a.example.com")
+
+        async def collect(task_id: str) -> list[str]:
+            return [
+                chunk.result.status.state
+                async for chunk in client.send_task_streaming(self.payload(task_id))
+            ]
+
+        results = await asyncio.gather(*(collect(f"task-{i}") for i in range(10)))
+        self.assertEqual(results, [["working", "completed"]] * 10)
+        self.assertEqual(len(self.requests), 10)
@@ -0,0 +1,64 @@
+import os
+import queue
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.utils import logger as logger_module
+from src.utils.logger import BufferedFileWriter, parse_sampling, should_log, truncate
+
+
+class TestRequestLogSampling(unittest.TestCase):
+    def test_parse_sampling(self):
+        self.assertEqual(
+            parse_sampling(" /api/health=0.1, /api/metrics=0 ,"),
+            {"/api/health": 0.1, "/api/metrics": 0.0},
+        )
+
+    def test_should_log_per_route(self):
+        rates = {"/api/metrics": 0.0, "/api/health": 0.5}
+        with patch.object(logger_module, "_sample_rates", rates):
+            self.assertFalse(should_log("/api/metrics"))
+            self.assertTrue(should_log("/api/threads/{thread_id}"))
+            with patch.object(logger_module.random, "random", return_value=0.4):
+                self.assertTrue(should_log("/api/health"))
+            with patch.object(logger_module.random, "random", return_value=0.6):
+                self.assertFalse(should_log("/api/health"))
+
+
+class TestTruncate(unittest.TestCase):
+    def test_short_values_are_kept(self):
+        self.assertEqual(truncate({"a": 1}, limit=20), "{'a': 1}")
+
+    def test_long_values_are_cut(self):
+        self.assertEqual(
+            truncate("x" * 15, limit=10), "xxxxxxxxxx... [5 more characters]"
+        )
+
+
+class TestBufferedFileWriter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "logs", "stream.log")
+
+    def test_writes_lines_in_order(self):
+        writer = BufferedFileWriter(self.path)
+        for i in range(3):
+            writer.write(f"line {i}")
+        writer.close()
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "line 0\nline 1\nline 2\n")
+
+    def test_open_failure_is_raised_to_the_caller(self):
+        blocker = os.path.join(self.dir.name, "file")
+        open(blocker, "w").close()
+        with self.assertRaises(OSError):
+            BufferedFileWriter(os.path.join(blocker, "stream.log"))
+
+    def test_full_queue_drops_lines(self):
+        writer = BufferedFileWriter(self.path, maxsize=2)
+        with patch.object(writer._queue, "put_nowait", side_effect=queue.Full):
+            writer.write("dropped")
+        self.assertEqual(writer.dropped, 1)
+        writer.close()
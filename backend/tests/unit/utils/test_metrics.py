@@ -0,0 +1,90 @@
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.tools import tool
+
+from src.routes.v0.metrics import router
+from src.utils.metrics import (
+    Histogram,
+    MetricsCallbackHandler,
+    Registry,
+    TOOL_CALL_SECONDS,
+    STREAM_CHUNKS,
+    TIME_TO_FIRST_TOKEN_SECONDS,
+    instrument_stream,
+)
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+class TestHistogram(unittest.TestCase):
+    def test_render(self):
+        registry = Registry()
+        histogram = registry.register(
+            Histogram("job_seconds", "Job latency.", ("job",), buckets=(0.1, 1))
+        )
+        histogram.observe(0.05, job="a")
+        histogram.observe(0.5, job="a")
+        histogram.observe(5, job='b"c')
+
+        text = registry.render()
+        self.assertIn("# TYPE job_seconds histogram", text)
+        self.assertIn('job_seconds_bucket{job="a",le="0.1"} 1', text)
+        self.assertIn('job_seconds_bucket{job="a",le="1"} 2', text)
+        self.assertIn('job_seconds_bucket{job="a",le="+Inf"} 2', text)
+        self.assertIn('job_seconds_count{job="a"} 2', text)
+        self.assertIn('job_seconds_bucket{job="b\\"c",le="1"} 0', text)
+
+    def test_time_observes_on_error(self):
+        histogram = Histogram("op_seconds", "Op latency.")
+        with self.assertRaises(ValueError):
+            with histogram.time():
+                raise ValueError()
+        self.assertIn("op_seconds_count 1", "\n".join(histogram.collect()))
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def test_instrument_stream(self):
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        received = [event async for event in instrument_stream(events(), "test-model")]
+
+        self.assertEqual(len(received), 3)
+        chunks = "\n".join(STREAM_CHUNKS.collect())
+        self.assertIn('sse_chunks_per_stream_sum{model="test-model"} 3', chunks)
+        ttft = "\n".join(TIME_TO_FIRST_TOKEN_SECONDS.collect())
+        self.assertIn(
+            'agent_time_to_first_token_seconds_count{model="test-model"} 1', ttft
+        )
+
+    async def test_tool_calls_are_timed(self):
+        await add.ainvoke(
+            {"a": 1, "b": 2}, config={"callbacks": [MetricsCallbackHandler()]}
+        )
+
+        text = "\n".join(TOOL_CALL_SECONDS.collect())
+        self.assertIn(
+            'agent_tool_call_duration_seconds_count{tool="add",status="ok"}', text
+        )
+
+
+class TestMetricsRoute(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn(
+            "# TYPE agent_model_call_duration_seconds histogram", response.text
+        )
+        self.assertIn("# TYPE db_pool_connections gauge", response.text)
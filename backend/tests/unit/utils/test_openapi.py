@@ -0,0 +1,139 @@
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+
+import src.constants
+from src.utils import openapi
+from src.utils.openapi import (
+    VENDORED_LANGCONNECT_SPEC,
+    load_openapi_spec,
+    missing_from_openapi_spec,
+    refresh_openapi_spec,
+)
+
+
+def vendored_spec(**overrides) -> dict:
+    with open(VENDORED_LANGCONNECT_SPEC) as f:
+        return {**json.load(f), **overrides}
+
+
+class RecordingDict(dict):
+    """Records every key path read from a nested dict."""
+
+    def __init__(self, data: dict, read: set, path: tuple = ()):
+        super().__init__(data)
+        self.read = read
+        self.path = path
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        self.read.add(self.path + (key,))
+        if isinstance(value, dict):
+            return RecordingDict(value, self.read, self.path + (key,))
+        return value
+
+
+class TestLoadOpenAPISpec(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.dir.name, "spec.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_falls_back_to_vendored_spec(self):
+        spec = load_openapi_spec(self.cache_path)
+        self.assertIn("/collections", spec["paths"])
+
+        with open(self.cache_path, "w") as f:
+            f.write("{not json")
+        self.assertIn("/collections", load_openapi_spec(self.cache_path)["paths"])
+
+    def test_prefers_cached_spec(self):
+        cached = vendored_spec(info={"title": "cached"})
+        with open(self.cache_path, "w") as f:
+            json.dump(cached, f)
+        self.assertEqual(load_openapi_spec(self.cache_path), cached)
+
+    def test_ignores_cached_spec_missing_gateway_entries(self):
+        cached = vendored_spec(info={"title": "cached"})
+        del cached["paths"]["/collections/{collection_id}/documents/search"]
+        with open(self.cache_path, "w") as f:
+            json.dump(cached, f)
+        self.assertEqual(load_openapi_spec(self.cache_path), vendored_spec())
+
+    def test_vendored_spec_is_complete(self):
+        self.assertEqual(missing_from_openapi_spec(vendored_spec()), [])
+        broken = vendored_spec(components={"schemas": {}})
+        self.assertIn("schema SearchQuery", missing_from_openapi_spec(broken))
+        self.assertEqual(missing_from_openapi_spec([]), ["spec"])
+
+
+class TestRefreshOpenAPISpec(unittest.IsolatedAsyncioTestCase):
+    async def test_refresh_writes_cache_and_survives_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, "spec.json")
+            spec = vendored_spec(info={"title": "fresh"})
+            fetch = AsyncMock(side_effect=[Exception("down"), {"paths": {}}, spec])
+            sleep = AsyncMock(side_effect=[None, None, asyncio.CancelledError()])
+            with (
+                patch.object(openapi, "fetch_openapi_spec", fetch),
+                patch.object(openapi.asyncio, "sleep", sleep),
+            ):
+                with self.assertRaises(asyncio.CancelledError):
+                    await refresh_openapi_spec(
+                        "http://langconnect/openapi.json", cache_path
+                    )
+
+            self.assertEqual(fetch.await_count, 3)
+            with open(cache_path) as f:
+                self.assertEqual(json.load(f), spec)
+
+
+class TestRagGateway(unittest.TestCase):
+    def test_gateway_builds_from_vendored_spec_offline(self):
+        module = importlib.import_module("src.routes.v0.rag")
+        # No server is reachable at this URL, the spec must come from disk
+        with patch.object(src.constants, "LANGCONNECT_SERVER_URL", "http://offline"):
+            try:
+                module = importlib.reload(module)
+                app = FastAPI()
+                app.include_router(module.gateway, prefix="/api")
+                schema = app.openapi()
+            finally:
+                importlib.reload(module)
+
+        self.assertIn(
+            "/api/rag/collections/{collection_id}/documents/search", schema["paths"]
+        )
+        self.assertIn("CollectionCreate", schema["components"]["schemas"])
+
+    def test_required_entries_cover_what_the_gateway_reads(self):
+        read = set()
+        spec = RecordingDict(vendored_spec(), read)
+        module = importlib.import_module("src.routes.v0.rag")
+        with (
+            patch.object(src.constants, "LANGCONNECT_SERVER_URL", "http://offline"),
+            patch.object(openapi, "load_openapi_spec", return_value=spec),
+        ):
+            try:
+                importlib.reload(module)
+            finally:
+                importlib.reload(module)
+
+        # Removing any entry the gateway reads must fail validation
+        leaves = {p for p in read if not any(q[: len(p)] == p and q != p for q in read)}
+        self.assertIn(("components", "schemas", "SearchQuery"), leaves)
+        for path in leaves:
+            broken = vendored_spec()
+            parent = broken
+            for key in path[:-1]:
+                parent = parent[key]
+            del parent[path[-1]]
+            self.assertTrue(missing_from_openapi_spec(broken), path)
@@ -0,0 +1,92 @@
+import unittest
+from types import SimpleNamespace
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from src.utils.rate_limit import MemoryBucketStorage, RateLimiter, parse_limit
+
+
+class TestParseLimit(unittest.TestCase):
+    def test_parse_limit(self):
+        self.assertEqual(parse_limit("200/day"), (200, 200 / 86400))
+        self.assertEqual(parse_limit("10/minutes"), (10, 10 / 60))
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.limiter = RateLimiter(storage=MemoryBucketStorage(), tokens="100/day")
+
+    async def test_request_budget(self):
+        for _ in range(3):
+            await self.limiter.hit("user:1", "requests:invoke", "3/hour")
+        with self.assertRaises(HTTPException) as ctx:
+            await self.limiter.hit("user:1", "requests:invoke", "3/hour")
+
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(ctx.exception.headers["Retry-After"], "1200")
+        # Budgets are per key and per endpoint
+        await self.limiter.hit("user:2", "requests:invoke", "3/hour")
+        await self.limiter.hit("user:1", "requests:stream", "3/hour")
+
+    async def test_token_budget_is_separate(self):
+        await self.limiter.check_tokens("user:1")
+        await self.limiter.charge("user:1", 150)
+
+        with self.assertRaises(HTTPException) as ctx:
+            await self.limiter.check_tokens("user:1")
+        self.assertEqual(ctx.exception.detail, "Token budget exceeded")
+        await self.limiter.hit("user:1", "requests:invoke", "3/hour")
+
+    async def test_storage_errors_fail_open(self):
+        class BrokenStorage:
+            async def take(self, *args, **kwargs):
+                raise ConnectionError("database is down")
+
+        limiter = RateLimiter(storage=BrokenStorage())
+        await limiter.hit("user:1", "requests:invoke", "1/day")
+        await limiter.hit("user:1", "requests:invoke", "1/day")
+
+
+class TestLimitDecorator(unittest.TestCase):
+    def test_keys_on_user_then_ip(self):
+        limiter = RateLimiter(storage=MemoryBucketStorage())
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def authenticate(request: Request, call_next):
+            if "x-user" in request.headers:
+                request.state.user = SimpleNamespace(id=request.headers["x-user"])
+            return await call_next(request)
+
+        @app.get("/limited")
+        @limiter.limit("2/minute")
+        async def limited(request: Request, q: int = 0):
+            return {"q": q}
+
+        client = TestClient(app)
+        self.assertEqual(client.get("/limited", params={"q": 1}).json(), {"q": 1})
+        self.assertEqual(client.get("/limited").status_code, 200)
+        self.assertEqual(client.get("/limited").status_code, 429)
+        # Same address, but a signed-in user has a budget of their own
+        response = client.get("/limited", headers={"x-user": "1"})
+        self.assertEqual(response.status_code, 200)
+
+
+class TestBudgetOwner(unittest.TestCase):
+    def test_budget_is_charged_to_the_authenticated_user_only(self):
+        from src.flows import init_config
+        from src.schemas.entities import LLMRequest
+        from src.utils.rate_limit import TokenBudgetCallback
+
+        params = LLMRequest(
+            messages=[{"role": "user", "content": "hi"}],
+            metadata={"user_id": "victim"},
+        )
+        budgets = lambda config: [
+            callback.key
+            for callback in config["callbacks"]
+            if isinstance(callback, TokenBudgetCallback)
+        ]
+        self.assertEqual(budgets(init_config(params)), [])
+        self.assertEqual(budgets(init_config(params, user_id="1")), ["user:1"])
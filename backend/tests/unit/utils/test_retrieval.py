@@ -0,0 +1,100 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.utils import retrieval
+from src.utils.retrieval import langconnect_proxy
+
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """Like httpx.MockTransport, without reading the response body up front."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.handler(request)
+
+
+class TestLangConnectProxy(unittest.TestCase):
+    def setUp(self):
+        self.requests: list[tuple[httpx.Request, bytes]] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append((request, await request.aread()))
+            return httpx.Response(
+                201,
+                stream=httpx.ByteStream(b'{"id": "1"}'),
+                headers={"content-type": "application/json", "x-upstream": "yes"},
+            )
+
+        retrieval._proxy_client = httpx.AsyncClient(
+            transport=StreamingTransport(handler)
+        )
+        app = FastAPI()
+
+        @app.api_route("/api/rag/{path:path}", methods=["GET", "POST"])
+        async def proxy(request: Request):
+            return await langconnect_proxy(request, service_url="http://langconnect")
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        retrieval._proxy_client = None
+
+    def test_json_body_and_response_pass_through(self):
+        response = self.client.post(
+            "/api/rag/collections?limit=5", json={"name": "docs"}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"id": "1"})
+        self.assertEqual(response.headers["x-upstream"], "yes")
+        request, body = self.requests[0]
+        self.assertEqual(str(request.url), "http://langconnect/collections?limit=5")
+        self.assertEqual(json.loads(body), {"name": "docs"})
+        self.assertNotIn("transfer-encoding", request.headers)
+
+    def test_get_has_no_body(self):
+        self.client.get("/api/rag/collections")
+        request, body = self.requests[0]
+        self.assertEqual(body, b"")
+
+    def test_multipart_files_are_forwarded_with_metadata(self):
+        response = self.client.post(
+            "/api/rag/collections/1/documents",
+            files=[
+                ("files", ("a.txt", b"first", "text/plain")),
+                ("files", ("b.pdf", b"second", "application/pdf")),
+            ],
+        )
+
+        self.assertEqual(response.status_code, 201)
+        request, body = self.requests[0]
+        self.assertTrue(
+            request.headers["content-type"].startswith("multipart/form-data")
+        )
+        self.assertIn(b'filename="a.txt"', body)
+        self.assertIn(b"first", body)
+        self.assertIn(b'filename="b.pdf"', body)
+        self.assertIn(b'name="metadatas_json"', body)
+        self.assertIn(b'"file_size":6', body.replace(b" ", b""))
+
+    def test_multipart_files_are_streamed_in_chunks(self):
+        content = bytes(range(256)) * 4096
+        with patch.object(retrieval, "LANGCONNECT_UPLOAD_CHUNK_SIZE", 64 * 1024):
+            self.client.post(
+                "/api/rag/collections/1/documents",
+                data={"note": 'say "hi"'},
+                files=[("files", ("big.bin", content, "application/octet-stream"))],
+            )
+
+        request, body = self.requests[0]
+        self.assertNotIn("transfer-encoding", request.headers)
+        self.assertEqual(int(request.headers["content-length"]), len(body))
+        self.assertIn(content, body)
+        self.assertIn(b'name="note"\r\n\r\nsay "hi"\r\n', body)
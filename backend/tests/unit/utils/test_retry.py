@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+import psycopg
+
+from src.utils.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    async_retry,
+    breakers,
+    retry_metrics,
+    retry_stats,
+)
+
+
+class TestAsyncRetry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        breakers.clear()
+        retry_stats.clear()
+        sleep = patch("src.utils.retry.asyncio.sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    async def test_retries_transient_errors(self):
+        calls = []
+
+        @async_retry("db", tries=3)
+        async def query():
+            calls.append(1)
+            if len(calls) < 3:
+                raise psycopg.OperationalError("the connection is closed")
+            return "ok"
+
+        self.assertEqual(await query(), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sleep.await_count, 2)
+        metrics = retry_metrics()["db"]
+        self.assertEqual(metrics["retries"], 2)
+        self.assertEqual(metrics["failures"], 0)
+        self.assertEqual(metrics["circuit"], "closed")
+
+    async def test_other_errors_are_not_retried(self):
+        calls = []
+
+        @async_retry("db", tries=3)
+        async def query():
+            calls.append(1)
+            raise ValueError("bad input")
+
+        with self.assertRaises(ValueError):
+            await query()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(retry_metrics()["db"]["retries"], 0)
+
+    async def test_backoff_is_jittered_and_bounded(self):
+        @async_retry("db", tries=4, delay=1, max_delay=2)
+        async def query():
+            raise psycopg.OperationalError("server closed the connection")
+
+        with patch("src.utils.retry.random.uniform", side_effect=lambda a, b: b):
+            with self.assertRaises(psycopg.OperationalError):
+                await query()
+        delays = [call.args[0] for call in self.sleep.await_args_list]
+        self.assertEqual(delays, [1, 2, 2])
+        self.assertEqual(retry_metrics()["db"]["failures"], 1)
+
+    async def test_circuit_opens_and_rejects_calls(self):
+        breakers["db"] = CircuitBreaker("db", threshold=2, reset_after=60)
+        calls = []
+
+        @async_retry("db", tries=1)
+        async def query():
+            calls.append(1)
+            raise psycopg.OperationalError("connection refused")
+
+        for _ in range(2):
+            with self.assertRaises(psycopg.OperationalError):
+                await query()
+        with self.assertRaises(CircuitOpenError):
+            await query()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(retry_metrics()["db"]["rejected"], 1)
+        self.assertEqual(retry_metrics()["db"]["circuit"], "open")
+
+    async def test_half_open_trial_closes_circuit(self):
+        breaker = breakers["db"] = CircuitBreaker("db", threshold=1, reset_after=0)
+        breaker.record_failure()
+
+        @async_retry("db", tries=1)
+        async def query():
+            return "ok"
+
+        self.assertEqual(breaker.state, "half_open")
+        self.assertEqual(await query(), "ok")
+        self.assertEqual(breaker.state, "closed")
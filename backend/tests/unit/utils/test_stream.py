@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    HumanMessage,
+    ToolMessage,
+)
+
+from src.utils.stream import FrameCoalescer, StreamSerializer
+
+
+async def events(count: int, delay: float = 0, size: int = 10):
+    for i in range(count):
+        if delay:
+            await asyncio.sleep(delay)
+        yield f"data: {str(i).zfill(size)}\n\n"
+
+
+class TestFrameCoalescer(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_is_coalesced_into_one_frame(self):
+        stream = FrameCoalescer(events(50), interval_ms=1000, max_bytes=1 << 20)
+        frames = [frame async for frame in stream]
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(stream.event_count, 50)
+        self.assertEqual(stream.frame_count, 1)
+        self.assertEqual(frames[0].count("data: "), 50)
+
+    async def test_byte_budget_splits_frames(self):
+        stream = FrameCoalescer(events(10, size=100), interval_ms=1000, max_bytes=300)
+        frames = [frame async for frame in stream]
+        self.assertEqual(
+            "".join(frames), "".join([e async for e in events(10, size=100)])
+        )
+        self.assertEqual(len(frames), 4)
+
+    async def test_time_budget_flushes_while_source_is_idle(self):
+        async def slow():
+            yield "data: first\n\n"
+            await asyncio.sleep(0.2)
+            yield "data: second\n\n"
+
+        stream = FrameCoalescer(slow(), interval_ms=10)
+        first = await anext(aiter(stream))
+        self.assertEqual(first, "data: first\n\n")
+
+    async def test_source_error_is_raised_after_flush(self):
+        async def failing():
+            yield "data: ok\n\n"
+            raise RuntimeError("boom")
+
+        frames = []
+        with self.assertRaises(RuntimeError):
+            async for frame in FrameCoalescer(failing()):
+                frames.append(frame)
+        self.assertEqual(frames, ["data: ok\n\n"])
+
+    async def test_closing_consumer_stops_source(self):
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield "data: tick\n\n"
+                    await asyncio.sleep(0.001)
+            finally:
+                closed.set()
+
+        stream = aiter(FrameCoalescer(endless(), interval_ms=5))
+        await anext(stream)
+        await stream.aclose()
+        self.assertTrue(closed.is_set())
+
+
+class TestStreamSerializer(unittest.TestCase):
+    def test_message_chunk_is_lean(self):
+        chunk = AIMessageChunk(
+            content="Hello",
+            id="run-1",
+            response_metadata={"model_name": "gpt-5-nano", "finish_reason": "stop"},
+        )
+        metadata = {"thread_id": "t-1", "langgraph_triggers": ["branch:to:agent"]}
+        mode, (data, meta) = StreamSerializer("delta")(("messages", (chunk, metadata)))
+        self.assertEqual(mode, "messages")
+        self.assertEqual(
+            data,
+            {
+                "type": "AIMessageChunk",
+                "id": "run-1",
+                "content": "Hello",
+                "response_metadata": {"finish_reason": "stop"},
+            },
+        )
+        self.assertEqual(meta, {"thread_id": "t-1"})
+
+    def test_tool_message_has_response_metadata(self):
+        msg = ToolMessage(content="Sunny", id="tool-1", tool_call_id="call-1")
+        _, (data, _) = StreamSerializer("delta")(("messages", (msg, {})))
+        self.assertEqual(data["response_metadata"], {})
+        self.assertEqual(data["tool_call_id"], "call-1")
+
+    def test_empty_chunk_is_skipped(self):
+        chunk = AIMessageChunk(content="", id="run-1")
+        self.assertIsNone(StreamSerializer("delta")(("messages", (chunk, {}))))
+
+    def test_values_only_send_new_messages(self):
+        serialize = StreamSerializer("delta")
+        human = HumanMessage(content="hi", id="1")
+        ai = AIMessage(content="hello", id="2")
+
+        _, first = serialize(("values", {"messages": [human], "todos": []}))
+        self.assertEqual([m["id"] for m in first["messages"]], ["1"])
+        self.assertEqual(first["todos"], [])
+
+        _, second = serialize(("values", {"messages": [human, ai], "todos": []}))
+        self.assertEqual(second, {"messages": [ai.model_dump()]})
+
+        self.assertIsNone(serialize(("values", {"messages": [human, ai], "todos": []})))
+
+        _, third = serialize(("values", {"messages": [ai], "todos": []}))
+        self.assertEqual(third, {"removed": ["1"]})
+
+    def test_full_format_sends_complete_history(self):
+        serialize = StreamSerializer("full")
+        messages = [HumanMessage(content="hi", id="1")]
+        serialize(("values", {"messages": list(messages)}))
+        _, state = serialize(("values", {"messages": list(messages)}))
+        self.assertEqual(len(state["messages"]), 1)